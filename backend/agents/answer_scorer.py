@@ -0,0 +1,139 @@
+# Incremental Answer Scorer module
+import contextvars
+import os
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.mock_batcher import MOCK_EVAL_BATCHING, mock_batcher
+from agents.mock_evaluator import local_mock_feedback, mock_interview_analyser
+from models.models import error_response, success_response
+from deadlines import mark_degraded
+from token_budget import within_token_budget
+
+ANSWER_SCORER_MAX_WORKERS = int(os.getenv("ANSWER_SCORER_MAX_WORKERS", "8"))
+# Upper bound on how long finalize waits for answers still being scored
+ANSWER_SCORER_FINALIZE_TIMEOUT = float(os.getenv("ANSWER_SCORER_FINALIZE_TIMEOUT", "60"))
+MAX_AGGREGATED_FEEDBACK = 3
+
+
+def evaluate_answers(resume_context: str, answers: List[dict[str, Any]]) -> dict:
+    """Score answers in one evaluation, batched with concurrent ones when enabled."""
+    if not within_token_budget():
+        mark_degraded("mock_response", "token budget")
+        return success_response(local_mock_feedback(answers))
+    if MOCK_EVAL_BATCHING:
+        return mock_batcher.submit(resume_context, answers)
+    return mock_interview_analyser(resume_context, answers)
+
+
+def aggregate_feedback(feedbacks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-answer MockInterviewFeedback dicts into one transcript-level
+    feedback: scores are averaged, the most repeated tips are kept.
+    """
+    scores = {key: round(sum(f[key] for f in feedbacks) / len(feedbacks))
+              for key in ("tone", "confidence", "relevance")}
+    tips = Counter(tip for f in feedbacks for tip in dict.fromkeys(f["feedback"]))
+    return {
+        **scores,
+        "total_marks": round(sum(scores.values()) / 3, 2),
+        # Counter preserves first-seen order among equal counts
+        "feedback": [tip for tip, _ in tips.most_common(MAX_AGGREGATED_FEEDBACK)],
+        **({"scored_locally": True} if any(f.get("scored_locally") for f in feedbacks) else {}),
+    }
+
+
+class IncrementalAnswerScorer:
+    """
+    Scores each mock answer in the background as it is submitted, so the
+    finalize call only aggregates scores that are (mostly) already computed.
+    Partial feedback is kept per session, keyed by answer index.
+    """
+
+    def __init__(self, max_workers: int = ANSWER_SCORER_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # session_id -> answer index -> (answer, future resolved with the agent response)
+        self._sessions: Dict[str, Dict[int, Tuple[dict[str, Any], Future]]] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="answer-scorer")
+        return self._executor
+
+    def submit(self, session_id: str, index: int, resume_context: str,
+               answer: dict[str, Any]) -> int:
+        """
+        Queue one answer for scoring; resubmitting an index replaces it.
+
+        Returns:
+            Number of answers received for the session
+        """
+        context = contextvars.copy_context()
+        future = self._pool().submit(context.run, evaluate_answers, resume_context, [answer])
+        with self._lock:
+            answers = self._sessions.setdefault(session_id, {})
+            previous = answers.get(index)
+            answers[index] = (answer, future)
+            count = len(answers)
+        if previous is not None:
+            previous[1].cancel()
+        return count
+
+    def partial(self, session_id: str) -> Dict[int, Dict[str, Any]]:
+        """Feedback of the answers scored so far, without waiting."""
+        with self._lock:
+            answers = dict(self._sessions.get(session_id, {}))
+        return {
+            index: future.result()["data"]
+            for index, (_, future) in answers.items()
+            if future.done() and not future.cancelled() and future.result().get("success")
+        }
+
+    def finalize(self, session_id: str, resume_context: str) -> Tuple[List[dict[str, Any]], dict]:
+        """
+        Wait for outstanding scores and aggregate them.
+
+        Answers whose background scoring failed are scored again here.
+
+        Returns:
+            (answers in index order, aggregated mock evaluation response)
+        """
+        with self._lock:
+            answers = sorted(self._sessions.get(session_id, {}).items())
+        if not answers:
+            return [], error_response("No answers were submitted for this session")
+
+        wait([future for _, (_, future) in answers], timeout=ANSWER_SCORER_FINALIZE_TIMEOUT)
+        feedbacks, failed = [], []
+        for _, (answer, future) in answers:
+            response = future.result() if future.done() and future.exception() is None else None
+            if response and response.get("success"):
+                feedbacks.append(response["data"])
+            else:
+                failed.append(answer)
+        if failed:
+            print(f"🔁 Re-scoring {len(failed)} answer(s) whose background scoring failed")
+            response = evaluate_answers(resume_context, failed)
+            if not response.get("success"):
+                return [answer for _, (answer, _) in answers], response
+            # One evaluation of several answers counts once per answer
+            feedbacks.extend([response["data"]] * len(failed))
+        aggregated = aggregate_feedback(feedbacks)
+        if aggregated.get("scored_locally"):
+            # Answers scored in earlier requests were over the token budget
+            mark_degraded("mock_response", "token budget")
+        return [answer for _, (answer, _) in answers], success_response(aggregated)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            answers = self._sessions.pop(session_id, {})
+        for _, future in answers.values():
+            future.cancel()
+
+
+answer_scorer = IncrementalAnswerScorer()
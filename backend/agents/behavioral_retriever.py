@@ -1,12 +1,26 @@
 # Behavioral Retriever module
 from itertools import chain
 from database.db import get_qna_by_category, save_qna_for_category
+from database.jd_cache import jd_artifact_cache
 from models.models import BehavioralQuestionsResponse, error_response, success_response
 from fire_crawl_services import FireCrawlService
 from prompts.tool_prompts import ToolPrompts
-from llm import llm
+from llm import get_llm
+from metrics import record_cache
 from langchain_core.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
+from agents.structured_output import invoke_structured
+from deadlines import has_budget, mark_degraded
+from token_budget import within_token_budget
+import os
+
+# Fresh question generation is skipped below this much remaining budget
+QNA_GENERATION_MIN_BUDGET = float(os.getenv("QNA_GENERATION_MIN_BUDGET", "8"))
+FALLBACK_BEHAVIORAL_QUESTIONS = [
+    "Tell me about a time you faced a difficult challenge at work and how you handled it.",
+    "Describe a situation where you disagreed with a teammate. How did you resolve it?",
+    "Give an example of a project you owned end to end. What was the outcome?",
+    "Tell me about a mistake you made and what you learned from it.",
+]
 
 
 class BehaviourRetriver:
@@ -20,9 +34,10 @@ class BehaviourRetriver:
                 template=search_prompt_temp,
                 input_variables=["job_description"]
             )
-            chain = search_prompt | llm
+            chain = search_prompt | get_llm("search_query")
             serch_query_res = chain.invoke(
-                {"job_description": job_description})
+                {"job_description": job_description},
+                config={"metadata": {"llm_task": "search_query"}})
             if hasattr(serch_query_res, "content"):
                 query_text = serch_query_res.content
             else:
@@ -41,39 +56,56 @@ class BehaviourRetriver:
 
     def get_q_and_a(self, job_description: str) -> dict:
         try:
+            # Step 0: Repeat job descriptions skip every JD-only call
+            jd_artifacts = jd_artifact_cache.get(job_description) or {}
+            record_cache("jd_artifacts", bool(jd_artifacts.get("questions")))
+            if jd_artifacts.get("questions"):
+                print(
+                    f"⚡ JD cache hit, reusing {len(jd_artifacts['questions'])} questions")
+                return success_response(jd_artifacts["questions"])
+
             # Step 1: Infer category from job description
-            category = self.infer_category_from_job_description(
-                job_description)
+            category = jd_artifacts.get(
+                "category") or self.infer_category_from_job_description(job_description)
+            jd_artifact_cache.put(job_description, category=category)
 
             # Step 2: Check for cached questions by category
             cached_qs_by_category = get_qna_by_category(category)
+            record_cache("category_questions", bool(cached_qs_by_category))
             if cached_qs_by_category:
                 print(
                     f"✅ Found {len(cached_qs_by_category)} cached questions for category '{category}'")
-                return success_response([q["question"] for q in cached_qs_by_category])
+                questions = [q["question"] for q in cached_qs_by_category]
+                jd_artifact_cache.put(job_description, questions=questions)
+                return success_response(questions)
+
+            # Generation costs two LLM calls; serve general questions instead
+            # when short on time or tokens
+            over_tokens = not within_token_budget()
+            if over_tokens or not has_budget(QNA_GENERATION_MIN_BUDGET):
+                mark_degraded("behavioral_questions",
+                              "token budget" if over_tokens else "deadline")
+                fallback = get_qna_by_category("general") if category != "general" else []
+                return success_response(
+                    [q["question"] for q in fallback] or FALLBACK_BEHAVIORAL_QUESTIONS)
 
             print(
                 f"🤖 No cached questions found for category '{category}', proceeding with LLM call")
 
             # Step 3: Generate search query
-            search_query = self.search_query_generator(job_description)
-
-            # Step 4: Set up parser and prompt
-            parser = PydanticOutputParser(
-                pydantic_object=BehavioralQuestionsResponse)
-
-            prompt = PromptTemplate(
-                template=ToolPrompts.behavioural_q_and_a_prompt,
-                input_variables=["query"],
-                partial_variables={
-                    "format_instructions": parser.get_format_instructions()
-                }
+            search_query = jd_artifacts.get(
+                "search_query") or self.search_query_generator(job_description)
+            jd_artifact_cache.put(job_description, search_query=search_query)
+
+            # Step 4-5: Generate questions as structured output
+            result = invoke_structured(
+                get_llm("qna_generation"),
+                ToolPrompts.behavioural_q_and_a_prompt,
+                BehavioralQuestionsResponse,
+                {"query": search_query},
+                llm_task="qna_generation",
             )
 
-            # Step 5: Chain the call
-            chain = prompt | llm | parser
-            result = chain.invoke({"query": search_query})
-
             # Step 6: Process and save results
             if hasattr(result, "questions"):
                 # Convert pydantic to dict and add category
@@ -88,7 +120,9 @@ class BehaviourRetriver:
                 save_qna_for_category(qna_list, min_count=2)
 
                 # Step 7: Return success with question list
-                return success_response([q["question"] for q in qna_list])
+                questions = [q["question"] for q in qna_list]
+                jd_artifact_cache.put(job_description, questions=questions)
+                return success_response(questions)
             else:
                 # Fallback if no questions attribute
                 result_dict = result.dict() if hasattr(result, "dict") else {}
@@ -99,7 +133,8 @@ class BehaviourRetriver:
             print(f"❌ Error in get_q_and_a: {e}")
             return error_response(f"Unexpected error: {str(e)}")
 
-    def infer_category_from_job_description(self, jd: str) -> str:
+    @staticmethod
+    def infer_category_from_job_description(jd: str) -> str:
         """
         Infer the category from job description for better question caching.
         """
@@ -125,3 +160,9 @@ class BehaviourRetriver:
             return "data_analysis"
         else:
             return "general"
+
+
+def role_category(job_description: str) -> str:
+    """Category of a job description, as used for question caching and cohorts."""
+    return ((jd_artifact_cache.get(job_description) or {}).get("category")
+            or BehaviourRetriver.infer_category_from_job_description(job_description))
@@ -0,0 +1,121 @@
+# DOCX Extractor module
+import os
+import zipfile
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import iterparse
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P, _R, _T, _TAB = W_NS + "p", W_NS + "r", W_NS + "t", W_NS + "tab"
+_BR, _CR = W_NS + "br", W_NS + "cr"
+_TBL, _TR, _TC = W_NS + "tbl", W_NS + "tr", W_NS + "tc"
+# Dropped from the tree as soon as they close
+_BLOCKS = (_P, _TC, _TR, _TBL)
+
+DOCUMENT_PART = "word/document.xml"
+# Parsing stops once this much text has been read, so oversized or
+# zip-bomb uploads cannot grow memory without bound
+DOCX_MAX_TEXT_CHARS = int(os.getenv("DOCX_MAX_TEXT_CHARS", "200000"))
+
+
+def iter_docx_blocks(file_path: str, max_chars: Optional[int] = None) -> Iterator[str]:
+    """
+    Stream the text blocks of a .docx in document order.
+
+    Only `word/document.xml` is read, straight from the zip with incremental
+    XML parsing; media, headers and other parts are never decompressed.
+    Yields one string per paragraph and one tab-separated string per
+    table row. Once `max_chars` of text has been read, whatever the open
+    blocks hold is yielded and parsing stops (e.g. in a resume laid out as
+    one big table, whose only row would otherwise never close).
+    """
+    with zipfile.ZipFile(file_path) as docx, docx.open(DOCUMENT_PART) as document:
+        # Open paragraphs (text boxes nest paragraphs inside paragraphs)
+        paragraphs: List[List[str]] = []
+        # One entry per open table (innermost last): current row cells / cell paragraphs
+        rows: List[List[str]] = []
+        cells: List[List[str]] = []
+        # Open elements, so finished blocks can be removed from their parent
+        open_elements = []
+        runs = 0
+        read = 0
+
+        for event, elem in iterparse(document, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                open_elements.append(elem)
+                if tag == _P:
+                    paragraphs.append([])
+                elif tag == _R:
+                    runs += 1
+                elif tag == _TR:
+                    rows.append([])
+                elif tag == _TC:
+                    cells.append([])
+                continue
+
+            open_elements.pop()
+            if tag == _T and paragraphs:
+                paragraphs[-1].append(elem.text or "")
+                read += len(elem.text or "")
+            elif tag == _R:
+                runs -= 1
+            # Outside a run, w:tab is a tab stop definition in the paragraph properties
+            elif tag == _TAB and paragraphs and runs:
+                paragraphs[-1].append("\t")
+            elif tag in (_BR, _CR) and paragraphs:
+                paragraphs[-1].append("\n")
+            elif tag == _P:
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                elif text.strip():
+                    yield text
+            elif tag == _TC:
+                cell = " ".join(part for part in cells.pop() if part.strip())
+                if rows:
+                    rows[-1].append(cell)
+            elif tag == _TR:
+                row = rows.pop()
+                text = "\t".join(row)
+                if cells:
+                    # Nested table: the row becomes part of the enclosing cell
+                    cells[-1].append(text)
+                elif text.strip():
+                    yield text
+
+            # Finished blocks are dropped so the tree never holds the document,
+            # even when the whole document sits inside one table
+            if tag in _BLOCKS:
+                elem.clear()
+                if open_elements:
+                    open_elements[-1].remove(elem)
+
+            if max_chars is not None and read >= max_chars:
+                pending = ["\t".join(row) for row in rows] + \
+                    [" ".join(cell) for cell in cells] + ["".join(p) for p in paragraphs]
+                text = "\n".join(part for part in pending if part.strip())
+                if text:
+                    yield text
+                return
+
+
+def extract_docx_text(file_path: str, max_chars: int = DOCX_MAX_TEXT_CHARS) -> str:
+    """
+    Extract plain text from a .docx file.
+
+    Args:
+        file_path: Path to the .docx file
+        max_chars: Stop reading once this many characters were extracted
+
+    Returns:
+        Paragraphs and table rows joined by newlines
+    """
+    blocks: List[str] = []
+    size = 0
+    for block in iter_docx_blocks(file_path, max_chars):
+        blocks.append(block)
+        size += len(block) + 1
+        if size >= max_chars:
+            print(f"⚠️ DOCX text truncated at {max_chars} characters: {file_path}")
+            break
+    return "\n".join(blocks)[:max_chars]
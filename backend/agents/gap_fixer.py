@@ -1,39 +1,56 @@
 # Gap Fixer module
+import os
+from typing import Dict, Optional
 
-from langchain.prompts import PromptTemplate
 from fire_crawl_services import FireCrawlService
-from llm import llm
+from llm import get_llm
 from prompts.tool_prompts import ToolPrompts
 from models.models import ImprovementPlan, error_response, success_response
-from langchain.output_parsers import PydanticOutputParser
-from langchain.chains import LLMChain
+from agents.structured_output import invoke_structured
+from agents.resource_prefetcher import feedback_query, match_prefetched
+from database.resource_index import resource_index
+from metrics import record_cache
+from deadlines import has_budget, mark_degraded
+from token_budget import within_token_budget
 
+# Live Firecrawl lookups are skipped when less than this is left of the request budget
+GAP_FIXER_LINKS_MIN_BUDGET = float(os.getenv("GAP_FIXER_LINKS_MIN_BUDGET", "5"))
 
-def gap_fixer_agent(resume_dict: dict, evaluation_scores: dict, success_likelihood: dict) -> dict:
+
+def _local_plan(resume_dict: dict, evaluation_scores: dict, success_likelihood: dict) -> dict:
+    """Improvement plan assembled from the resume and mock feedback without the LLM."""
+    steps = [(item, feedback_query(item, "resume"))
+             for item in (resume_dict.get("data") or {}).get("feedback") or []]
+    steps += [(item, feedback_query(item, "interview"))
+              for item in (evaluation_scores.get("data") or {}).get("feedback") or []]
+    return {
+        "overall_summary": (success_likelihood.get("data") or {}).get("justification")
+        or "Work through the feedback from your resume review and mock interview.",
+        "actionable_steps": [{"description": item, "search_query": query}
+                             for item, query in steps if query],
+    }
+
+
+def gap_fixer_agent(resume_dict: dict, evaluation_scores: dict, success_likelihood: dict,
+                    prefetched_resources: Optional[Dict[str, str]] = None) -> dict:
 
     try:
-        parser = PydanticOutputParser(
-            pydantic_object=ImprovementPlan,
-        )
-        template = PromptTemplate(
-            template=ToolPrompts.gap_fixer_single_prompt_template_string,
-            input_variables=["resume_strength_json",
-                             "evaluation_scores_json", "success_likelihood_json"],
-            partial_variables={
-                "format_instructions": parser.get_format_instructions()}
-        )
-        gap_fixer_chain = LLMChain(
-            llm=llm,
-            prompt=template,
-            output_parser=parser,
-            verbose=True
-        )
-        gap_fixer_response = gap_fixer_chain.invoke({
-            "resume_strength_json": resume_dict,
-            "evaluation_scores_json": evaluation_scores,
-            "success_likelihood_json": success_likelihood
-        })
-        improvemet_plan = gap_fixer_response["text"].dict()
+        if within_token_budget():
+            gap_fixer_response = invoke_structured(
+                get_llm("gap_fixer"),
+                ToolPrompts.gap_fixer_single_prompt_template_string,
+                ImprovementPlan,
+                {
+                    "resume_strength_json": resume_dict,
+                    "evaluation_scores_json": evaluation_scores,
+                    "success_likelihood_json": success_likelihood
+                },
+                llm_task="gap_fixer",
+            )
+            improvemet_plan = gap_fixer_response.dict()
+        else:
+            mark_degraded("gap_fixer.plan", "token budget")
+            improvemet_plan = _local_plan(resume_dict, evaluation_scores, success_likelihood)
         querys = []
         descriptions = []
         for plan in improvemet_plan["actionable_steps"][:3]:
@@ -41,11 +58,24 @@ def gap_fixer_agent(resume_dict: dict, evaluation_scores: dict, success_likeliho
                 querys.append(plan["search_query"])
                 descriptions.append(plan["description"])
 
-        fire_crawl = FireCrawlService()
+        fire_crawl = None
         links = []
         for query in querys[:3]:
-            search_res = fire_crawl.search(query, n_res=1)
-            links .append(search_res.data[0]["url"])
+            # Lookups speculatively run while the candidate was answering
+            url = match_prefetched(query, prefetched_resources or {})
+            if url is None:
+                # Pages fetched for earlier phrasings of the same topic
+                url = resource_index.lookup(query)
+                record_cache("resource_index", url is not None)
+            if url is None and not has_budget(GAP_FIXER_LINKS_MIN_BUDGET):
+                mark_degraded("gap_fixer.links")
+                continue
+            if url is None:
+                fire_crawl = fire_crawl or FireCrawlService()
+                search_res = fire_crawl.search(query, n_res=1)
+                resource_index.add_pages(search_res.data)
+                url = search_res.data[0]["url"]
+            links.append(url)
         final_res = {
             "summary": improvemet_plan["overall_summary"],
             "improvements": descriptions,
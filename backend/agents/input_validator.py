@@ -0,0 +1,166 @@
+# Input Validator module
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from agents.resume_structurer import segment_sections
+from metrics import INPUT_REJECTIONS
+
+# Thresholds are deliberately loose: only clearly invalid inputs are rejected
+# here, anything borderline is still judged by the LLM in `resume_analyse`
+PREVALIDATION_ENABLED = os.getenv("PREVALIDATION_ENABLED", "true").lower() == "true"
+RESUME_MIN_WORDS = int(os.getenv("RESUME_MIN_WORDS", "60"))
+RESUME_MAX_WORDS = int(os.getenv("RESUME_MAX_WORDS", "8000"))
+RESUME_MIN_ALPHA_RATIO = float(os.getenv("RESUME_MIN_ALPHA_RATIO", "0.5"))
+RESUME_MIN_SCORE = float(os.getenv("RESUME_MIN_SCORE", "0.2"))
+JD_MIN_WORDS = int(os.getenv("JD_MIN_WORDS", "15"))
+# Job descriptions with this many JD-like sections, phrases or duty verbs skip the classifier
+JD_MIN_SIGNALS = int(os.getenv("JD_MIN_SIGNALS", "2"))
+# Invoices and receipts are about 30% numbers, prose under 10%
+JD_MAX_NUMERIC_RATIO = float(os.getenv("JD_MAX_NUMERIC_RATIO", "0.2"))
+JD_MIN_SCORE = float(os.getenv("JD_MIN_SCORE", "0.1"))
+
+_WORD_RE = re.compile(r"[a-z][a-z+#.]*")
+_NUMERIC_RE = re.compile(r"^[#$€£(]*\d[\d.,:/%)-]*$")
+
+# Tiny linear text classifiers: term -> log-odds weight. Scores are the
+# sigmoid of the bias plus the weighted, length-normalised term frequencies.
+RESUME_TERM_WEIGHTS: Dict[str, float] = {
+    "experience": 2.0, "education": 2.0, "skills": 2.0, "university": 1.5,
+    "bachelor": 1.5, "master": 1.0, "degree": 1.5, "developed": 1.5, "led": 1.0,
+    "managed": 1.0, "engineer": 1.0, "developer": 1.0, "projects": 1.5,
+    "certifications": 1.0, "summary": 1.0, "responsible": 1.0, "implemented": 1.5,
+    "designed": 1.0, "built": 1.0, "linkedin": 1.5, "github": 1.0, "intern": 1.0,
+    "invoice": -3.0, "total": -1.0, "amount": -1.5, "due": -1.0, "subtotal": -3.0,
+    "tax": -1.5, "receipt": -3.0, "payment": -1.5, "qty": -3.0, "price": -1.5,
+    "lorem": -3.0, "ipsum": -3.0, "chapter": -1.5, "abstract": -1.5,
+    "references": 0.5, "bill": -2.0, "order": -1.0,
+}
+RESUME_BIAS = -1.5
+
+# Only placeholder text weighs against a job description: domain words like
+# "invoice" or "receipt" are everyday vocabulary in finance roles
+JD_TERM_WEIGHTS: Dict[str, float] = {
+    "responsibilities": 2.0, "requirements": 2.0, "qualifications": 2.0,
+    "experience": 1.5, "role": 1.5, "team": 1.0, "skills": 1.5, "years": 1.0,
+    "we": 0.5, "you": 0.5, "will": 0.5, "looking": 1.0, "candidate": 1.5,
+    "position": 1.5, "preferred": 1.0, "required": 1.0, "benefits": 1.0,
+    "knowledge": 1.0, "ability": 1.0, "work": 0.5, "develop": 1.0,
+    "lorem": -3.0, "ipsum": -3.0, "dolor": -3.0, "amet": -3.0,
+}
+# Text with no JD terms at all scores 0.12, just above JD_MIN_SCORE: it is
+# left to the LLM unless it also contains placeholder text
+JD_BIAS = -2.0
+
+JD_SECTION_HEADERS = frozenset((
+    "responsibilities", "key responsibilities", "requirements", "qualifications",
+    "minimum qualifications", "preferred qualifications", "about the role", "about you",
+    "what you will do", "what youll do", "what we offer", "benefits", "the role",
+    "skills", "nice to have", "job description",
+))
+_JD_PHRASE_RE = re.compile(
+    r"\b(?:you will|you'll|we are (?:looking|hiring|seeking)|we're (?:looking|hiring|seeking)|"
+    r"responsible for|years of experience|experience (?:with|in)|required|preferred|"
+    r"must have|nice to have|ability to|join (?:our|the) team|the (?:ideal )?candidate|"
+    r"(?:this|the) (?:role|position)|reporting to|full[- ]time|part[- ]time)\b", re.I)
+# Duties are listed with these verbs in almost every job description
+JD_DUTY_VERBS = frozenset((
+    "administer", "analyse", "analyze", "build", "collaborate", "coordinate", "deliver",
+    "deploy", "design", "develop", "drive", "ensure", "implement", "lead", "maintain",
+    "manage", "mentor", "monitor", "own", "plan", "prepare", "present", "process",
+    "reconcile", "record", "report", "resolve", "review", "support", "test", "train",
+))
+
+
+@dataclass
+class ValidationResult:
+    valid: bool
+    reason: Optional[str] = None
+    message: Optional[str] = None
+
+
+def classify(text: str, weights: Dict[str, float], bias: float) -> float:
+    """
+    Probability-like score that `text` belongs to the class described by
+    `weights` (bag-of-words linear model).
+    """
+    terms = Counter(_WORD_RE.findall(text.lower()))
+    total = sum(terms.values())
+    if not total:
+        return 0.0
+    # Scale by sqrt so long documents are not swamped by raw frequencies
+    logit = bias + sum(weights[t] * n for t, n in terms.items() if t in weights) / math.sqrt(total)
+    return 1 / (1 + math.exp(-max(-50.0, min(50.0, logit))))
+
+
+def _reject(document: str, reason: str, message: str) -> ValidationResult:
+    INPUT_REJECTIONS.inc(document=document, reason=reason)
+    print(f"🚫 Pre-validation rejected {document}: {reason}")
+    return ValidationResult(False, reason, message)
+
+
+def validate_resume(resume_text: str) -> ValidationResult:
+    words = resume_text.split()
+    if len(words) < RESUME_MIN_WORDS:
+        return _reject("resume", "too_short",
+                       "The uploaded document is too short to be a resume.")
+    if len(words) > RESUME_MAX_WORDS:
+        return _reject("resume", "too_long",
+                       "The uploaded document is too long to be a resume.")
+    alpha = sum(ch.isalpha() for ch in resume_text)
+    if alpha / max(1, len(resume_text.replace(" ", ""))) < RESUME_MIN_ALPHA_RATIO:
+        return _reject("resume", "not_text",
+                       "The uploaded document does not contain readable resume text.")
+
+    sections = [name for name in segment_sections(resume_text) if name != "header"]
+    # Documents with recognised resume sections skip the classifier
+    if not sections and classify(resume_text, RESUME_TERM_WEIGHTS, RESUME_BIAS) < RESUME_MIN_SCORE:
+        return _reject("resume", "classifier",
+                       "The uploaded document is not a valid resume.")
+    return ValidationResult(True)
+
+
+def job_description_signals(job_description: str) -> int:
+    """Count of JD section headers, JD phrases and distinct duty verbs in the text."""
+    headers = sum(
+        re.sub(r"[^a-z ]", "", line.lower()).strip() in JD_SECTION_HEADERS
+        for line in job_description.splitlines())
+    phrases = len(_JD_PHRASE_RE.findall(job_description))
+    verbs = len(JD_DUTY_VERBS.intersection(_WORD_RE.findall(job_description.lower())))
+    return headers + phrases + verbs
+
+
+def validate_job_description(job_description: str) -> ValidationResult:
+    words = job_description.split()
+    if len(words) < JD_MIN_WORDS:
+        return _reject("job_description", "too_short",
+                       "The provided job description is too short.")
+    # Only text without any job description structure is checked further
+    if job_description_signals(job_description) >= JD_MIN_SIGNALS:
+        return ValidationResult(True)
+    if sum(bool(_NUMERIC_RE.match(word)) for word in words) / len(words) > JD_MAX_NUMERIC_RATIO:
+        return _reject("job_description", "not_text",
+                       "The provided job description is not valid.")
+    if classify(job_description, JD_TERM_WEIGHTS, JD_BIAS) < JD_MIN_SCORE:
+        return _reject("job_description", "classifier",
+                       "The provided job description is not valid.")
+    return ValidationResult(True)
+
+
+def prevalidate(resume_text: str, job_description: str) -> ValidationResult:
+    """
+    Millisecond heuristics run before `resume_analyse` calls the LLM.
+
+    Returns:
+        The first failing check, or a valid result when both inputs pass
+        (or pre-validation is disabled with PREVALIDATION_ENABLED=false)
+    """
+    if not PREVALIDATION_ENABLED:
+        return ValidationResult(True)
+    resume_result = validate_resume(resume_text)
+    if not resume_result.valid:
+        return resume_result
+    return validate_job_description(job_description)
@@ -0,0 +1,111 @@
+# Mock Evaluation Batcher module
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple
+from prompts.tool_prompts import ToolPrompts
+from models.models import MockInterviewBatchFeedback, success_response
+from agents.mock_evaluator import mock_interview_analyser
+from agents.structured_output import invoke_structured
+from llm import get_llm
+from token_budget import charged_to, current_sessions
+
+MOCK_EVAL_BATCHING = os.getenv("MOCK_EVAL_BATCHING", "false").lower() == "true"
+MOCK_EVAL_BATCH_WINDOW_MS = int(os.getenv("MOCK_EVAL_BATCH_WINDOW_MS", "50"))
+MOCK_EVAL_BATCH_MAX_ITEMS = int(os.getenv("MOCK_EVAL_BATCH_MAX_ITEMS", "8"))
+
+# (resume_text, answers, future resolved with feedback dict or None for fallback,
+#  sessions the caller's LLM usage is charged to)
+_PendingEvaluation = Tuple[str, List[dict[str, Any]], Future, Tuple[str, ...]]
+
+
+class MockEvaluationBatcher:
+    """
+    Collects mock evaluations that arrive within a short window and scores
+    them with a single LLM call.
+
+    Callers block in `submit` until their batch is scored. Any evaluation the
+    batched call fails to return (parse error, missing evaluation_id) is
+    re-run through `mock_interview_analyser` on the caller's own thread.
+    """
+
+    def __init__(self, window_ms: int = MOCK_EVAL_BATCH_WINDOW_MS,
+                 max_items: int = MOCK_EVAL_BATCH_MAX_ITEMS) -> None:
+        self.window = window_ms / 1000
+        self.max_items = max(1, max_items)
+        self._queue: "queue.Queue[_PendingEvaluation]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, resume_txt: str, answers: list[dict[str, Any]]) -> dict:
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((resume_txt, answers, future, current_sessions()))
+        feedback = future.result()
+        if feedback is None:
+            return mock_interview_analyser(resume_txt, answers)
+        return success_response(feedback)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="mock-eval-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[_PendingEvaluation]) -> None:
+        results: dict[int, dict] = {}
+        # A single pending evaluation gains nothing from the batch prompt
+        if len(batch) > 1:
+            try:
+                results = self._evaluate_batch(batch)
+                print(
+                    f"📦 Batched {len(batch)} mock evaluations, {len(results)} parsed")
+            except Exception as e:
+                print(
+                    f"❌ Batched mock evaluation failed, falling back to single calls: {e}")
+
+        for evaluation_id, (_, _, future, _) in enumerate(batch):
+            future.set_result(results.get(evaluation_id))
+
+    def _evaluate_batch(self, batch: List[_PendingEvaluation]) -> dict[int, dict]:
+        evaluations = "\n\n".join(
+            f"### evaluation_id: {evaluation_id}\n"
+            f"**Candidate's Resume:**\n{resume_txt}\n\n"
+            f"**Candidate's Interview Answers:**\n{answers}"
+            for evaluation_id, (resume_txt, answers, _, _) in enumerate(batch)
+        )
+        # The worker thread has no session of its own; split the call between the callers'
+        with charged_to(session for *_, sessions in batch for session in sessions):
+            result = invoke_structured(
+                get_llm("mock_evaluation"),
+                ToolPrompts.mock_interview_batch_prompt,
+                MockInterviewBatchFeedback,
+                {"evaluations": evaluations},
+                llm_task="mock_evaluation_batch",
+            )
+
+        return {
+            item.evaluation_id: item.dict(exclude={"evaluation_id"})
+            for item in result.evaluations
+            if 0 <= item.evaluation_id < len(batch)
+        }
+
+
+mock_batcher = MockEvaluationBatcher()
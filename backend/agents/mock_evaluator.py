@@ -1,30 +1,73 @@
 # Mock Evaluator module
+import re
 from typing import Any
 from prompts.tool_prompts import ToolPrompts
 from models.models import MockInterviewFeedback, success_response, error_response
-from langchain_core.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from llm import llm
+from agents.structured_output import invoke_structured
+from llm import get_llm
 
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_HEDGES = ("i think", "maybe", "probably", "i guess", "sort of", "kind of", "not sure", "i hope")
+_OUTCOME_MARKERS = ("result", "outcome", "as a result", "reduced", "increased", "improved",
+                    "delivered", "shipped", "saved", "learned")
+_QUESTION_STOPWORDS = frozenset((
+    "a", "an", "and", "the", "of", "to", "in", "on", "for", "with", "how", "what", "when",
+    "tell", "me", "about", "time", "you", "your", "did", "do", "describe", "give", "example",
+    "is", "was", "were", "it", "that", "this", "where", "had", "have", "i",
+))
 
-def mock_interview_analyser(resume_txt: str, answers: list[dict[str, Any]]) -> dict:
-    try:
-        parser = PydanticOutputParser(pydantic_object=MockInterviewFeedback)
 
-        prompt_temp = PromptTemplate(
-            template=ToolPrompts.mock_interview_prompt,
-            input_variables=["resume_text", "answers"],
-            partial_variables={
-                "format_instructions": parser.get_format_instructions()
-            }
-        )
+def local_mock_feedback(answers: list[dict[str, Any]]) -> dict:
+    """
+    Rough MockInterviewFeedback computed without the LLM, from answer length,
+    hedging, stated outcomes and overlap with the question's terms.
+    """
+    tone, confidence, relevance = [], [], []
+    short, hedged, no_outcome = 0, 0, 0
+    for item in answers:
+        answer = str(item.get("answer") or "").lower()
+        words = _WORD_RE.findall(answer)
+        terms = {w for w in _WORD_RE.findall(str(item.get("question") or "").lower())
+                 if w not in _QUESTION_STOPWORDS}
+        hedges = sum(answer.count(h) for h in _HEDGES)
+        has_outcome = any(m in answer for m in _OUTCOME_MARKERS) or bool(re.search(r"\d", answer))
+        length = min(1.0, len(words) / 120)
+        short += length < 0.5
+        hedged += hedges > 0
+        no_outcome += not has_outcome
+        tone.append(50 + 30 * length + (10 if has_outcome else 0))
+        confidence.append(max(20, 75 + (15 if has_outcome else 0) - 15 * hedges - (20 if length < 0.25 else 0)))
+        relevance.append(40 + 50 * (len(terms & set(words)) / len(terms) if terms else 0.5) * min(1.0, 2 * length))
+    scores = {key: int(round(sum(values) / len(values))) if values else 0
+              for key, values in (("tone", tone), ("confidence", confidence), ("relevance", relevance))}
+    tips = []
+    if no_outcome:
+        tips.append("End each answer with a concrete, quantified result.")
+    if short:
+        tips.append("Give more detail using the STAR method (situation, task, action, result).")
+    if hedged:
+        tips.append("Avoid hedging phrases like 'I think' or 'maybe'; state what you did.")
+    return {
+        **scores,
+        "total_marks": round(sum(scores.values()) / 3, 2),
+        "feedback": tips[:3] or ["Keep structuring answers around your own actions and their results."],
+        # Kept out of the cohort history, which holds LLM-graded scores only
+        "scored_locally": True,
+    }
 
-        chain = prompt_temp | llm | parser
 
-        result = chain.invoke({
-            "resume_text": resume_txt,
-            "answers": answers
-        })
+def mock_interview_analyser(resume_txt: str, answers: list[dict[str, Any]]) -> dict:
+    try:
+        result = invoke_structured(
+            get_llm("mock_evaluation"),
+            ToolPrompts.mock_interview_prompt,
+            MockInterviewFeedback,
+            {
+                "resume_text": resume_txt,
+                "answers": answers
+            },
+            llm_task="mock_evaluation",
+        )
 
         return success_response(result.dict())
 
@@ -1,39 +1,53 @@
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import os
 from prompts.tool_prompts import ToolPrompts
-from llm import llm  # Your Gemini or Groq LLM
-from langchain.output_parsers import PydanticOutputParser
+from llm import get_llm
+from agents.structured_output import invoke_structured
 from models.models import OutcomeModel, error_response, success_response
+from typing import Optional
+from deadlines import has_budget, mark_degraded
+from token_budget import within_token_budget
 
-parser = PydanticOutputParser(
-    pydantic_object=OutcomeModel,
-)
-template = PromptTemplate(
-    input_variables=["resume_avg", "mock_avg"],
-    template=ToolPrompts.PREDICTOR_PROMPT,
-    partial_variables={
-        "format_instructions": parser.get_format_instructions()
+# Below this much remaining budget the LLM justification is replaced by a local one
+PREDICTION_MIN_BUDGET = float(os.getenv("PREDICTION_MIN_BUDGET", "3"))
+
+
+def _local_prediction(resume_scores: dict, mock_scores: dict, resume_avg: float,
+                      mock_avg: float) -> dict:
+    """Score and justification computed without the LLM, naming the weakest area."""
+    areas = {
+        "resume clarity": resume_scores["clarity"],
+        "resume relevance": resume_scores["relevance"],
+        "resume structure": resume_scores["structure"],
+        "interview tone": mock_scores["tone"],
+        "interview confidence": mock_scores["confidence"],
+        "interview relevance": mock_scores["relevance"],
+    }
+    weakest = min(areas, key=areas.get)
+    return {
+        "score": round((resume_avg + mock_avg) / 2, 1),
+        "justification": f"Resume average {resume_avg:.0f}, mock interview average {mock_avg:.0f}; "
+                         f"the weakest area is {weakest} ({areas[weakest]}).",
     }
-)
-predictor_chain = LLMChain(
-    llm=llm,
-    prompt=template,
-    output_parser=parser,
-    verbose=True
-)
 
 
-def predict_outcome(resume_scores: dict, mock_scores: dict) -> dict:
+def predict_outcome(resume_scores: dict, mock_scores: dict, resume_avg: Optional[float] = None) -> dict:
     try:
         resume_scores = resume_scores["data"]
         mock_scores = mock_scores["data"]
 
         # Calculate averages
-        resume_avg = (
-            resume_scores['clarity'] + resume_scores['relevance'] + resume_scores['structure']) / 3
+        if resume_avg is None:
+            resume_avg = (
+                resume_scores['clarity'] + resume_scores['relevance'] + resume_scores['structure']) / 3
         mock_avg = (
             mock_scores['tone'] + mock_scores['confidence'] + mock_scores['relevance']) / 3
 
+        over_tokens = not within_token_budget()
+        if over_tokens or not has_budget(PREDICTION_MIN_BUDGET):
+            mark_degraded("success_prediction.justification",
+                          "token budget" if over_tokens else "deadline")
+            return success_response(_local_prediction(resume_scores, mock_scores, resume_avg, mock_avg))
+
         # Prepare inputs for the prompt
         inputs = {
             "resume_response": resume_scores,
@@ -44,7 +58,8 @@ def predict_outcome(resume_scores: dict, mock_scores: dict) -> dict:
         }
 
         # Generate prediction justification
-        prediction_justification = predictor_chain.run(inputs)
+        prediction_justification = invoke_structured(
+            get_llm("prediction"), ToolPrompts.PREDICTOR_PROMPT, OutcomeModel, inputs, llm_task="prediction")
         pred_dict = prediction_justification.dict()
 
         res = {
@@ -0,0 +1,155 @@
+# Resource Prefetcher module
+import contextvars
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from fire_crawl_services import FireCrawlService
+from database.resource_index import resource_index
+from metrics import record_cache
+
+# After the first API call the candidate spends minutes answering questions;
+# Firecrawl lookups for the improvement topics the resume feedback already
+# points at are run in that window so the gap fixer can reuse them
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_MAX_QUERIES = int(os.getenv("PREFETCH_MAX_QUERIES", "4"))
+PREFETCH_MAX_WORKERS = int(os.getenv("PREFETCH_MAX_WORKERS", "4"))
+# Word-set Jaccard similarity a gap fixer query needs to reuse a prefetched one
+PREFETCH_MATCH_SIMILARITY = float(os.getenv("PREFETCH_MATCH_SIMILARITY", "0.5"))
+# Interview answer practice comes up in nearly every improvement plan
+PREFETCH_STATIC_QUERIES = [q.strip() for q in os.getenv(
+    "PREFETCH_STATIC_QUERIES", "STAR method interview examples").split(",") if q.strip()]
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = frozenset((
+    "a", "an", "and", "the", "of", "to", "in", "on", "for", "with", "your", "you",
+    "is", "are", "be", "as", "at", "by", "or", "it", "its", "this", "that", "more",
+    "consider", "should", "could", "would", "add", "adding", "make", "use", "using",
+))
+
+
+def query_terms(query: str) -> FrozenSet[str]:
+    return frozenset(w for w in _WORD_RE.findall(query.lower()) if w not in _STOPWORDS)
+
+
+def feedback_query(item: str, topic: str = "resume") -> Optional[str]:
+    """
+    Search query for one feedback item, e.g. "Quantify achievements with
+    metrics." -> "quantify achievements metrics resume".
+    """
+    words = [w for w in _WORD_RE.findall(str(item).lower()) if w not in _STOPWORDS][:6]
+    if not words:
+        return None
+    return " ".join(words + ([] if topic in words else [topic]))
+
+
+def improvement_queries(feedback: List[str], max_queries: int = PREFETCH_MAX_QUERIES) -> List[str]:
+    """
+    Turn resume feedback items into search queries likely to be produced
+    by the gap fixer.
+    """
+    queries = list(PREFETCH_STATIC_QUERIES)
+    for item in feedback:
+        query = feedback_query(item)
+        if query:
+            queries.append(query)
+    seen, unique = set(), []
+    for query in queries:
+        if query.lower() not in seen:
+            seen.add(query.lower())
+            unique.append(query)
+    return unique[:max_queries]
+
+
+def match_prefetched(query: str, resources: Dict[str, str],
+                     similarity: float = PREFETCH_MATCH_SIMILARITY) -> Optional[str]:
+    """
+    Return the prefetched URL for the most similar prefetched query, or
+    None when nothing is similar enough.
+    """
+    terms = query_terms(query)
+    best_url, best_score = None, 0.0
+    for prefetched_query, url in resources.items():
+        other = query_terms(prefetched_query)
+        if not terms or not other:
+            continue
+        score = len(terms & other) / len(terms | other)
+        if score > best_score:
+            best_url, best_score = url, score
+    hit = best_url is not None and best_score >= similarity
+    record_cache("gap_fixer_prefetch", hit)
+    return best_url if hit else None
+
+
+class ResourcePrefetcher:
+    """
+    Runs speculative Firecrawl lookups per session in a background pool.
+    Nothing blocks on them: `results` only returns lookups that finished.
+    """
+
+    def __init__(self, max_workers: int = PREFETCH_MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="prefetch")
+        return self._executor
+
+    def start(self, session_id: str, resume_analysis: Dict[str, Any]) -> None:
+        """
+        Args:
+            session_id: Session the lookups belong to
+            resume_analysis: `success_response` of `resume_analyse`
+        """
+        if not PREFETCH_ENABLED or not resume_analysis.get("success"):
+            return
+        data = resume_analysis.get("data", {})
+        # Resume side of the outcome prediction only depends on the first call;
+        # left to the predictor when any score is missing
+        scores = [data.get(key) for key in ("clarity", "relevance", "structure")]
+        resume_avg = sum(scores) / 3 if None not in scores else None
+        futures: Dict[str, Future] = {}
+        for query in improvement_queries(data.get("feedback", [])):
+            context = contextvars.copy_context()
+            futures[query] = self._pool().submit(context.run, self._lookup, query)
+        with self._lock:
+            self._sessions[session_id] = {"resume_avg": resume_avg, "futures": futures}
+        print(f"🔮 Prefetching {len(futures)} improvement resources for session {session_id}")
+
+    @staticmethod
+    def _lookup(query: str) -> str:
+        search_res = FireCrawlService().search(query, n_res=1)
+        resource_index.add_pages(search_res.data)
+        return search_res.data[0]["url"]
+
+    def results(self, session_id: str) -> Dict[str, Any]:
+        """
+        Returns:
+            {"resume_avg": float | None, "resources": {query: url}} with only
+            the lookups that completed successfully
+        """
+        with self._lock:
+            entry = self._sessions.get(session_id)
+        if entry is None:
+            return {"resume_avg": None, "resources": {}}
+        resources = {}
+        for query, future in entry["futures"].items():
+            if future.done() and future.exception() is None:
+                resources[query] = future.result()
+        return {"resume_avg": entry["resume_avg"], "resources": resources}
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            for future in entry["futures"].values():
+                future.cancel()
+
+
+resource_prefetcher = ResourcePrefetcher()
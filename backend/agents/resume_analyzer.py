@@ -1,12 +1,12 @@
 from itertools import chain
 from models.models import ResumeScore, success_response, error_response
 from prompts.tool_prompts import ToolPrompts
-from llm import llm
+from llm import get_llm
 import pdfplumber
 import os
-import docx2txt
-from langchain_core.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
+from agents.structured_output import invoke_structured
+from agents.input_validator import prevalidate
+from agents.docx_extractor import extract_docx_text
 
 
 def extract_resume(directory: str) -> str:
@@ -32,7 +32,7 @@ def extract_resume(directory: str) -> str:
 
         elif filename.lower().endswith('.docx'):
             try:
-                return docx2txt.process(file_path).strip()
+                return extract_docx_text(file_path).strip()
             except Exception as e:
                 raise RuntimeError(
                     f"Failed to read DOCX '{filename}': {str(e)}")
@@ -43,19 +43,21 @@ def extract_resume(directory: str) -> str:
 
 def resume_analyse(resume_txt: str, job_description: str):
     try:
+        # Reject clearly invalid uploads without spending an LLM call
+        validation = prevalidate(resume_txt, job_description)
+        if not validation.valid:
+            return error_response(validation.message)
 
-        parser = PydanticOutputParser(pydantic_object=ResumeScore)
-        prompt = PromptTemplate(
-            template=ToolPrompts.resume_analyzer_prompt,
-            input_variables=["resume_text", "job_description"],
-            partial_variables={"format_instructions": parser.get_format_instructions
-                               ()})
-
-        chain = prompt | llm | parser
-        result = chain.invoke({
-            "resume_text": resume_txt,
-            "job_description": job_description
-        })
+        result = invoke_structured(
+            get_llm("resume_analysis"),
+            ToolPrompts.resume_analyzer_prompt,
+            ResumeScore,
+            {
+                "resume_text": resume_txt,
+                "job_description": job_description
+            },
+            llm_task="resume_analysis",
+        )
         if not result.is_valid_resume and not result.is_valid_job_description:
             return error_response(result.validation_message or "The provided resume and job description is not valid.")
         elif not result.is_valid_resume:
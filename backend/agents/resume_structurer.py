@@ -0,0 +1,212 @@
+# Resume Structurer module
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+SECTION_HEADERS = {
+    "contact": ("contact", "contact information", "contact details", "personal details",
+                "personal information"),
+    "summary": ("summary", "professional summary", "profile", "professional profile",
+                "objective", "career objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience",
+                   "employment history", "work history", "employment", "career history"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies",
+               "competencies", "technologies", "tools and technologies"),
+    "education": ("education", "academic background", "academic qualifications",
+                  "qualifications", "education and training"),
+    "projects": ("projects", "personal projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications",
+                       "courses"),
+}
+_HEADER_LOOKUP = {alias: section for section,
+                  aliases in SECTION_HEADERS.items() for alias in aliases}
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_URL_RE = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com)/[\w/-]+", re.I)
+# A date is a year, optionally preceded by a month name ("Jan", "March") or
+# number ("06/2017", "6.2017"); the end of a range may also be "present"
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = r"(?:" + _MONTH + r"\s+|(?:0?[1-9]|1[0-2])\s*[/.]\s*)?((?:19|20)\d{2})"
+_YEAR_RANGE_RE = re.compile(
+    r"\b" + _DATE + r"\s*(?:-|–|—|to|until)\s*(?:" + _DATE + r"|(present|current|now|today))\b",
+    re.I)
+_BULLET_RE = re.compile(r"^\s*(?:[-•*▪●◦]|\d+[.)])\s*")
+_SKILL_SPLIT_RE = re.compile(r"\s*(?:,|;|\||•|·)\s*")
+
+MAX_SKILLS = 30
+MAX_HIGHLIGHTS_PER_ROLE = 3
+MAX_LINES_PER_LIST = 6
+
+
+def _header_section(line: str) -> Optional[str]:
+    candidate = re.sub(r"[^a-z& ]", "", line.lower()).replace("&", "and").strip()
+    if not candidate or len(candidate) > 40:
+        return None
+    return _HEADER_LOOKUP.get(candidate)
+
+
+def segment_sections(resume_text: str) -> Dict[str, List[str]]:
+    """
+    Split resume text into sections by recognised header lines.
+
+    Returns:
+        Dict of section name -> non-empty lines. Lines before the first
+        header (usually name and contact details) go under "header".
+    """
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for raw_line in resume_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        section = _header_section(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _extract_contact(lines: List[str]) -> Dict[str, Any]:
+    text = "\n".join(lines)
+    email = _EMAIL_RE.search(text)
+    phone = _PHONE_RE.search(text)
+    return {
+        "name": lines[0] if lines and not _EMAIL_RE.search(lines[0]) else None,
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0).strip() if phone else None,
+        "links": sorted(set(_URL_RE.findall(text))),
+    }
+
+
+def _extract_skills(lines: List[str]) -> List[str]:
+    skills: List[str] = []
+    seen = set()
+    for line in lines:
+        line = _BULLET_RE.sub("", line)
+        # "Languages: Python, Go" -> "Python, Go"
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for skill in _SKILL_SPLIT_RE.split(line):
+            skill = skill.strip(" .")
+            if skill and len(skill) <= 40 and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills[:MAX_SKILLS]
+
+
+def _year_range(line: str) -> Optional[Tuple[int, int, str]]:
+    match = _YEAR_RANGE_RE.search(line)
+    if not match:
+        return None
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else date.today().year
+    return start, end, match.group(0)
+
+
+def _extract_experience(lines: List[str]) -> List[Dict[str, Any]]:
+    roles: List[Dict[str, Any]] = []
+    seen = set()
+    current: Optional[Dict[str, Any]] = None
+    previous: Optional[str] = None
+    for line in lines:
+        period = _year_range(line)
+        if period and not _BULLET_RE.match(line):
+            start, end, matched = period
+            title = line.replace(matched, "").strip(" ()|,-–—")
+            if not title and previous is not None:
+                # Dates on their own line under "Title, Company"
+                title = previous
+                if current is not None and current["highlights"][-1:] == [previous]:
+                    current["highlights"].pop()
+            # Repeated role blocks (e.g. copy-pasted sections) are kept once
+            current = None if (title, start, end) in seen else {
+                "title": title, "start": start, "end": end, "highlights": []}
+            if current is not None:
+                seen.add((title, start, end))
+                roles.append(current)
+        elif current is not None and len(current["highlights"]) < MAX_HIGHLIGHTS_PER_ROLE:
+            current["highlights"].append(_BULLET_RE.sub("", line))
+        previous = None if _BULLET_RE.match(line) or period else line
+    return roles
+
+
+def _extract_list(lines: List[str]) -> List[str]:
+    return [_BULLET_RE.sub("", line) for line in lines][:MAX_LINES_PER_LIST]
+
+
+def _years_of_experience(roles: List[Dict[str, Any]]) -> int:
+    # Merge overlapping periods so concurrent roles are not double counted
+    periods = sorted((role["start"], role["end"]) for role in roles if role["end"] >= role["start"])
+    total, current_start, current_end = 0, None, None
+    for start, end in periods:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def structure_resume(resume_text: str) -> Dict[str, Any]:
+    """
+    Rule-based structuring of extracted resume text into a compact profile.
+
+    Args:
+        resume_text: Plain text returned by `extract_resume`
+
+    Returns:
+        Dict with keys: contact, summary, skills, experience, education,
+        projects, certifications, years_experience and sections_found
+    """
+    sections = segment_sections(resume_text)
+    roles = _extract_experience(sections.get("experience", []))
+    return {
+        "contact": _extract_contact(sections.get("header", []) + sections.get("contact", [])),
+        "summary": " ".join(sections.get("summary", [])),
+        "skills": _extract_skills(sections.get("skills", [])),
+        "experience": roles,
+        "education": sections.get("education", []),
+        "projects": _extract_list(sections.get("projects", [])),
+        "certifications": _extract_list(sections.get("certifications", [])),
+        "years_experience": _years_of_experience(roles),
+        "sections_found": [name for name, lines in sections.items() if name != "header"],
+    }
+
+
+def render_resume_profile(profile: Dict[str, Any]) -> str:
+    """Render the compact profile as prompt text for downstream agents."""
+    lines = []
+    if profile.get("summary"):
+        lines.append(f"Summary: {profile['summary']}")
+    if profile.get("skills"):
+        lines.append(f"Skills: {', '.join(profile['skills'])}")
+    if profile.get("experience"):
+        lines.append(f"Experience ({profile.get('years_experience', 0)} years):")
+        for role in profile["experience"]:
+            lines.append(f"- {role['title']} ({role['start']}-{role['end']})")
+            lines.extend(f"  - {highlight}" for highlight in role["highlights"])
+    if profile.get("projects"):
+        lines.append("Projects:")
+        lines.extend(f"- {project}" for project in profile["projects"])
+    if profile.get("education"):
+        lines.append(f"Education: {'; '.join(profile['education'])}")
+    if profile.get("certifications"):
+        lines.append(f"Certifications: {'; '.join(profile['certifications'])}")
+    return "\n".join(lines)
+
+
+def resume_context(profile: Dict[str, Any], resume_text: str) -> str:
+    """
+    Resume text for evaluation prompts: the compact profile when work
+    experience was recognised, otherwise the full extracted text so nothing
+    the rules missed is hidden from the evaluator.
+    """
+    if not (profile or {}).get("experience"):
+        return resume_text
+    return render_resume_profile(profile) or resume_text
@@ -0,0 +1,143 @@
+# Structured Output module
+import json
+import os
+from typing import Any, Dict, List, Optional, Type
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import PromptTemplate
+from langchain_core.utils.json import parse_json_markdown
+from langchain.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, ValidationError
+from prompts.tool_prompts import ToolPrompts
+
+# "native" uses the model's tool-calling/JSON output; "parser" keeps the
+# schema dump in the prompt and parses the text response
+STRUCTURED_OUTPUT_MODE = os.getenv("STRUCTURED_OUTPUT_MODE", "native").lower()
+STRUCTURED_OUTPUT_METHOD = os.getenv(
+    "STRUCTURED_OUTPUT_METHOD", "function_calling")
+STRUCTURED_REPAIR_ATTEMPTS = int(os.getenv("STRUCTURED_REPAIR_ATTEMPTS", "1"))
+# How much of the original prompt the repair call sees for context
+STRUCTURED_REPAIR_CONTEXT_CHARS = int(
+    os.getenv("STRUCTURED_REPAIR_CONTEXT_CHARS", "4000"))
+
+# Replaces the full JSON schema dump when the schema travels as a tool definition
+NATIVE_FORMAT_INSTRUCTIONS = "Return the result using the provided output schema."
+
+
+class StructuredOutputError(ValueError):
+    pass
+
+
+def invoke_structured(llm: BaseChatModel, template: str, schema: Type[BaseModel],
+                      inputs: Dict[str, Any], llm_task: str) -> BaseModel:
+    """
+    Fill `template` (which must contain `{format_instructions}`), call the
+    model and return a validated `schema` instance.
+
+    Args:
+        llm: Chat model to call
+        template: Prompt template string from ToolPrompts
+        schema: Pydantic model the response must validate against
+        inputs: Template variables
+        llm_task: Label attached to the call for metrics/tracing
+
+    Returns:
+        The validated pydantic object. Fields that fail validation are
+        re-asked in a small repair call instead of failing the whole response.
+    """
+    config = {"metadata": {"llm_task": llm_task}}
+    structured_llm = _native_llm(llm, schema)
+    if structured_llm is not None:
+        prompt = PromptTemplate.from_template(template).partial(
+            format_instructions=NATIVE_FORMAT_INSTRUCTIONS)
+        prompt_text = prompt.format(**inputs)
+        result = structured_llm.invoke(prompt_text, config=config)
+        if result.get("parsed") is not None:
+            return result["parsed"]
+        raw = _raw_payload(result.get("raw"))
+    else:
+        parser = PydanticOutputParser(pydantic_object=schema)
+        prompt = PromptTemplate.from_template(template).partial(
+            format_instructions=parser.get_format_instructions())
+        prompt_text = prompt.format(**inputs)
+        response = llm.invoke(prompt_text, config=config)
+        text = getattr(response, "content", str(response))
+        try:
+            return parser.parse(text)
+        except OutputParserException:
+            raw = _load_json(text)
+
+    return _repair(llm, schema, raw, prompt_text, config)
+
+
+def _native_llm(llm: BaseChatModel, schema: Type[BaseModel]):
+    if STRUCTURED_OUTPUT_MODE != "native":
+        return None
+    try:
+        return llm.with_structured_output(
+            schema, method=STRUCTURED_OUTPUT_METHOD, include_raw=True)
+    except NotImplementedError:
+        # Models without tool calling (e.g. local stand-ins) use the parser path
+        return None
+
+
+def _raw_payload(raw: Any) -> Optional[Dict[str, Any]]:
+    tool_calls = getattr(raw, "tool_calls", None)
+    if tool_calls:
+        return tool_calls[0].get("args")
+    return _load_json(getattr(raw, "content", "") or "")
+
+
+def _load_json(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = parse_json_markdown(text)
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _invalid_fields(schema: Type[BaseModel], data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    try:
+        schema(**data)
+        return []
+    except ValidationError as e:
+        return e.errors()
+
+
+def _repair(llm: BaseChatModel, schema: Type[BaseModel], data: Optional[Dict[str, Any]],
+            prompt_text: str, config: Dict[str, Any]) -> BaseModel:
+    if data is None:
+        raise StructuredOutputError(
+            f"{schema.__name__}: model response was not a JSON object")
+
+    full_schema = schema.model_json_schema()
+    for attempt in range(STRUCTURED_REPAIR_ATTEMPTS + 1):
+        errors = _invalid_fields(schema, data)
+        if not errors:
+            return schema(**data)
+        if attempt == STRUCTURED_REPAIR_ATTEMPTS:
+            break
+
+        fields = sorted({str(error["loc"][0]) for error in errors if error["loc"]})
+        field_schema = {"properties": {
+            field: full_schema["properties"][field]
+            for field in fields if field in full_schema.get("properties", {})
+        }}
+        if "$defs" in full_schema:
+            field_schema["$defs"] = full_schema["$defs"]
+        print(f"🔧 Repairing {schema.__name__} fields: {', '.join(fields)}")
+
+        prompt = PromptTemplate.from_template(ToolPrompts.structured_repair_prompt)
+        response = llm.invoke(prompt.format(
+            errors="\n".join(
+                f"- {'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in errors),
+            field_schema=json.dumps(field_schema),
+            original_prompt=prompt_text[:STRUCTURED_REPAIR_CONTEXT_CHARS],
+            fields=", ".join(fields),
+        ), config=config)
+        patch = _load_json(getattr(response, "content", str(response))) or {}
+        data = {**data, **{field: patch[field] for field in fields if field in patch}}
+
+    raise StructuredOutputError(
+        f"{schema.__name__} failed validation: {_invalid_fields(schema, data)}")
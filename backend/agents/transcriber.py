@@ -0,0 +1,182 @@
+# Audio Transcriber module
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+import wave
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import BinaryIO, Iterator, Optional
+
+from metrics import AUDIO_SECONDS_TRANSCRIBED
+from tracing import span
+
+# Audio is transcribed as 16 kHz mono 16-bit PCM, the format Whisper expects
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+# Whisper decodes 30 second windows, so larger chunks gain nothing
+TRANSCRIPTION_CHUNK_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "30"))
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", str(os.cpu_count() or 1)))
+AUDIO_MAX_SECONDS = float(os.getenv("AUDIO_MAX_SECONDS", "600"))
+TRANSCRIBER_BACKEND = os.getenv("TRANSCRIBER_BACKEND", "whisper")
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "en")
+
+
+class Transcriber(ABC):
+    """
+    Turns one chunk of 16 kHz mono 16-bit PCM into text. Instances are
+    pickled to the transcription worker processes, so keep them light and
+    load models lazily inside `transcribe`.
+    """
+
+    @abstractmethod
+    def transcribe(self, pcm: bytes) -> str:
+        ...
+
+
+@lru_cache(maxsize=None)
+def _whisper_model(name: str):
+    import whisper
+    return whisper.load_model(name, device="cpu")
+
+
+class WhisperTranscriber(Transcriber):
+    def __init__(self, model_name: str = WHISPER_MODEL, language: str = WHISPER_LANGUAGE) -> None:
+        self.model_name = model_name
+        self.language = language or None
+
+    def transcribe(self, pcm: bytes) -> str:
+        import numpy as np
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        result = _whisper_model(self.model_name).transcribe(
+            audio, fp16=False, language=self.language)
+        return result["text"].strip()
+
+
+_override: Optional[Transcriber] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_transcriber() -> Transcriber:
+    if _override is not None:
+        return _override
+    if TRANSCRIBER_BACKEND != "whisper":
+        raise ValueError(f"Unknown TRANSCRIBER_BACKEND '{TRANSCRIBER_BACKEND}'")
+    return WhisperTranscriber()
+
+
+def use_transcriber(transcriber: Optional[Transcriber]) -> None:
+    """Transcribe with `transcriber` (e.g. a local stand-in); None restores Whisper."""
+    global _override
+    _override = transcriber
+
+
+def transcription_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked: the API process runs threads
+            _pool = ProcessPoolExecutor(max_workers=max(1, TRANSCRIPTION_WORKERS),
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_transcription_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _read_chunks(stream: BinaryIO, chunk_bytes: int, max_bytes: int) -> Iterator[bytes]:
+    total = 0
+    while True:
+        chunk = stream.read(chunk_bytes)
+        if not chunk:
+            return
+        total += len(chunk)
+        if total > max_bytes:
+            raise ValueError(f"Audio answers are limited to {AUDIO_MAX_SECONDS:.0f} seconds")
+        yield chunk
+
+
+def iter_pcm_chunks(path: str, chunk_seconds: float = TRANSCRIPTION_CHUNK_SECONDS,
+                    max_seconds: float = AUDIO_MAX_SECONDS) -> Iterator[bytes]:
+    """
+    Stream an audio file as fixed-size chunks of 16 kHz mono 16-bit PCM.
+
+    WAV files already in that format are read directly; anything else is
+    decoded by an ffmpeg subprocess, read from its stdout as it is produced.
+    """
+    chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+    max_bytes = int(max_seconds * SAMPLE_RATE) * SAMPLE_WIDTH
+    try:
+        with wave.open(path, "rb") as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (SAMPLE_RATE, 1, SAMPLE_WIDTH):
+                frames = chunk_bytes // SAMPLE_WIDTH
+                total = 0
+                while True:
+                    chunk = wav.readframes(frames)
+                    if not chunk:
+                        return
+                    total += len(chunk)
+                    if total > max_bytes:
+                        raise ValueError(f"Audio answers are limited to {AUDIO_MAX_SECONDS:.0f} seconds")
+                    yield chunk
+    except (wave.Error, EOFError):
+        pass  # Not a WAV file, or a WAV in another format
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise ValueError("Only 16 kHz mono 16-bit WAV audio is supported without ffmpeg")
+    process = subprocess.Popen(
+        [ffmpeg, "-nostdin", "-loglevel", "error", "-i", path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        yield from _read_chunks(process.stdout, chunk_bytes, max_bytes)
+    finally:
+        process.kill()
+        _, stderr = process.communicate()
+    if process.returncode not in (0, -9) and stderr:
+        raise ValueError(f"Could not decode audio: {stderr.decode(errors='replace').strip()}")
+
+
+def _transcribe_chunk(transcriber: Transcriber, pcm: bytes) -> str:
+    return transcriber.transcribe(pcm)
+
+
+def transcribe_audio(path: str, transcriber: Optional[Transcriber] = None,
+                     executor: Optional[Executor] = None) -> str:
+    """
+    Transcribe an audio file. Chunks are submitted to the worker pool as
+    they are read, so decoding overlaps with transcription.
+
+    Returns:
+        Transcripts of every chunk joined in order
+    """
+    transcriber = transcriber or get_transcriber()
+    shared_pool = executor is None
+    executor = executor or transcription_pool()
+    with span("transcription", path=os.path.basename(path)) as attributes:
+        futures = []
+        seconds = 0.0
+        try:
+            for chunk in iter_pcm_chunks(path):
+                seconds += len(chunk) / (SAMPLE_RATE * SAMPLE_WIDTH)
+                futures.append(executor.submit(_transcribe_chunk, transcriber, chunk))
+            transcript = " ".join(text for text in (f.result() for f in futures) if text)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool next time
+            if shared_pool:
+                shutdown_transcription_pool()
+            raise
+        attributes.update(chunks=len(futures), audio_seconds=round(seconds, 1))
+    AUDIO_SECONDS_TRANSCRIBED.inc(seconds)
+    return transcript
@@ -1,14 +1,33 @@
+import asyncio
 import os
 import shutil
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from tempfile import mkdtemp
 import json
 import uuid
-from typing import Dict, Any
-from models.models import AnswersPayload
-from orchestrator import behavioral_graph, mock_evaluation_graph
+from typing import Dict, Any, List, Optional
+from models.models import AnswersPayload, error_response
+from orchestrator import BEHAVIORAL_GRAPH, MOCK_EVALUATION_GRAPH, NODE_OUTPUT_KEYS, \
+    NodeFailedError, behavioral_graph, mock_evaluation_graph
+from database.checkpoints import clear_checkpoints, graph_config
+from database.db import qna_writer
+from database.evaluation_history import evaluation_history
+from agents.resource_prefetcher import resource_prefetcher
+from agents.answer_scorer import answer_scorer
+from agents.resume_structurer import resume_context
+from agents.behavioral_retriever import role_category
+from agents.transcriber import shutdown_transcription_pool, transcribe_audio
+from fire_crawl_services import close_firecrawl_clients
+from metrics import SESSION_STORE_BYTES, SESSION_STORE_SIZE, registry
+from tracing import TRACE_HEADER, current_trace_id, new_trace_id, span, start_trace, traced
+from profiler import PROFILE_HEADER, PROFILING_ENABLED, RequestProfile, should_profile, \
+    track_request_tasks
+from deadlines import BUDGET_HEADER, degraded_parts, parse_budget, request_deadline
+from sessions import SessionRecord, SessionStore
+from token_budget import bind_session, request_accounting, token_ledger
 
 app = FastAPI(title="Interview Evaluation API", version="1.0.0")
 
@@ -18,10 +37,137 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[TRACE_HEADER],
 )
 
+
+@app.on_event("startup")
+async def track_tasks():
+    if PROFILING_ENABLED:
+        # Lets request profiles leave out other requests' event loop work
+        track_request_tasks(asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    await close_firecrawl_clients()
+    # Commit question-bank writes still queued for the Chroma writer
+    await run_in_threadpool(qna_writer.flush, 10)
+    await run_in_threadpool(shutdown_transcription_pool)
+
+
+# Registered before trace_requests so it runs inside the request's trace
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Profile a single request when it is flagged and profiling is enabled"""
+    if not should_profile(request.headers.get(PROFILE_HEADER),
+                          request.query_params.get("profile")):
+        return await call_next(request)
+
+    with RequestProfile(current_trace_id() or new_trace_id()) as profile:
+        response = await call_next(request)
+    if profile.active:
+        response.headers["X-Profile-Id"] = profile.request_id
+    return response
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Run each request under its own trace and return the trace ID"""
+    with start_trace(request.headers.get(TRACE_HEADER)) as trace_id:
+        with span("http.request", method=request.method, path=request.url.path) as attributes:
+            response = await call_next(request)
+            attributes["status_code"] = response.status_code
+    response.headers[TRACE_HEADER] = trace_id
+    return response
+
+
+# Registered last so the budget clock starts before any other middleware runs
+@app.middleware("http")
+async def deadline_requests(request: Request, call_next):
+    """Give each request a latency budget that agents degrade against"""
+    with request_deadline(parse_budget(request.headers.get(BUDGET_HEADER))), \
+            request_accounting(request.scope):
+        return await call_next(request)
+
 # In-memory session store (use Redis/database in production)
-session_store: Dict[str, Dict[str, Any]] = {}
+session_store = SessionStore()
+SESSION_STORE_SIZE.set_function(lambda: len(session_store))
+SESSION_STORE_BYTES.set_function(session_store.nbytes)
+
+# How many times a failed graph may be resumed through /retry-evaluation/
+MAX_GRAPH_RETRIES = int(os.getenv("MAX_GRAPH_RETRIES", "3"))
+
+
+def _cleanup_session(session_id: str) -> None:
+    """Remove a session, its uploaded file and any graph checkpoints"""
+    session_data = session_store.pop(session_id)
+    resource_prefetcher.discard(session_id)
+    answer_scorer.discard(session_id)
+    token_ledger.discard(session_id)
+    if session_data and os.path.exists(session_data.file_path):
+        shutil.rmtree(session_data.file_path)
+    clear_checkpoints(session_id, BEHAVIORAL_GRAPH)
+    clear_checkpoints(session_id, MOCK_EVALUATION_GRAPH)
+
+
+def _evaluation_response(session_id: str, result: Dict[str, Any]) -> JSONResponse:
+    """Build the response of a completed mock evaluation graph"""
+    resume_analysis = result.get("resume_analysis", {})
+    mock_response = result.get("mock_response", {})
+    success_prediction = result.get("success_prediction", {})
+    gap_fixer = result.get("gap_fixer", {})
+
+    # Determine if all agents succeeded (optional stricter check)
+    if all([
+        resume_analysis.get("success"),
+        mock_response.get("success"),
+        success_prediction.get("success"),
+        gap_fixer.get("success")
+    ]):
+        return JSONResponse(content={
+            "success": True,
+            "data": {
+                "resume_analysis": resume_analysis.get("data", {}),
+                "mock_response": mock_response.get("data", {}),
+                "success_prediction": success_prediction.get("data", {}),
+                "gap_fixer": gap_fixer.get("data", {})
+            },
+            # Parts skipped or served from a fallback to stay within the request or token budget
+            "degraded": degraded_parts(),
+            "usage": token_ledger.session_usage(session_id),
+        })
+    return JSONResponse(content={
+        "success": False,
+        "message": "One or more agents failed",
+        "errors": {
+            "resume_analysis": resume_analysis.get("message"),
+            "mock_response": mock_response.get("message"),
+            "success_prediction": success_prediction.get("message"),
+            "gap_fixer": gap_fixer.get("message"),
+        }
+    })
+
+
+def _retryable_failure(session_id: str, graph_name: str, error: NodeFailedError) -> JSONResponse:
+    """
+    Keep the session and its checkpoint after a node failure so that
+    /retry-evaluation/ resumes from the failed node
+    """
+    print(f"❌ {error}")
+    session_data = session_store[session_id]
+    session_data.pending_graph = graph_name
+    retryable = session_data.retries < MAX_GRAPH_RETRIES
+    if not retryable:
+        _cleanup_session(session_id)
+    return JSONResponse(content={
+        "success": False,
+        "message": "One or more agents failed",
+        "errors": {NODE_OUTPUT_KEYS.get(error.node_name, error.node_name): error.message},
+        "failed_node": error.node_name,
+        "session_id": session_id,
+        "retryable": retryable,
+    })
 
 
 @app.post("/run-interview-evaluation/")
@@ -36,6 +182,7 @@ async def run_pipeline(
     try:
         # Generate unique session ID
         session_id = str(uuid.uuid4())
+        bind_session(session_id)
 
         # Save file to temp folder
         temp_dir = mkdtemp()
@@ -51,13 +198,24 @@ async def run_pipeline(
             "job_description": job_description,
         }
 
-        result = behavioral_graph.invoke(state)
+        config = graph_config(session_id, BEHAVIORAL_GRAPH)
+        pending_graph = None
+        try:
+            result = await run_in_threadpool(
+                traced(f"graph.{BEHAVIORAL_GRAPH}", behavioral_graph.invoke), state, config)
+        except NodeFailedError as e:
+            # Resume analysis is checkpointed; only question retrieval is retried
+            print(f"❌ {e}")
+            result = dict(behavioral_graph.get_state(config).values)
+            result["behavioral_questions"] = error_response(e.message)
+            pending_graph = BEHAVIORAL_GRAPH
         resume_analysis = result.get("resume_analysis", {})
 
         if not resume_analysis.get("success"):
             # Clean up temp directory on validation/analysis failure
             if os.path.exists(temp_dir):
                 shutil.rmtree(temp_dir)
+            clear_checkpoints(session_id, BEHAVIORAL_GRAPH)
 
             return JSONResponse(
                 status_code=400,
@@ -66,15 +224,24 @@ async def run_pipeline(
             )
 
         # Store ALL necessary data for the second API call
-        session_store[session_id] = {
-            "file_path": temp_dir,
-            "job_description": job_description,
-            "resume_analysis": result.get("resume_analysis"),
+        session_store.create(
+            session_id,
+            file_path=temp_dir,
+            job_description=job_description,
+            resume_analysis=result.get("resume_analysis"),
             # This is now extracted in the orchestrator
-            "resume_text": result.get("resume_text", ""),
-            "behavioral_questions": result.get("behavioral_questions"),
-
-        }
+            resume_text=result.get("resume_text", ""),
+            resume_profile=result.get("resume_profile", {}),
+            behavioral_questions=result.get("behavioral_questions"),
+            pending_graph=pending_graph,
+        )
+        if pending_graph is None:
+            clear_checkpoints(session_id, BEHAVIORAL_GRAPH)
+        try:
+            resource_prefetcher.start(session_id, resume_analysis)
+        except Exception as e:
+            # Prefetching is speculative; the predictor and gap fixer look up what they need
+            print(f"⚠️ Prefetch failed for session {session_id}: {e}")
 
         # Return questions with session ID
         behavioral_questions = result.get("behavioral_questions", {})
@@ -84,13 +251,15 @@ async def run_pipeline(
             response_data = {
                 "success": True,
                 "data": behavioral_questions.get("data", []),
-                "session_id": session_id
+                "session_id": session_id,
+                "degraded": degraded_parts(),
             }
         else:
             response_data = {
                 "success": False,
                 "message": behavioral_questions.get("message", "Failed to generate questions"),
-                "session_id": session_id
+                "session_id": session_id,
+                "retryable": pending_graph is not None
             }
 
         return JSONResponse(content=response_data)
@@ -122,6 +291,7 @@ async def submit_mock_answers(
             )
 
         session_data = session_store[session_id]
+        bind_session(session_id)
 
         # Parse answers from JSON string
         try:
@@ -132,88 +302,242 @@ async def submit_mock_answers(
                 detail="Invalid JSON format for answers"
             )
 
-        # Validate that we have the required resume_text
-        if not session_data.get("resume_text"):
-            raise HTTPException(
-                status_code=400,
-                detail="Resume text not found in session. Please restart the interview process."
-            )
+        _require_resume_text(session_data)
+        return await _run_mock_evaluation(session_id, session_data, parsed_answers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error in mock interview evaluation: {e}")
 
-        # Prepare state for mock evaluation graph
-        state = {
-            "resume_text": session_data["resume_text"],
-            "answers": parsed_answers,
+        # Clean up session on error
+        _cleanup_session(session_id)
 
-            "job_description": session_data["job_description"],
-            "resume_analysis": session_data["resume_analysis"],
-            "behavioral_questions": session_data["behavioral_questions"],
-        }
+        raise HTTPException(
+            status_code=500, detail=f"Evaluation error: {str(e)}")
 
-        # Use the mock evaluation graph
-        result = mock_evaluation_graph.invoke(state)
-        resume_analysis = result.get("resume_analysis", {})
-        mock_response = result.get("mock_response", {})
-        success_prediction = result.get("success_prediction", {})
-        gap_fixer = result.get("gap_fixer", {})
-
-        # Clean up session
-        temp_dir = session_store[session_id]["file_path"]
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-        del session_store[session_id]
-
-        # Determine if all agents succeeded (optional stricter check)
-        if all([
-            resume_analysis.get("success"),
-            mock_response.get("success"),
-            success_prediction.get("success"),
-            gap_fixer.get("success")
-        ]):
-            return JSONResponse(content={
-                "success": True,
-                "data": {
-                    "resume_analysis": resume_analysis.get("data", {}),
-                    "mock_response": mock_response.get("data", {}),
-                    "success_prediction": success_prediction.get("data", {}),
-                    "gap_fixer": gap_fixer.get("data", {})
-                }
-            })
-        else:
-            return JSONResponse(content={
-                "success": False,
-                "message": "One or more agents failed",
-                "errors": {
-                    "resume_analysis": resume_analysis.get("message"),
-                    "mock_response": mock_response.get("message"),
-                    "success_prediction": success_prediction.get("message"),
-                    "gap_fixer": gap_fixer.get("message"),
-                }
-            })
+
+@app.post("/submit-mock-audio-answers/")
+async def submit_mock_audio_answers(
+    session_id: str = Form(...),
+    questions: str = Form(...),
+    audio: List[UploadFile] = File(...),
+):
+    """
+    Audio variant of /submit-mock-answers/ - one recording per question,
+    transcribed and then evaluated like typed answers
+    Expects `questions` as JSON string: '["...", "..."]', in the order of `audio`
+    """
+    if session_id not in session_store:
+        raise HTTPException(status_code=400, detail="Invalid or expired session ID")
+
+    session_data = session_store[session_id]
+    bind_session(session_id)
+    try:
+        parsed_questions = json.loads(questions)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON format for questions")
+    if not isinstance(parsed_questions, list) or len(parsed_questions) != len(audio):
+        raise HTTPException(status_code=400, detail="Expected one audio file per question")
+    _require_resume_text(session_data)
+
+    try:
+        transcripts = await _transcribe_uploads(audio)
+        answers = [{"question": question, "answer": transcript}
+                   for question, transcript in zip(parsed_questions, transcripts)]
+        return await _run_mock_evaluation(session_id, session_data, answers)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error in mock interview evaluation: {e}")
+        print(f"❌ Error in audio mock interview evaluation: {e}")
+        _cleanup_session(session_id)
+        raise HTTPException(
+            status_code=500, detail=f"Evaluation error: {str(e)}")
 
-        # Clean up session on error
-        if session_id in session_store:
-            temp_dir = session_store[session_id]["file_path"]
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            del session_store[session_id]
 
+async def _transcribe_uploads(uploads: List[UploadFile]) -> List[str]:
+    """Transcribe uploaded recordings concurrently; undecodable audio is a 400."""
+    temp_dir = mkdtemp()
+    try:
+        paths = []
+        for i, upload in enumerate(uploads):
+            path = os.path.join(temp_dir, f"{i}_{os.path.basename(upload.filename or 'answer')}")
+            with open(path, "wb") as f:
+                shutil.copyfileobj(upload.file, f)
+            paths.append(path)
+        return list(await asyncio.gather(
+            *(run_in_threadpool(transcribe_audio, path) for path in paths)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _require_resume_text(session_data: SessionRecord) -> None:
+    if not session_data.resume_text:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume text not found in session. Please restart the interview process."
+        )
+
+
+def _resume_context(session_data: SessionRecord) -> str:
+    return resume_context(session_data.resume_profile, session_data.resume_text)
+
+
+async def _run_mock_evaluation(session_id: str, session_data: SessionRecord,
+                               answers: List[Dict[str, Any]],
+                               mock_response: Optional[Dict[str, Any]] = None) -> JSONResponse:
+    """
+    Run the mock evaluation graph for a session and clean it up on success.
+    A precomputed `mock_response` skips the mock evaluator node.
+    """
+    # Only what the mock evaluation nodes read: the rendered resume context
+    # stands in for both the resume text and profile, and the job
+    # description and questions stay in the session store
+    state = {
+        "resume_text": _resume_context(session_data),
+        "answers": answers,
+        "resume_analysis": session_data.resume_analysis,
+        "category": role_category(session_data.job_description),
+        # Whatever speculative lookups finished while the candidate answered
+        "prefetched": resource_prefetcher.results(session_id),
+    }
+    if mock_response is not None:
+        state["mock_response"] = mock_response
+
+    # Run the graph off the event loop so concurrent evaluations can be batched
+    config = graph_config(session_id, MOCK_EVALUATION_GRAPH)
+    # A fresh submission starts over rather than resuming an earlier failure
+    clear_checkpoints(session_id, MOCK_EVALUATION_GRAPH)
+    try:
+        result = await run_in_threadpool(
+            traced(f"graph.{MOCK_EVALUATION_GRAPH}", mock_evaluation_graph.invoke), state, config)
+    except NodeFailedError as e:
+        return _retryable_failure(session_id, MOCK_EVALUATION_GRAPH, e)
+
+    response = _evaluation_response(session_id, result)
+    # Clean up session
+    _cleanup_session(session_id)
+    return response
+
+
+@app.post("/submit-mock-answer/")
+async def submit_mock_answer(
+    session_id: str = Form(...),
+    question: str = Form(...),
+    answer: Optional[str] = Form(None),
+    audio: Optional[UploadFile] = File(None),
+    index: Optional[int] = Form(None),
+):
+    """
+    Submit a single mock answer, typed or as an `audio` recording; it is
+    scored in the background while the candidate answers the next question.
+    `index` defaults to the next position; resubmitting an index replaces
+    that answer.
+    """
+    if session_id not in session_store:
+        raise HTTPException(status_code=400, detail="Invalid or expired session ID")
+    if answer is None and audio is None:
+        raise HTTPException(status_code=400, detail="Provide either an answer or an audio recording")
+
+    session_data = session_store[session_id]
+    bind_session(session_id)
+    _require_resume_text(session_data)
+    answers = session_data.answers
+    index = len(answers) if index is None else index
+    # Answers are ordered by index, so only existing positions or the next one are allowed
+    if not 0 <= index <= len(answers):
+        raise HTTPException(status_code=400, detail=f"Answer index must be between 0 and {len(answers)}")
+    if audio is not None:
+        answer = (await _transcribe_uploads([audio]))[0]
+    answers[index] = {"question": question, "answer": answer}
+    received = answer_scorer.submit(
+        session_id, index, _resume_context(session_data), answers[index])
+    return {"success": True, "session_id": session_id, "index": index,
+            "answers_received": received}
+
+
+@app.post("/finalize-mock-answers/")
+async def finalize_mock_answers(session_id: str = Form(...)):
+    """
+    Final call of incremental submission - aggregates the per-answer scores
+    and runs the outcome predictor and gap fixer
+    """
+    if session_id not in session_store:
+        raise HTTPException(status_code=400, detail="Invalid or expired session ID")
+
+    session_data = session_store[session_id]
+    bind_session(session_id)
+    try:
+        answers, mock_response = await run_in_threadpool(
+            traced("answer_scorer.finalize", answer_scorer.finalize),
+            session_id, _resume_context(session_data))
+        if not answers:
+            raise HTTPException(status_code=400, detail=mock_response["message"])
+        return await _run_mock_evaluation(
+            session_id, session_data, answers,
+            mock_response if mock_response.get("success") else None)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error finalizing mock interview evaluation: {e}")
+        _cleanup_session(session_id)
+        raise HTTPException(
+            status_code=500, detail=f"Evaluation error: {str(e)}")
+
+
+@app.post("/retry-evaluation/{session_id}")
+async def retry_evaluation(session_id: str):
+    """
+    Resume a session's failed graph from the node that failed, reusing the
+    checkpointed output of every node that already succeeded
+    """
+    if session_id not in session_store:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    session_data = session_store[session_id]
+    bind_session(session_id)
+    graph_name = session_data.pending_graph
+    if graph_name is None:
+        raise HTTPException(
+            status_code=400, detail="Session has no failed evaluation to retry")
+
+    session_data.retries += 1
+    graph = behavioral_graph if graph_name == BEHAVIORAL_GRAPH else mock_evaluation_graph
+    try:
+        # A None input resumes the checkpointed thread instead of starting over
+        result = await run_in_threadpool(
+            traced(f"graph.{graph_name}", graph.invoke), None, graph_config(session_id, graph_name))
+    except NodeFailedError as e:
+        return _retryable_failure(session_id, graph_name, e)
+    except Exception as e:
+        print(f"❌ Error retrying evaluation: {e}")
+        _cleanup_session(session_id)
         raise HTTPException(
             status_code=500, detail=f"Evaluation error: {str(e)}")
 
+    if graph_name == BEHAVIORAL_GRAPH:
+        session_data.pending_graph = None
+        session_data.behavioral_questions = result.get("behavioral_questions")
+        clear_checkpoints(session_id, BEHAVIORAL_GRAPH)
+        return JSONResponse(content={
+            "success": True,
+            "data": result["behavioral_questions"].get("data", []),
+            "session_id": session_id,
+            "degraded": degraded_parts(),
+        })
+
+    response = _evaluation_response(session_id, result)
+    _cleanup_session(session_id)
+    return response
+
 
 @app.delete("/cleanup-session/{session_id}")
 async def cleanup_session(session_id: str):
     """Optional endpoint to manually clean up sessions"""
     try:
         if session_id in session_store:
-            temp_dir = session_store[session_id]["file_path"]
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            del session_store[session_id]
+            _cleanup_session(session_id)
             return {"message": "Session cleaned up successfully"}
         else:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -227,6 +551,24 @@ async def health_check():
     return {"status": "healthy", "message": "Interview Evaluation API is running"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/usage")
+async def get_usage():
+    """LLM token usage and estimated cost per endpoint since startup"""
+    return token_ledger.endpoint_usage()
+
+
+@app.get("/cohort/{category}")
+async def get_cohort_stats(category: str):
+    """Outcome score distribution of past evaluations for a role category"""
+    return evaluation_history.cohort_stats(category)
+
+
 @app.get("/session/{session_id}")
 async def get_session_info(session_id: str):
     """Debug endpoint to check session data"""
@@ -236,8 +578,13 @@ async def get_session_info(session_id: str):
     session_data = session_store[session_id]
     return {
         "session_id": session_id,
-        "has_resume_analysis": bool(session_data.get("resume_analysis")),
-        "has_resume_text": bool(session_data.get("resume_text")),
-        "has_behavioral_questions": bool(session_data.get("behavioral_questions")),
-        "job_description_length": len(session_data.get("job_description", ""))
+        "has_resume_analysis": bool(session_data.resume_analysis),
+        "has_resume_text": bool(session_data.resume_text),
+        "resume_sections": session_data.resume_profile.get("sections_found", []),
+        "has_behavioral_questions": bool(session_data.behavioral_questions),
+        "answers_received": len(session_data.answers),
+        "answers_scored": len(answer_scorer.partial(session_id)),
+        "job_description_length": len(session_data.job_description),
+        "payload_bytes": session_data.nbytes(),
+        "usage": token_ledger.session_usage(session_id),
     }
@@ -0,0 +1,201 @@
+"""
+Offline micro-benchmarks for every pipeline stage.
+
+The shared LLM, Firecrawl and Chroma's embedding model are replaced by the
+local stand-ins in `fakes.py`, so no API keys or network are needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pipeline                  # print results
+    python -m benchmarks.bench_pipeline --save-baseline  # record baseline
+    python -m benchmarks.bench_pipeline --compare        # fail on regression
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(BACKEND_DIR, "benchmarks", "baseline.json")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench(name: str, fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    result = {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "repeat": repeat,
+    }
+    print(f"⏱️  {name:<45} median {result['median_ms']:>9.3f} ms   p95 {result['p95_ms']:>9.3f} ms")
+    return result
+
+
+def run_benchmarks(workdir: str, repeat: int, llm_latency: float,
+                   firecrawl_latency: float) -> Dict[str, Dict[str, float]]:
+    # db.py opens a relative Chroma path at import; keep it out of the repo
+    os.chdir(workdir)
+    sys.path.insert(0, BACKEND_DIR)
+
+    from fakes import install_fakes
+    install_fakes(latency=llm_latency, firecrawl_latency=firecrawl_latency,
+                  chroma_path=os.path.join(workdir, "chroma"))
+
+    from agents.behavioral_retriever import BehaviourRetriver
+    from agents.gap_fixer import gap_fixer_agent
+    from agents.mock_evaluator import mock_interview_analyser
+    from agents.outcome_predictor import predict_outcome
+    from agents.resume_analyzer import extract_resume, resume_analyse
+    from benchmarks.fixtures import JOB_DESCRIPTION, make_resume_dir
+    from database import db
+    from database.checkpoints import graph_config
+    from database.jd_cache import jd_artifact_cache
+    from orchestrator import behavioral_graph, mock_evaluation_graph
+
+    results: Dict[str, Dict[str, float]] = {}
+
+    resume_dirs = {}
+    for kind in ("pdf", "docx"):
+        for pages in (1, 5, 20):
+            directory = make_resume_dir(workdir, kind, pages)
+            resume_dirs[(kind, pages)] = directory
+            results[f"extract_resume[{kind},{pages}p]"] = bench(
+                f"extract_resume[{kind},{pages}p]", lambda d=directory: extract_resume(d), repeat)
+
+    # Streaming extractor vs the previous docx2txt path, with and without media
+    import docx2txt
+    from agents.docx_extractor import extract_docx_text
+    from benchmarks.fixtures import make_docx, resume_lines
+    for pages, media_mb in ((5, 0), (20, 0), (5, 8)):
+        path = make_docx(os.path.join(workdir, f"bench_{pages}p_{media_mb}mb.docx"),
+                         resume_lines(pages), media_bytes=media_mb * 1024 * 1024)
+        for name, extract in (("docx2txt", docx2txt.process), ("streaming", extract_docx_text)):
+            label = f"extract_docx[{name},{pages}p,{media_mb}MiB media]"
+            results[label] = bench(label, lambda p=path, f=extract: f(p), repeat)
+
+    resume_text = extract_resume(resume_dirs[("pdf", 1)])
+    answers = [
+        {"question": "Tell me about a time you resolved a conflict in your team.",
+         "answer": "I set up a meeting, listened to both engineers and agreed on a plan."},
+        {"question": "Describe a project where you took ownership end to end.",
+         "answer": "I led our billing migration and cut p95 latency by 40%."},
+    ]
+    retriever = BehaviourRetriver()
+    resume_analysis = resume_analyse(resume_text, JOB_DESCRIPTION)
+    mock_response = mock_interview_analyser(resume_text, answers)
+    prediction = predict_outcome(resume_analysis, mock_response)
+
+    results["resume_analyse"] = bench(
+        "resume_analyse", lambda: resume_analyse(resume_text, JOB_DESCRIPTION), repeat)
+    results["search_query_generator"] = bench(
+        "search_query_generator", lambda: retriever.search_query_generator(JOB_DESCRIPTION), repeat)
+
+    def cold_q_and_a():
+        jd_artifact_cache.clear()
+        return retriever.get_q_and_a(JOB_DESCRIPTION)
+
+    results["get_q_and_a[jd_cache_cold]"] = bench(
+        "get_q_and_a[jd_cache_cold]", cold_q_and_a, repeat)
+    results["get_q_and_a[jd_cache_warm]"] = bench(
+        "get_q_and_a[jd_cache_warm]", lambda: retriever.get_q_and_a(JOB_DESCRIPTION), repeat)
+    results["mock_interview_analyser"] = bench(
+        "mock_interview_analyser", lambda: mock_interview_analyser(resume_text, answers), repeat)
+    results["predict_outcome"] = bench(
+        "predict_outcome", lambda: predict_outcome(resume_analysis, mock_response), repeat)
+    results["gap_fixer_agent"] = bench(
+        "gap_fixer_agent", lambda: gap_fixer_agent(resume_analysis, mock_response, prediction), repeat)
+
+    qna = [{"question": f"Benchmark question {i}?", "answer": "Sample answer.",
+            "source": "benchmark", "category": "benchmark"} for i in range(4)]
+    results["save_qna_for_category"] = bench(
+        "save_qna_for_category", lambda: (db.save_qna_for_category(qna, min_count=2), db.qna_writer.flush()), repeat)
+    results["get_qna_by_category"] = bench(
+        "get_qna_by_category", lambda: db.get_qna_by_category("benchmark"), repeat)
+
+    def run_behavioral_graph():
+        jd_artifact_cache.clear()
+        return behavioral_graph.invoke({
+            "file_path": resume_dirs[("pdf", 1)], "job_description": JOB_DESCRIPTION},
+            graph_config(str(uuid.uuid4()), "behavioral"))
+
+    results["behavioral_graph"] = bench("behavioral_graph", run_behavioral_graph, repeat)
+    results["mock_evaluation_graph"] = bench("mock_evaluation_graph", lambda: mock_evaluation_graph.invoke({
+        "resume_text": resume_text, "answers": answers, "job_description": JOB_DESCRIPTION,
+        "resume_analysis": resume_analysis, "behavioral_questions": {},
+    }, graph_config(str(uuid.uuid4()), "mock_evaluation")), repeat)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["median_ms"], stats["median_ms"]
+        if before > 0 and after > before * (1 + tolerance):
+            regressions.append(
+                f"{name}: median {before:.3f} ms -> {after:.3f} ms (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Seconds the fake LLM sleeps per call")
+    parser.add_argument("--firecrawl-latency", type=float, default=0.0,
+                        help="Seconds the fake Firecrawl sleeps per call")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true",
+                        help="Exit non-zero when a median regresses past --tolerance")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        results = run_benchmarks(workdir, args.repeat, args.llm_latency, args.firecrawl_latency)
+        os.chdir(cwd)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regression {regression}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Transcription throughput per CPU core for the chunked, process-pool
+audio path used by the audio answer endpoints.
+
+Each step transcribes --answers recordings concurrently with a pool of N
+worker processes and reports audio seconds transcribed per wall-clock
+second, overall and per worker. The deterministic stand-in from `fakes.py`
+is used unless --transcriber whisper is given.
+
+Usage (from backend/):
+    python -m benchmarks.bench_transcription --workers 1 2 4
+    python -m benchmarks.bench_transcription --transcriber whisper --seconds 60
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_step(workers: int, paths: List[str], audio_seconds: float, transcriber) -> Dict[str, Any]:
+    from agents.transcriber import _transcribe_chunk, transcribe_audio
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Start every worker (and load its model) outside the measurement
+        list(pool.map(_transcribe_chunk, [transcriber] * workers, [b"\0\0" * 16000] * workers))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(paths)) as submitters:
+            transcripts = list(submitters.map(
+                lambda path: transcribe_audio(path, transcriber, pool), paths))
+        elapsed = time.perf_counter() - start
+
+    throughput = audio_seconds / elapsed
+    result = {
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "audio_s_per_s": round(throughput, 2),
+        "audio_s_per_s_per_core": round(throughput / workers, 2),
+        "words": sum(len(t.split()) for t in transcripts),
+    }
+    print(f"🎙️  workers={workers:<3} {result['audio_s_per_s']:>8.2f} audio s/s   "
+          f"{result['audio_s_per_s_per_core']:>8.2f} per core   ({result['elapsed_s']} s)")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--answers", type=int, default=4, help="Recordings per step")
+    parser.add_argument("--seconds", type=float, default=120.0, help="Length of each recording")
+    parser.add_argument("--transcriber", choices=["fake", "whisper"], default="fake")
+    parser.add_argument("--cost", type=int, default=3,
+                        help="CPU passes per chunk of the fake transcriber")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args()
+    sys.path.insert(0, BACKEND_DIR)
+
+    from agents.transcriber import WhisperTranscriber
+    from benchmarks.fixtures import make_wav
+    from fakes import FakeTranscriber
+
+    transcriber = WhisperTranscriber() if args.transcriber == "whisper" else FakeTranscriber(args.cost)
+    print(f"🖥️  {os.cpu_count()} CPUs, {args.answers} x {args.seconds:.0f}s recordings, "
+          f"{args.transcriber} transcriber")
+    with tempfile.TemporaryDirectory(prefix="bench-audio-") as workdir:
+        paths = [make_wav(os.path.join(workdir, f"answer_{i}.wav"), args.seconds)
+                 for i in range(args.answers)]
+        results = [run_step(workers, paths, args.answers * args.seconds, transcriber)
+                   for workers in args.workers]
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Synthetic resume, job description and answer audio fixtures for benchmarks
+and load tests.
+Files are generated on the fly with the standard library only, so no
+binary fixtures are checked in.
+"""
+import math
+import os
+import wave
+import zipfile
+from array import array
+from typing import List
+from xml.sax.saxutils import escape
+
+JOB_DESCRIPTION = (
+    "Senior Backend Engineer at Acme Corp. Responsibilities: design and build "
+    "Python microservices, own REST APIs, mentor engineers and collaborate with "
+    "product. Requirements: 4+ years of Python, SQL databases, Docker, AWS, "
+    "strong communication skills."
+)
+
+_EXPERIENCE_LINES = [
+    "Software Engineer, Example Systems (2020 - Present)",
+    "- Built Python microservices handling 2M requests per day",
+    "- Reduced p95 API latency by 35% through query optimisation",
+    "- Mentored three junior engineers and led code reviews",
+    "Backend Developer, Sample Labs (2018 - 2020)",
+    "- Designed PostgreSQL schemas and REST endpoints",
+    "- Containerised services with Docker and deployed to AWS",
+]
+
+
+def resume_lines(pages: int = 1) -> List[str]:
+    """Resume text of roughly `pages` pages (experience block repeated)."""
+    lines = [
+        "Jane Doe",
+        "jane.doe@example.com | +1 555 0100 | linkedin.com/in/janedoe",
+        "SUMMARY",
+        "Backend engineer with 6 years of experience building Python services.",
+        "EXPERIENCE",
+    ]
+    for _ in range(max(1, pages) * 5):
+        lines.extend(_EXPERIENCE_LINES)
+    lines += [
+        "SKILLS",
+        "Python, FastAPI, SQL, PostgreSQL, Docker, AWS, Kubernetes",
+        "EDUCATION",
+        "B.Sc. Computer Science, State University, 2018",
+    ]
+    return lines
+
+
+def make_docx(path: str, lines: List[str], media_bytes: int = 0) -> str:
+    """
+    Write a minimal valid .docx with one paragraph per line, plus an
+    embedded (incompressible) media part of `media_bytes` when non-zero.
+    """
+    body = "".join(
+        f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>" for line in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", content_types)
+        docx.writestr("_rels/.rels", rels)
+        docx.writestr("word/document.xml", document)
+        if media_bytes:
+            docx.writestr("word/media/image1.png", os.urandom(media_bytes))
+    return path
+
+
+def _pdf_text(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(path: str, lines: List[str], lines_per_page: int = 45) -> str:
+    """Write a minimal text PDF (Helvetica, one line per text row)."""
+    pages = [lines[i:i + lines_per_page]
+             for i in range(0, len(lines), lines_per_page)] or [[]]
+    # 1: catalog, 2: pages, 3: font, then (page, content) pairs
+    objects = {3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for index, page_lines in enumerate(pages):
+        page_id, content_id = 4 + index * 2, 5 + index * 2
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 10 Tf 14 TL 50 800 Td " + " ".join(
+            f"({_pdf_text(line)}) Tj T*" for line in page_lines) + " ET"
+        data = stream.encode("latin-1", "replace")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(data), data)
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_at)
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+    return path
+
+
+def make_wav(path: str, seconds: float, sample_rate: int = 16000) -> str:
+    """Mono 16-bit WAV of a tone that changes pitch every second, like speech."""
+    samples = array("h")
+    for second in range(math.ceil(seconds)):
+        frequency = 180 + 40 * (second % 5)
+        frames = min(sample_rate, int((seconds - second) * sample_rate))
+        samples.extend(int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate))
+                       for i in range(frames))
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+    return path
+
+
+def make_resume_dir(root: str, kind: str, pages: int = 1) -> str:
+    """Create a directory holding a single resume file, as the API does."""
+    directory = os.path.join(root, f"{kind}_{pages}p")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"resume.{kind}")
+    if not os.path.exists(path):
+        (make_pdf if kind == "pdf" else make_docx)(path, resume_lines(pages))
+    return directory
@@ -0,0 +1,204 @@
+"""
+End-to-end load generator for the two-call interview flow.
+
+Each virtual candidate uploads a resume to /run-interview-evaluation/ and then
+submits answers to /submit-mock-answers/ with the returned session_id.
+Concurrency is ramped step by step and a JSON report is written with
+throughput, p50/p95/p99 latency, error rate and memory growth per step.
+
+By default the app runs in-process with the local stand-ins from `fakes.py`;
+pass --url to drive an already running server instead.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --concurrency 1 4 16 --candidates 32
+    python -m benchmarks.load_test --url http://localhost:8000 --output report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STEPS = ("run_interview_evaluation", "submit_mock_answers", "flow")
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        # ru_maxrss is the peak, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+async def run_candidate(client: httpx.AsyncClient, resume_path: str, job_description: str,
+                        answers: List[Dict[str, str]], samples: Dict[str, List[float]],
+                        errors: Dict[str, int]) -> None:
+    flow_start = time.perf_counter()
+    start = flow_start
+    try:
+        with open(resume_path, "rb") as f:
+            response = await client.post(
+                "/run-interview-evaluation/",
+                files={"resume": (os.path.basename(resume_path), f.read())},
+                data={"job_description": job_description},
+            )
+        payload = response.json()
+        if response.status_code != 200 or not payload.get("success"):
+            raise RuntimeError(payload.get("message", response.status_code))
+        samples["run_interview_evaluation"].append((time.perf_counter() - start) * 1000)
+    except Exception:
+        errors["run_interview_evaluation"] += 1
+        errors["flow"] += 1
+        return
+
+    start = time.perf_counter()
+    try:
+        response = await client.post(
+            "/submit-mock-answers/",
+            data={"session_id": payload["session_id"], "answers": json.dumps(answers)},
+        )
+        if response.status_code != 200 or not response.json().get("success"):
+            raise RuntimeError(response.status_code)
+        samples["submit_mock_answers"].append((time.perf_counter() - start) * 1000)
+        samples["flow"].append((time.perf_counter() - flow_start) * 1000)
+    except Exception:
+        errors["submit_mock_answers"] += 1
+        errors["flow"] += 1
+
+
+async def run_step(client: httpx.AsyncClient, concurrency: int, candidates: int,
+                   resume_path: str, job_description: str,
+                   answers: List[Dict[str, str]]) -> Dict[str, Any]:
+    samples: Dict[str, List[float]] = {step: [] for step in STEPS}
+    errors: Dict[str, int] = {step: 0 for step in STEPS}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited() -> None:
+        async with semaphore:
+            await run_candidate(client, resume_path, job_description, answers, samples, errors)
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(candidates)))
+    elapsed = time.perf_counter() - start
+
+    report: Dict[str, Any] = {
+        "concurrency": concurrency,
+        "candidates": candidates,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_flows_per_s": round(len(samples["flow"]) / elapsed, 3) if elapsed else None,
+        "rss_before_mb": round(rss_before, 2),
+        "rss_after_mb": round(rss_mb(), 2),
+    }
+    report["rss_growth_mb"] = round(report["rss_after_mb"] - rss_before, 2)
+    for step in STEPS:
+        values = samples[step]
+        report[step] = {
+            "ok": len(values),
+            "errors": errors[step],
+            "error_rate": round(errors[step] / candidates, 4),
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "mean_ms": round(statistics.fmean(values), 3) if values else None,
+        }
+    print(f"🚀 concurrency={concurrency:<3} flows/s={report['throughput_flows_per_s']} "
+          f"p50={report['flow']['p50_ms']} ms p95={report['flow']['p95_ms']} ms "
+          f"p99={report['flow']['p99_ms']} ms errors={errors['flow']} "
+          f"rss +{report['rss_growth_mb']} MiB")
+    return report
+
+
+async def run_load_test(args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    from benchmarks.fixtures import JOB_DESCRIPTION, make_resume_dir
+
+    resume_dir = make_resume_dir(workdir, args.resume_kind, args.resume_pages)
+    resume_path = os.path.join(resume_dir, f"resume.{args.resume_kind}")
+    answers = [
+        {"question": "Tell me about a time you resolved a conflict in your team.",
+         "answer": "I set up a meeting, listened to both engineers and agreed on a plan."},
+        {"question": "Describe a project where you took ownership end to end.",
+         "answer": "I led our billing migration and cut p95 latency by 40%."},
+    ]
+
+    session_store = None
+    if args.url:
+        transport, base_url = None, args.url
+    else:
+        from fakes import install_fakes
+        install_fakes(latency=args.llm_latency, firecrawl_latency=args.firecrawl_latency,
+                      chroma_path=os.path.join(workdir, "chroma"))
+        import api
+        session_store = api.session_store
+        transport, base_url = httpx.ASGITransport(app=api.app), "http://loadtest"
+
+    steps = []
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=timeout) as client:
+        for concurrency in args.concurrency:
+            candidates = args.candidates or concurrency * 4
+            steps.append(await run_step(client, concurrency, candidates,
+                                        resume_path, JOB_DESCRIPTION, answers))
+
+    return {
+        "target": args.url or "in-process",
+        "llm_latency_s": None if args.url else args.llm_latency,
+        "firecrawl_latency_s": None if args.url else args.firecrawl_latency,
+        "resume": f"{args.resume_kind},{args.resume_pages}p",
+        "leftover_sessions": len(session_store) if session_store is not None else None,
+        "steps": steps,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Concurrency levels to ramp through")
+    parser.add_argument("--candidates", type=int, default=0,
+                        help="Flows per step (default: 4 x concurrency)")
+    parser.add_argument("--llm-latency", type=float, default=0.2,
+                        help="Seconds the fake LLM sleeps per call (in-process only)")
+    parser.add_argument("--firecrawl-latency", type=float, default=0.1,
+                        help="Seconds the fake Firecrawl sleeps per call (in-process only)")
+    parser.add_argument("--resume-kind", choices=["pdf", "docx"], default="pdf")
+    parser.add_argument("--resume-pages", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", default="load_report.json")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="load-") as workdir:
+        # db.py opens a relative Chroma path at import; keep it out of the repo
+        os.chdir(workdir)
+        sys.path.insert(0, BACKEND_DIR)
+        report = asyncio.run(run_load_test(args, workdir))
+        os.chdir(cwd)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Report written to {args.output}")
+    return 0 if all(step["flow"]["errors"] == 0 for step in report["steps"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
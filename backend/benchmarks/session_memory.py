@@ -0,0 +1,102 @@
+"""
+Memory per pending interview session: the compact `SessionStore` against
+the plain dict-per-session layout it replaced.
+
+Each synthetic session gets its own copy of the resume, analysis and
+question set, as it would from a real request, and sessions share
+--distinct-jds job descriptions between them.
+
+Usage (from backend/):
+    python -m benchmarks.session_memory --sessions 1000 --distinct-jds 10
+"""
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def session_payload(index: int, resume_pages: int, distinct_jds: int) -> Dict[str, Any]:
+    from agents.resume_structurer import structure_resume
+    from benchmarks.fixtures import JOB_DESCRIPTION, resume_lines
+
+    resume_text = "\n".join(resume_lines(resume_pages))
+    questions = [{
+        "question": f"Tell me about a time you had to handle situation {q} under pressure.",
+        "answer": "I broke the problem down, aligned the team on priorities and "
+                  "followed up with a short retrospective to capture what we learned.",
+        "source": "https://example.com/behavioral-questions",
+        "category": "communication",
+    } for q in range(10)]
+    payload = {
+        "file_path": f"/tmp/session-{index}",
+        "job_description": f"{JOB_DESCRIPTION} Team {index % distinct_jds}.",
+        "resume_text": resume_text,
+        "resume_profile": structure_resume(resume_text),
+        "resume_analysis": {"success": True, "data": {
+            "clarity": 80, "relevance": 75, "structure": 70, "experience": 6,
+            "feedback": ["Quantify the impact of each role.",
+                         "Move the skills section above experience.",
+                         "Add links to the projects you mention."]}},
+        "behavioral_questions": {"success": True, "data": questions},
+    }
+    # A fresh copy per session, as parsed from each request and LLM response
+    return json.loads(json.dumps(payload))
+
+
+def measure(build: Callable[[List[Dict[str, Any]]], Any],
+            make_payloads: Callable[[], List[Dict[str, Any]]]) -> int:
+    """Bytes still allocated once the store is built and the request payloads are gone."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    payloads = make_payloads()
+    store = build(payloads)
+    del payloads
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del store
+    return used
+
+
+def dict_store(payloads: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    store = {}
+    for index, payload in enumerate(payloads):
+        store[str(index)] = {**payload, "pending_graph": None, "retries": 0}
+    return store
+
+
+def compact_store(payloads: List[Dict[str, Any]]):
+    from sessions import SessionStore
+
+    store = SessionStore()
+    for index, payload in enumerate(payloads):
+        store.create(str(index), **payload)
+    return store
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--distinct-jds", type=int, default=10)
+    parser.add_argument("--resume-pages", type=int, default=1)
+    args = parser.parse_args()
+    sys.path.insert(0, BACKEND_DIR)
+
+    def make_payloads() -> List[Dict[str, Any]]:
+        return [session_payload(i, args.resume_pages, max(1, args.distinct_jds))
+                for i in range(args.sessions)]
+
+    make_payloads()  # Warm up imports outside the measurement
+    results = {}
+    for name, build in (("dict", dict_store), ("compact", compact_store)):
+        results[name] = measure(build, make_payloads) / args.sessions
+        print(f"🧠 {name:<8} {results[name]:>10.0f} bytes/session")
+    print(f"📉 compact sessions use {results['dict'] / results['compact']:.1f}x less memory")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
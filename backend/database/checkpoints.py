@@ -0,0 +1,32 @@
+import os
+import sqlite3
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "graph_checkpoints.sqlite")
+
+# SqliteSaver serialises access with its own lock, so one connection is
+# shared by the threadpool workers running graph invocations.
+checkpointer = SqliteSaver(sqlite3.connect(
+    CHECKPOINT_DB_PATH, check_same_thread=False))
+
+
+def graph_config(session_id: str, graph_name: str) -> dict:
+    """
+    LangGraph config keying a graph's checkpoints by session ID.
+
+    Args:
+        session_id: The interview session ID returned by the first API call
+        graph_name: Distinguishes the two graphs run for the same session
+
+    Returns:
+        Config dict to pass to `graph.invoke` / `graph.get_state`
+    """
+    return {"configurable": {"thread_id": f"{session_id}:{graph_name}"}}
+
+
+def clear_checkpoints(session_id: str, graph_name: str) -> None:
+    try:
+        checkpointer.delete_thread(f"{session_id}:{graph_name}")
+    except Exception as e:
+        print(f"⚠️ Failed to delete checkpoints for session '{session_id}': {e}")
@@ -0,0 +1,127 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are only serialised within the process
+    fcntl = None
+
+CHROMA_WRITE_WINDOW_MS = int(os.getenv("CHROMA_WRITE_WINDOW_MS", "100"))
+CHROMA_WRITE_MAX_ITEMS = int(os.getenv("CHROMA_WRITE_MAX_ITEMS", "64"))
+
+_process_lock = threading.RLock()
+_held = threading.local()
+
+
+@contextmanager
+def chroma_write_lock(db_path: str) -> Iterator[None]:
+    """
+    Exclusive write access to the Chroma directory across threads and
+    worker processes (flock on a lock file next to the SQLite database).
+    Re-entrant within a thread.
+    """
+    with _process_lock:
+        if fcntl is None or getattr(_held, "flock", False):
+            yield
+            return
+        os.makedirs(db_path, exist_ok=True)
+        with open(os.path.join(db_path, ".writer.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            _held.flock = True
+            try:
+                yield
+            finally:
+                _held.flock = False
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def write_generation(db_path: str) -> int:
+    """
+    Changes whenever any process commits a write, so each worker can tell
+    when its read cache is stale with a single stat call.
+    """
+    try:
+        return os.stat(os.path.join(db_path, ".generation")).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def bump_generation(db_path: str) -> int:
+    """Mark a committed write; call while holding `chroma_write_lock`."""
+    path = os.path.join(db_path, ".generation")
+    with open(path, "a"):
+        pass
+    os.utime(path, ns=(time.time_ns(), time.time_ns()))
+    return write_generation(db_path)
+
+
+class ChromaWriter:
+    """
+    Single writer for a Chroma directory. Writes submitted from any thread
+    are queued, collected for a short window and applied in one batch by a
+    background thread while holding the cross-process write lock, so
+    several workers never write to the SQLite files at the same time.
+    `on_commit` receives the write generation of each committed batch.
+    """
+
+    def __init__(self, db_path: str, apply: Callable[[List[Any]], None],
+                 window_ms: int = CHROMA_WRITE_WINDOW_MS,
+                 max_items: int = CHROMA_WRITE_MAX_ITEMS,
+                 on_commit: Optional[Callable[[int], None]] = None) -> None:
+        self.db_path = db_path
+        self.apply = apply
+        self.on_commit = on_commit
+        self.window = window_ms / 1000
+        self.max_items = max(1, max_items)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._in_flight = 0
+
+    def submit(self, item: Any) -> None:
+        with self._idle:
+            self._in_flight += 1
+        self._ensure_worker()
+        self._queue.put(item)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted write is committed; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="chroma-writer", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                with chroma_write_lock(self.db_path):
+                    self.apply(batch)
+                    generation = bump_generation(self.db_path)
+                    if self.on_commit is not None:
+                        self.on_commit(generation)
+            except Exception as e:
+                print(f"❌ Chroma write batch of {len(batch)} failed: {e}")
+            finally:
+                with self._idle:
+                    self._in_flight -= len(batch)
+                    self._idle.notify_all()
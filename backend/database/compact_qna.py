@@ -0,0 +1,90 @@
+"""
+Offline compaction of the behavioral Q&A collection.
+
+Near-duplicate questions are clustered per category (MinHash LSH over
+question shingles). Each cluster keeps the entry with the longest sample
+answer, merges the sources of the rest into it and deletes them.
+
+Usage (from backend/):
+    python -m database.compact_qna --dry-run          # report only
+    python -m database.compact_qna --threshold 0.7    # compact in place
+"""
+import argparse
+import sys
+from typing import Any, Dict, List
+
+from database.near_duplicates import QNA_DEDUP_THRESHOLD, cluster_near_duplicates
+
+DELETE_BATCH_SIZE = 500
+
+
+def compact_collection(collection, threshold: float = QNA_DEDUP_THRESHOLD,
+                       dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Returns:
+        Report dict: size_before, size_after, clusters, removed
+    """
+    size_before = collection.count()
+    data = collection.get(include=["documents", "metadatas"])
+    metadatas = dict(zip(data["ids"], data["metadatas"]))
+    by_category: Dict[str, Dict[str, str]] = {}
+    for item_id, document, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+        by_category.setdefault((metadata or {}).get("category"), {})[item_id] = document
+
+    keep_ids: List[str] = []
+    keep_metadatas: List[Dict[str, Any]] = []
+    remove_ids: List[str] = []
+    clusters = 0
+    for category, questions in by_category.items():
+        for cluster in cluster_near_duplicates(questions, threshold):
+            clusters += 1
+            keep = max(cluster, key=lambda item_id: len(
+                (metadatas[item_id] or {}).get("sample_answer") or ""))
+            sources = dict.fromkeys(
+                source.strip()
+                for item_id in cluster
+                for source in str((metadatas[item_id] or {}).get("source") or "").split(",")
+                if source.strip())
+            keep_ids.append(keep)
+            keep_metadatas.append({**metadatas[keep], "source": ", ".join(sources)})
+            removed = [item_id for item_id in cluster if item_id != keep]
+            remove_ids.extend(removed)
+            print(f"🧹 [{category}] keeping '{questions[keep][:60]}', "
+                  f"merging {len(removed)} near-duplicate(s)")
+
+    if not dry_run and remove_ids:
+        collection.update(ids=keep_ids, metadatas=keep_metadatas)
+        for start in range(0, len(remove_ids), DELETE_BATCH_SIZE):
+            collection.delete(ids=remove_ids[start:start + DELETE_BATCH_SIZE])
+
+    return {
+        "size_before": size_before,
+        "size_after": size_before - len(remove_ids) if dry_run else collection.count(),
+        "clusters": clusters,
+        "removed": len(remove_ids),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threshold", type=float, default=QNA_DEDUP_THRESHOLD,
+                        help="Estimated Jaccard similarity treated as a duplicate")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report clusters without modifying the collection")
+    args = parser.parse_args()
+
+    from database import db
+    from database.chroma_writer import bump_generation, chroma_write_lock
+    # Running API workers keep serving reads; their writes wait for the lock
+    with chroma_write_lock(db.CHROMA_DB_PATH):
+        report = compact_collection(db.qna_collection(), args.threshold, args.dry_run)
+        if report["removed"] and not args.dry_run:
+            bump_generation(db.CHROMA_DB_PATH)  # Workers reopen their clients
+    label = "would be" if args.dry_run else "were"
+    print(f"📊 behavioral_qna: {report['size_before']} -> {report['size_after']} items "
+          f"({report['removed']} {label} removed from {report['clusters']} clusters)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
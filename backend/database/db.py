@@ -1,23 +1,109 @@
+import os
+import threading
+import time
 import uuid
 import json
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from chromadb import PersistentClient
 from chromadb.config import Settings
+from metrics import CHROMA_LATENCY, record_cache
+from tracing import span
+from database.near_duplicates import NearDuplicateIndex
+from database.chroma_writer import ChromaWriter, chroma_write_lock, write_generation
 
-# Setup ChromaDB client and collection
-client = PersistentClient(
-    path="my_chroma_db",
-    settings=Settings(allow_reset=True)
-)
+CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "my_chroma_db")
+# Category reads are cached per worker until this expires or any process writes
+QNA_READ_CACHE_TTL = float(os.getenv("QNA_READ_CACHE_TTL", "300"))
 
-# Collection for behavioral interview Q&A
-behavioral_qna_collection = client.get_or_create_collection("behavioral_qna")
+# Every worker process opens its own client; writes go through `qna_writer`
+# (one at a time across processes). A client does not notice segments another
+# process has written, so it is reopened whenever the write generation moves.
+client = None
+behavioral_qna_collection = None
+_db_path = CHROMA_DB_PATH
+_embedding_function = None  # Chroma's default model unless replaced
+_generation = 0
+_collection_lock = threading.RLock()
+
+
+def _open_client() -> None:
+    """(Re)open the client; call while holding `chroma_write_lock` and `_collection_lock`."""
+    global client, behavioral_qna_collection, _generation
+    if client is not None:
+        client.close()
+    _generation = write_generation(_db_path)
+    client = PersistentClient(
+        path=_db_path,
+        settings=Settings(allow_reset=True)
+    )
+
+    # Collection for behavioral interview Q&A
+    if _embedding_function is None:
+        behavioral_qna_collection = client.get_or_create_collection("behavioral_qna")
+    else:
+        behavioral_qna_collection = client.get_or_create_collection(
+            "behavioral_qna", embedding_function=_embedding_function)
+
+
+def _refresh_client() -> None:
+    """Reopen the client if another process has written since it was opened."""
+    if write_generation(_db_path) == _generation:
+        return
+    # Lock order everywhere: the write lock, then `_collection_lock`
+    with chroma_write_lock(_db_path), _collection_lock:
+        if write_generation(_db_path) != _generation:
+            _open_client()
+            _read_cache.clear()
+
+
+def qna_collection() -> Any:
+    """The Q&A collection, reopened first if another process has written since."""
+    _refresh_client()
+    return behavioral_qna_collection
+
+
+def _query(**kwargs: Any) -> Any:
+    _refresh_client()
+    try:
+        with _collection_lock:
+            return behavioral_qna_collection.query(**kwargs)
+    except Exception:
+        # Another process may have committed between the check and the query
+        if write_generation(_db_path) == _generation:
+            raise
+        _refresh_client()
+        with _collection_lock:
+            return behavioral_qna_collection.query(**kwargs)
+
+
+def _committed(generation: int) -> None:
+    # This process's client already holds its own writes, so it need not reopen
+    global _generation
+    _generation = generation
+
+
+def use_chroma(path: str, embedding_function: Any = None) -> None:
+    """Point the Q&A store at another directory and embedding function (e.g. local stand-ins)."""
+    global _db_path, _embedding_function
+    qna_writer.flush()
+    with chroma_write_lock(path), _collection_lock:
+        _db_path = qna_writer.db_path = path
+        _embedding_function = embedding_function
+        _open_client()
+        _read_cache.clear()
+
+
+# category -> (write generation, expiry, questions)
+_read_cache: Dict[str, Tuple[int, float, List[dict]]] = {}
 
 
 def save_qna_for_category(questions: List[dict], min_count: int = 2) -> None:
     """
     Save behavioral interview Q&A to ChromaDB if category doesn't have enough items.
 
+    The write is queued and committed by the single Chroma writer, so it may
+    land shortly after this returns; call `qna_writer.flush()` to wait.
+
     Args:
         questions: List of dicts with keys: question, answer, source, category
         min_count: Minimum number of items that should exist in category before skipping
@@ -28,94 +114,111 @@ def save_qna_for_category(questions: List[dict], min_count: int = 2) -> None:
     if not questions:
         print("📝 No questions to save")
         return
+    qna_writer.submit((questions, min_count))
 
-    # Group questions by category to check counts efficiently
-    questions_by_category = {}
-    for item in questions:
-        category = item.get("category")
-        if category:
-            if category not in questions_by_category:
-                questions_by_category[category] = []
-            questions_by_category[category].append(item)
 
+def _write_qna_batch(batch: List[Tuple[List[dict], int]]) -> None:
+    """Apply queued saves; runs on the writer thread under the write lock."""
+    # Group each queued save's questions by category to check counts efficiently
+    questions_by_category: Dict[str, List[Tuple[List[dict], int]]] = {}
+    for questions, min_count in batch:
+        save_by_category: Dict[str, List[dict]] = {}
+        for item in questions:
+            category = item.get("category")
+            if category:
+                save_by_category.setdefault(category, []).append(item)
+        for category, items in save_by_category.items():
+            questions_by_category.setdefault(category, []).append((items, min_count))
+
+    collection = qna_collection()
+    with _collection_lock:
+        _write_categories(collection, questions_by_category)
+
+
+def _write_categories(collection: Any, questions_by_category: Dict[str, List[Tuple[List[dict], int]]]) -> None:
     for category, category_questions in questions_by_category.items():
         try:
             # Check existing count for this category
-            existing_result = behavioral_qna_collection.query(
-                query_texts=[category],
-                n_results=1000,  # Get all items to count accurately
-                where={"category": category}
-            )
+            with CHROMA_LATENCY.time(operation="query"), span("chroma.query", category=category):
+                existing_result = collection.query(
+                    query_texts=[category],
+                    n_results=1000,  # Get all items to count accurately
+                    where={"category": category}
+                )
 
             existing_count = 0
+            # Index existing questions for near-duplicate checking
+            existing_questions = NearDuplicateIndex()
             if existing_result and existing_result.get("documents"):
                 documents = existing_result.get("documents", [[]])
                 if documents and len(documents) > 0:
                     existing_count = len(documents[0])
+                    for position, existing in enumerate(documents[0]):
+                        existing_questions.add(position, existing)
 
-            print(
-                f"📊 Category '{category}' has {existing_count} existing items (min required: {min_count})")
-
-            # Skip if already have enough items
-            if existing_count >= min_count:
-                print(
-                    f"✅ Category '{category}' already has sufficient items ({existing_count} >= {min_count}). Skipping.")
-                continue
-
-            # Get existing questions for duplicate checking
-            existing_questions = []
-            if existing_result and existing_result.get("documents"):
-                documents = existing_result.get("documents", [[]])
-                if documents and len(documents) > 0:
-                    existing_questions = [q.lower().strip()
-                                          for q in documents[0]]
-
-            # Process each question in this category
-            added_count = 0
-            for item in category_questions:
-                question = item.get("question")
-                answer = item.get("answer")
-                source = item.get("source")
-
-                # Skip items with missing required fields
-                if not all([question, answer, source, category]):
-                    print(f"⚠️ Skipping item with missing fields: {item}")
-                    continue
-
-                # Check for exact duplicates within category
-                question_normalized = question.lower().strip()
-                if question_normalized in existing_questions:
+            # Each queued save is skipped as a whole once the category has enough
+            # items, counting those already added by earlier saves in this batch
+            ids, documents_to_add, metadatas_to_add = [], [], []
+            for items, min_count in category_questions:
+                if existing_count + len(ids) >= min_count:
                     print(
-                        f"🔄 Question already exists in category '{category}'. Skipping: {question[:50]}...")
+                        f"✅ Category '{category}' already has sufficient items ({existing_count + len(ids)} >= {min_count}). Skipping.")
                     continue
+                for item in items:
+                    question = item.get("question")
+                    answer = item.get("answer")
+                    source = item.get("source")
 
-                # Add to collection
-                try:
-                    behavioral_qna_collection.add(
-                        documents=[question],
-                        metadatas=[{
-                            "sample_answer": answer,
-                            "source": source,
-                            "category": category
-                        }],
-                        ids=[str(uuid.uuid4())],
-                    )
-                    existing_questions.append(
-                        question_normalized)  # Update local cache
-                    added_count += 1
-                    print(
-                        f"✅ Added question to category '{category}': {question[:50]}...")
+                    # Skip items with missing required fields
+                    if not all([question, answer, source, category]):
+                        print(f"⚠️ Skipping item with missing fields: {item}")
+                        continue
 
-                except Exception as e:
-                    print(f"❌ Error adding question: {e}")
+                    # Check for near-duplicates (paraphrases) within category
+                    duplicate, similarity = existing_questions.find(question)
+                    if duplicate is not None:
+                        print(
+                            f"🔄 Near-duplicate ({similarity:.2f}) already exists in category '{category}'. Skipping: {question[:50]}...")
+                        continue
 
+                    question_id = str(uuid.uuid4())
+                    ids.append(question_id)
+                    documents_to_add.append(question)
+                    metadatas_to_add.append({
+                        "sample_answer": answer,
+                        "source": source,
+                        "category": category
+                    })
+                    existing_questions.add(
+                        question_id, question)  # Update local index
+
+            print(
+                f"📊 Category '{category}' had {existing_count} existing items, adding {len(ids)}")
+            if not ids:
+                continue
+
+            # One commit per category for the whole batch
+            with CHROMA_LATENCY.time(operation="add"), span("chroma.add", category=category):
+                collection.add(
+                    documents=documents_to_add,
+                    metadatas=metadatas_to_add,
+                    ids=ids,
+                )
+            _read_cache.pop(category, None)
             print(
-                f"📝 Added {added_count} new questions to category '{category}'")
+                f"📝 Added {len(ids)} new questions to category '{category}'")
 
         except Exception as e:
             print(f"❌ Error processing category '{category}': {e}")
 
 
+qna_writer = ChromaWriter(CHROMA_DB_PATH, _write_qna_batch, on_commit=_committed)
+
+# Opening the client migrates the SQLite schema, so workers starting together take turns
+with chroma_write_lock(CHROMA_DB_PATH), _collection_lock:
+    _open_client()
+
+
 def get_qna_by_category(category: str) -> List[dict]:
     """
     Retrieve all behavioral interview Q&A for a specific category.
@@ -126,13 +229,21 @@ def get_qna_by_category(category: str) -> List[dict]:
     Returns:
         List of dicts with keys: question, answer, source, category
     """
+    generation = write_generation(_db_path)
+    cached = _read_cache.get(category)
+    hit = cached is not None and cached[0] == generation and cached[1] > time.monotonic()
+    record_cache("qna_reads", hit)
+    if hit:
+        return list(cached[2])
+
     try:
         # Query for all items in the specified category
-        result = behavioral_qna_collection.query(
-            query_texts=[category],
-            n_results=4,  # Get all items
-            where={"category": category}
-        )
+        with CHROMA_LATENCY.time(operation="query"), span("chroma.query", category=category):
+            result = _query(
+                query_texts=[category],
+                n_results=4,  # Get all items
+                where={"category": category}
+            )
 
         # Handle case where result is None
         if result is None:
@@ -171,7 +282,9 @@ def get_qna_by_category(category: str) -> List[dict]:
 
         print(
             f"🎯 Found {len(matching_questions)} questions in category '{category}'")
-        return matching_questions
+        _read_cache[category] = (
+            generation, time.monotonic() + QNA_READ_CACHE_TTL, matching_questions)
+        return list(matching_questions)
 
     except Exception as e:
         print(f"❌ Error fetching questions for category '{category}': {e}")
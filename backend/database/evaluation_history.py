@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialised within the process
+    fcntl = None
+
+EVALUATION_HISTORY_DIR = os.getenv("EVALUATION_HISTORY_DIR", "evaluation_history")
+# Percentile ranks are only reported once a category has this many evaluations
+EVALUATION_HISTORY_MIN_COHORT = int(os.getenv("EVALUATION_HISTORY_MIN_COHORT", "5"))
+
+# One append-only file per column. The category column is written last, so
+# a row counts as complete once every column file is long enough to hold it.
+COLUMNS = (
+    ("recorded_at", "d"),
+    ("resume_clarity", "f"),
+    ("resume_relevance", "f"),
+    ("resume_structure", "f"),
+    ("resume_experience", "f"),
+    ("mock_tone", "f"),
+    ("mock_confidence", "f"),
+    ("mock_relevance", "f"),
+    ("mock_total", "f"),
+    ("outcome_score", "f"),
+    ("category", "H"),
+)
+_ITEM_SIZES = {name: array(typecode).itemsize for name, typecode in COLUMNS}
+
+
+def _score(scores: Dict[str, Any], key: str) -> float:
+    value = scores.get(key)
+    return float(value) if value is not None else float("nan")
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class EvaluationHistory:
+    """
+    Append-only columnar history of completed evaluations, one file per
+    column plus a category dictionary. Outcome scores are also kept in a
+    sorted list per category, so a percentile rank is two bisections and
+    cohort statistics are read off the list without scanning the history.
+
+    Rows appended by other worker processes are picked up on the next
+    access by reading the column tails past the rows already loaded.
+    """
+
+    def __init__(self, path: Optional[str] = EVALUATION_HISTORY_DIR) -> None:
+        self.path = path
+        self._categories: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._scores: Dict[str, List[float]] = {}
+        self._sums: Dict[str, float] = {}
+        self._rows = 0
+        self._lock = threading.Lock()
+        if path and os.path.isdir(path):
+            with self._lock:
+                self._refresh()
+            print(f"📈 Loaded {self._rows} evaluations from {path}")
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.col")
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        os.makedirs(self.path, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.path, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_categories(self) -> None:
+        try:
+            with open(os.path.join(self.path, "categories.txt"), encoding="utf-8") as f:
+                names = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        for name in names[len(self._categories):]:
+            self._codes[name] = len(self._categories)
+            self._categories.append(name)
+
+    def _available_rows(self) -> int:
+        try:
+            return min(os.path.getsize(self._column_path(name)) // _ITEM_SIZES[name]
+                       for name, _ in COLUMNS)
+        except FileNotFoundError:
+            return 0
+
+    def _refresh(self) -> None:
+        """Load rows appended to the column files since the last refresh."""
+        if not self.path:
+            return
+        try:
+            # Written last, so one stat tells whether any row was appended
+            if os.path.getsize(self._column_path("category")) // _ITEM_SIZES["category"] <= self._rows:
+                return
+        except FileNotFoundError:
+            return
+        available = self._available_rows()
+        if available <= self._rows:
+            return
+        self._load_categories()
+        columns = {}
+        for name in ("outcome_score", "category"):
+            values = array(dict(COLUMNS)[name])
+            with open(self._column_path(name), "rb") as f:
+                f.seek(self._rows * _ITEM_SIZES[name])
+                values.frombytes(f.read((available - self._rows) * _ITEM_SIZES[name]))
+            columns[name] = values
+        touched = set()
+        for score, code in zip(columns["outcome_score"], columns["category"]):
+            category = self._categories[code]
+            self._scores.setdefault(category, []).append(score)
+            self._sums[category] = self._sums.get(category, 0.0) + score
+            touched.add(category)
+        for category in touched:
+            self._scores[category].sort()
+        self._rows = available
+
+    def _code(self, category: str) -> int:
+        if category not in self._codes:
+            self._codes[category] = len(self._categories)
+            self._categories.append(category)
+            if self.path:
+                with open(os.path.join(self.path, "categories.txt"), "a", encoding="utf-8") as f:
+                    f.write(category + "\n")
+        return self._codes[category]
+
+    def record(self, category: str, resume_scores: Dict[str, Any],
+               mock_scores: Dict[str, Any], outcome_score: float) -> None:
+        """Append one completed evaluation to the history."""
+        row = {
+            "recorded_at": time.time(),
+            "resume_clarity": _score(resume_scores, "clarity"),
+            "resume_relevance": _score(resume_scores, "relevance"),
+            "resume_structure": _score(resume_scores, "structure"),
+            "resume_experience": _score(resume_scores, "experience"),
+            "mock_tone": _score(mock_scores, "tone"),
+            "mock_confidence": _score(mock_scores, "confidence"),
+            "mock_relevance": _score(mock_scores, "relevance"),
+            "mock_total": _score(mock_scores, "total_marks"),
+            "outcome_score": float(outcome_score),
+        }
+        with self._lock:
+            if not self.path:
+                row["category"] = self._code(category)
+            else:
+                with self._file_lock():
+                    # Other workers may have added rows and categories
+                    self._load_categories()
+                    self._refresh()
+                    row["category"] = self._code(category)
+                    for name, typecode in COLUMNS:
+                        with open(self._column_path(name), "ab") as f:
+                            f.write(array(typecode, [row[name]]).tobytes())
+            self._rows += 1
+            # Stored as float32, so rank against the value as persisted
+            score = array("f", [row["outcome_score"]])[0]
+            insort(self._scores.setdefault(category, []), score)
+            self._sums[category] = self._sums.get(category, 0.0) + score
+
+    def percentile_rank(self, category: str, outcome_score: float) -> Optional[float]:
+        """
+        Share (0-100) of the category's evaluations scoring below
+        `outcome_score`, counting ties as half; None for a small cohort.
+        """
+        outcome_score = array("f", [outcome_score])[0]
+        with self._lock:
+            self._refresh()
+            scores = self._scores.get(category, [])
+            if len(scores) < EVALUATION_HISTORY_MIN_COHORT:
+                return None
+            below = bisect_left(scores, outcome_score)
+            ties = bisect_right(scores, outcome_score) - below
+            return round((below + ties / 2) / len(scores) * 100, 1)
+
+    def cohort_stats(self, category: str) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            scores = self._scores.get(category, [])
+            if not scores:
+                return {"category": category, "count": 0}
+            return {
+                "category": category,
+                "count": len(scores),
+                "mean": round(self._sums[category] / len(scores), 1),
+                "min": round(scores[0], 1),
+                "p25": round(_quantile(scores, 0.25), 1),
+                "median": round(_quantile(scores, 0.5), 1),
+                "p75": round(_quantile(scores, 0.75), 1),
+                "max": round(scores[-1], 1),
+            }
+
+    def rank_and_record(self, category: str, resume_scores: Dict[str, Any],
+                        mock_scores: Dict[str, Any], outcome_score: float,
+                        record: bool = True) -> Dict[str, Any]:
+        """
+        Rank an evaluation against its category's earlier evaluations, then
+        add it to the history unless `record` is False.
+
+        Returns:
+            Dict with category, percentile (None for a small cohort) and cohort_size
+        """
+        percentile = self.percentile_rank(category, outcome_score)
+        cohort_size = len(self._scores.get(category, []))
+        if record:
+            self.record(category, resume_scores, mock_scores, outcome_score)
+        return {"category": category, "percentile": percentile, "cohort_size": cohort_size}
+
+
+evaluation_history = EvaluationHistory()
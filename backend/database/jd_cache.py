@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional
+
+JD_CACHE_MAX_ENTRIES = int(os.getenv("JD_CACHE_MAX_ENTRIES", "256"))
+JD_CACHE_NEAR_DUPLICATES = os.getenv(
+    "JD_CACHE_NEAR_DUPLICATES", "false").lower() == "true"
+JD_CACHE_SIMILARITY = float(os.getenv("JD_CACHE_SIMILARITY", "0.9"))
+JD_CACHE_SHINGLE_SIZE = 5
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_job_description(job_description: str) -> str:
+    """
+    Normalize a job description so that whitespace and case differences
+    map to the same cache entry.
+    """
+    return " ".join(job_description.lower().split())
+
+
+def jd_fingerprint(job_description: str) -> str:
+    normalized = normalize_job_description(job_description)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def jd_shingles(job_description: str, size: int = JD_CACHE_SHINGLE_SIZE) -> FrozenSet[str]:
+    words = _WORD_RE.findall(job_description.lower())
+    if len(words) < size:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+class JDArtifactCache:
+    """
+    LRU cache of everything derivable from a job description alone
+    (category, search query, selected questions).
+
+    Entries are keyed by the normalized JD fingerprint. With
+    `near_duplicates` enabled, a miss on the exact fingerprint falls back to
+    the most similar cached JD by shingle Jaccard similarity.
+    """
+
+    def __init__(self, max_entries: int = JD_CACHE_MAX_ENTRIES,
+                 near_duplicates: bool = JD_CACHE_NEAR_DUPLICATES,
+                 similarity: float = JD_CACHE_SIMILARITY) -> None:
+        self.max_entries = max_entries
+        self.near_duplicates = near_duplicates
+        self.similarity = similarity
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._shingles: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_description: str) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            job_description: Raw job description text
+
+        Returns:
+            A copy of the cached artifacts, or None on a miss
+        """
+        key = jd_fingerprint(job_description)
+        with self._lock:
+            if key not in self._entries and self.near_duplicates:
+                key = self._nearest_key(jd_shingles(job_description))
+            if key is None or key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return dict(self._entries[key])
+
+    def put(self, job_description: str, **artifacts: Any) -> None:
+        """
+        Merge artifacts (e.g. category, search_query, questions) into the
+        entry for this job description.
+        """
+        key = jd_fingerprint(job_description)
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry.update(artifacts)
+            self._entries.move_to_end(key)
+            if self.near_duplicates and key not in self._shingles:
+                self._shingles[key] = jd_shingles(job_description)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._shingles.pop(evicted, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._shingles.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _nearest_key(self, shingles: FrozenSet[str]) -> Optional[str]:
+        if not shingles:
+            return None
+        best_key, best_score = None, self.similarity
+        for key, cached in self._shingles.items():
+            union = len(shingles | cached)
+            score = len(shingles & cached) / union if union else 0.0
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+
+jd_artifact_cache = JDArtifactCache()
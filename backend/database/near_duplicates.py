@@ -0,0 +1,138 @@
+import hashlib
+import os
+import random
+import re
+from typing import Dict, FrozenSet, Hashable, List, Optional, Sequence, Set, Tuple
+
+# Estimated Jaccard similarity of question shingles above which two questions
+# are treated as the same question. Questions differing in one content word
+# ("... you failed" / "... you succeeded") score about 0.5-0.67.
+QNA_DEDUP_THRESHOLD = float(os.getenv("QNA_DEDUP_THRESHOLD", "0.8"))
+MINHASH_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs at 0.8 similarity collide in a band ~99.98% of the time
+LSH_BANDS = 16
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Dropped before shingling so rewordings like "a time when you" still match
+_FILLER_WORDS = frozenset((
+    "a", "an", "the", "when", "that", "please", "can", "could", "would",
+    "you", "your", "me", "is", "are", "s",
+    "about", "at", "for", "from", "in", "of", "on", "to", "with", "within",
+))
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def question_shingles(text: str, size: int = 2) -> FrozenSet[str]:
+    """
+    Word n-grams of the question without filler words. Unlike character
+    shingles, changing one content word changes every n-gram containing it.
+    """
+    words = _WORD_RE.findall(text.lower())
+    words = [word for word in words if word not in _FILLER_WORDS] or words
+    if len(words) <= size:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = MINHASH_PERMUTATIONS, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                        for _ in range(num_perm)]
+
+    def signature(self, shingles: FrozenSet[str]) -> Tuple[int, ...]:
+        if not shingles:
+            return tuple([_MAX_HASH] * self.num_perm)
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+                  for s in shingles]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        )
+
+
+def estimated_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH index: `find` returns an already-added key whose estimated
+    similarity to the text is at least `threshold`, checking only the keys
+    that share an LSH band instead of every stored question.
+    """
+
+    def __init__(self, threshold: float = QNA_DEDUP_THRESHOLD,
+                 hasher: Optional[MinHasher] = None, bands: int = LSH_BANDS) -> None:
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        self.bands = bands
+        self.rows = self.hasher.num_perm // bands
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = {}
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        return self.hasher.signature(question_shingles(text))
+
+    def add(self, key: Hashable, text: str,
+            signature: Optional[Tuple[int, ...]] = None) -> None:
+        signature = signature or self.signature(text)
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def candidates(self, signature: Tuple[int, ...]) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for band_key in self._band_keys(signature):
+            found.update(self._buckets.get(band_key, ()))
+        return found
+
+    def similar(self, signature: Tuple[int, ...]) -> List[Tuple[Hashable, float]]:
+        """Stored keys at or above the threshold, with their estimated similarity."""
+        return [(key, score) for key in self.candidates(signature)
+                if (score := estimated_similarity(signature, self._signatures[key])) >= self.threshold]
+
+    def find(self, text: str) -> Tuple[Hashable, float]:
+        """
+        Returns:
+            (key, similarity) of the most similar stored text above the
+            threshold, or (None, 0.0)
+        """
+        matches = self.similar(self.signature(text))
+        return max(matches, key=lambda match: match[1]) if matches else (None, 0.0)
+
+
+def cluster_near_duplicates(texts: Dict[Hashable, str],
+                            threshold: float = QNA_DEDUP_THRESHOLD) -> List[List[Hashable]]:
+    """
+    Group keys whose texts are near-duplicates (transitively, via union-find).
+
+    Returns:
+        Clusters with more than one member, each in `texts` insertion order
+    """
+    index = NearDuplicateIndex(threshold)
+    parent: Dict[Hashable, Hashable] = {}
+
+    def root(key: Hashable) -> Hashable:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key, text in texts.items():
+        parent[key] = key
+        signature = index.signature(text)
+        for other, _ in index.similar(signature):
+            parent[root(key)] = root(other)
+        index.add(key, text, signature)
+
+    clusters: Dict[Hashable, List[Hashable]] = {}
+    for key in texts:
+        clusters.setdefault(root(key), []).append(key)
+    return [members for members in clusters.values() if len(members) > 1]
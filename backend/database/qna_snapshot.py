@@ -0,0 +1,148 @@
+"""
+Bulk export/import of the behavioral Q&A collection, so a new replica can be
+seeded from a snapshot file instead of live LLM calls.
+
+Snapshots are gzipped JSONL: a header line, then one line per item with the
+document, metadata and embedding (little-endian float32, base64). Import
+upserts in batches with the stored embeddings, so nothing is re-embedded.
+
+Usage (from backend/):
+    python -m database.qna_snapshot export qna_snapshot.jsonl.gz
+    python -m database.qna_snapshot import qna_snapshot.jsonl.gz
+"""
+import argparse
+import base64
+import gzip
+import json
+import sys
+import time
+from array import array
+from typing import Any, Dict, Iterator, List
+
+SNAPSHOT_FORMAT = "behavioral_qna-snapshot"
+SNAPSHOT_VERSION = 1
+EXPORT_PAGE_SIZE = 1000
+IMPORT_BATCH_SIZE = 500
+
+
+def _encode_embedding(embedding: Any) -> str:
+    values = array("f", (float(v) for v in embedding))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode_embedding(encoded: str) -> List[float]:
+    values = array("f")
+    values.frombytes(base64.b64decode(encoded))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+
+def _embedding_function_name(collection) -> str:
+    function = getattr(collection, "_embedding_function", None)
+    name = getattr(function, "name", None)
+    return name() if callable(name) else type(function).__name__
+
+
+def _iter_items(collection) -> Iterator[Dict[str, Any]]:
+    offset = 0
+    while True:
+        page = collection.get(limit=EXPORT_PAGE_SIZE, offset=offset,
+                              include=["documents", "metadatas", "embeddings"])
+        ids = page["ids"]
+        if not ids:
+            return
+        for item_id, document, metadata, embedding in zip(
+                ids, page["documents"], page["metadatas"], page["embeddings"]):
+            yield {"id": item_id, "document": document, "metadata": metadata,
+                   "embedding": _encode_embedding(embedding)}
+        offset += len(ids)
+
+
+def export_snapshot(collection, path: str) -> int:
+    """
+    Write every item of `collection` to a snapshot file.
+
+    Returns:
+        Number of items exported
+    """
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "collection": collection.name,
+            "embedding_function": _embedding_function_name(collection),
+            "created_at": time.time(),
+        }) + "\n")
+        for item in _iter_items(collection):
+            f.write(json.dumps(item, separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+def import_snapshot(collection, path: str, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+    """
+    Upsert a snapshot into `collection` using its stored embeddings.
+
+    Returns:
+        Number of items imported
+    """
+    count = 0
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != SNAPSHOT_FORMAT or header.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} Q&A snapshot")
+        if header.get("embedding_function") != _embedding_function_name(collection):
+            # Query embeddings would not be comparable with the imported ones
+            print(f"⚠️ Snapshot embeddings come from '{header.get('embedding_function')}', "
+                  f"collection uses '{_embedding_function_name(collection)}'")
+
+        batch: List[Dict[str, Any]] = []
+        for line in f:
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                count += _upsert(collection, batch)
+                batch = []
+        if batch:
+            count += _upsert(collection, batch)
+    return count
+
+
+def _upsert(collection, batch: List[Dict[str, Any]]) -> int:
+    collection.upsert(
+        ids=[item["id"] for item in batch],
+        documents=[item["document"] for item in batch],
+        metadatas=[item["metadata"] for item in batch],
+        embeddings=[_decode_embedding(item["embedding"]) for item in batch],
+    )
+    return len(batch)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="Snapshot file (.jsonl.gz)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from database import db
+    from database.chroma_writer import bump_generation, chroma_write_lock
+    start = time.perf_counter()
+    if args.command == "export":
+        count = export_snapshot(db.qna_collection(), args.path)
+        print(f"💾 Exported {count} items to {args.path}")
+    else:
+        with chroma_write_lock(db.CHROMA_DB_PATH):
+            count = import_snapshot(db.qna_collection(), args.path, args.batch_size)
+            bump_generation(db.CHROMA_DB_PATH)  # Workers reopen their clients
+        print(f"📥 Imported {count} items from {args.path}")
+    print(f"⏱️  {time.perf_counter() - start:.2f}s, "
+          f"collection now has {db.qna_collection().count()} items")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialised within the process
+    fcntl = None
+
+RESOURCE_INDEX_PATH = os.getenv("RESOURCE_INDEX_PATH", "resource_index.jsonl")
+# A local hit needs both a high enough BM25 score and most query terms present
+RESOURCE_INDEX_MIN_SCORE = float(os.getenv("RESOURCE_INDEX_MIN_SCORE", "3.0"))
+RESOURCE_INDEX_MIN_COVERAGE = float(os.getenv("RESOURCE_INDEX_MIN_COVERAGE", "0.6"))
+# Markdown beyond this many characters is not indexed
+RESOURCE_INDEX_MAX_CHARS = int(os.getenv("RESOURCE_INDEX_MAX_CHARS", "20000"))
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Title terms count this many times, so pages about a topic beat passing mentions
+TITLE_WEIGHT = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = frozenset((
+    "a", "an", "and", "the", "of", "to", "in", "on", "for", "with", "how", "what",
+    "is", "are", "be", "as", "at", "by", "or", "it", "your", "you", "this", "that",
+))
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class ResourceIndex:
+    """
+    BM25 inverted index of learning-resource pages fetched from Firecrawl
+    (title, URL, markdown), keyed by URL.
+
+    Pages are added incrementally and appended to a JSONL file, which is
+    replayed on startup; a re-added URL replaces the earlier page, and the
+    file is rewritten with one line per URL when it holds superseded copies.
+    """
+
+    def __init__(self, path: Optional[str] = RESOURCE_INDEX_PATH) -> None:
+        self.path = path
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        # A separate lock file, since compaction replaces the index file
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self, path: str) -> None:
+        with self._file_lock():
+            records: Dict[str, Dict[str, Any]] = {}
+            lines = 0
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        self._index(record)
+                    except (ValueError, KeyError):
+                        continue  # Partially written last line
+                    # Latest copy last, in the order pages were re-fetched
+                    records.pop(record["url"], None)
+                    records[record["url"]] = record
+            if lines > len(records):
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in records.values())
+                os.replace(tmp_path, path)
+                print(f"🧹 Compacted {path} from {lines} to {len(records)} lines")
+        print(f"📚 Loaded {len(self._docs)} resource pages from {path}")
+
+    def _index(self, page: Dict[str, Any]) -> None:
+        url = page["url"]
+        if url in self._docs:
+            self._remove(url)
+        terms = Counter(tokenize(page.get("markdown") or ""))
+        for term in tokenize(page.get("title") or ""):
+            terms[term] += TITLE_WEIGHT
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[url] = tf
+        length = sum(terms.values())
+        self._docs[url] = {"url": url, "title": page.get("title")}
+        self._lengths[url] = length
+        self._doc_terms[url] = list(terms)
+        self._total_length += length
+
+    def _remove(self, url: str) -> None:
+        for term in self._doc_terms.pop(url, []):
+            postings = self._postings[term]
+            postings.pop(url, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(url, 0)
+        self._docs.pop(url, None)
+
+    def add_pages(self, pages: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index pages (dicts with url, title and markdown, as in Firecrawl
+        search results) and persist them.
+
+        Returns:
+            Number of pages indexed
+        """
+        records = [{
+            "url": page["url"],
+            "title": page.get("title") or (page.get("metadata") or {}).get("title"),
+            "markdown": (page.get("markdown") or page.get("description") or "")[:RESOURCE_INDEX_MAX_CHARS],
+        } for page in pages if page.get("url")]
+        if not records:
+            return 0
+        with self._lock:
+            for record in records:
+                self._index(record)
+            if self.path:
+                # Workers share the file; whole lines only, one writer at a time
+                with self._file_lock(), open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in records)
+        return len(records)
+
+    def search(self, query: str, limit: int = 1) -> List[Tuple[float, float, Dict[str, Any]]]:
+        """
+        Returns:
+            Up to `limit` (bm25_score, query_term_coverage, page) tuples, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self._docs:
+                return []
+            n_docs = len(self._docs)
+            avg_length = self._total_length / n_docs
+            scores: Dict[str, float] = {}
+            matched: Dict[str, int] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for url, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[url] / avg_length)
+                    scores[url] = scores.get(url, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    matched[url] = matched.get(url, 0) + 1
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [(score, matched[url] / len(terms), dict(self._docs[url]))
+                    for url, score in ranked]
+
+    def lookup(self, query: str) -> Optional[str]:
+        """URL of the best local match for `query`, or None if it is not good enough."""
+        results = self.search(query, limit=1)
+        if not results:
+            return None
+        score, coverage, page = results[0]
+        if score >= RESOURCE_INDEX_MIN_SCORE and coverage >= RESOURCE_INDEX_MIN_COVERAGE:
+            return page["url"]
+        return None
+
+
+resource_index = ResourceIndex()
@@ -0,0 +1,69 @@
+"""
+Per-request latency budgets.
+
+Each API call gets a deadline (REQUEST_BUDGET_SECONDS, or the X-Request-Budget
+header in seconds) bound to a context variable, so it follows the request into
+the threadpool and LangGraph node threads like the trace context does. Agents
+check `has_budget` before optional work and call `mark_degraded` when they
+skip it or substitute a local fallback.
+"""
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+REQUEST_BUDGET_SECONDS = float(os.getenv("REQUEST_BUDGET_SECONDS", "120"))
+BUDGET_HEADER = "X-Request-Budget"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+_degraded: ContextVar[Optional[List[str]]] = ContextVar("degraded", default=None)
+_lock = threading.Lock()
+
+
+def parse_budget(value: Optional[str]) -> float:
+    """Budget in seconds from a header value, falling back to the default."""
+    try:
+        budget = float(value) if value else REQUEST_BUDGET_SECONDS
+    except ValueError:
+        return REQUEST_BUDGET_SECONDS
+    return budget if budget > 0 else REQUEST_BUDGET_SECONDS
+
+
+@contextmanager
+def request_deadline(budget_seconds: float = REQUEST_BUDGET_SECONDS) -> Iterator[None]:
+    """Bind a deadline `budget_seconds` from now to the current context."""
+    deadline_token = _deadline.set(time.monotonic() + budget_seconds)
+    degraded_token = _degraded.set([])
+    try:
+        yield
+    finally:
+        _degraded.reset(degraded_token)
+        _deadline.reset(deadline_token)
+
+
+def remaining() -> float:
+    """Seconds left in the current request's budget (infinite outside a request)."""
+    deadline = _deadline.get()
+    return math.inf if deadline is None else deadline - time.monotonic()
+
+
+def has_budget(seconds: float) -> bool:
+    return remaining() >= seconds
+
+
+def mark_degraded(part: str, reason: str = "deadline") -> None:
+    """Record that `part` of the response was skipped or served from a fallback."""
+    degraded = _degraded.get()
+    print(f"⏳ Degraded {part}: {reason} ({remaining():.1f}s left)")
+    if degraded is not None:
+        with _lock:
+            if part not in degraded:
+                degraded.append(part)
+
+
+def degraded_parts() -> List[str]:
+    with _lock:
+        return list(_degraded.get() or [])
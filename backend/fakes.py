@@ -0,0 +1,279 @@
+"""
+Deterministic local stand-ins for the external services (Groq chat model,
+Firecrawl, Chroma's embedding model, Whisper) so the pipeline can run
+offline in benchmarks, load tests and local development.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from chromadb import Documents, EmbeddingFunction, Embeddings
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+_EVALUATION_ID_RE = re.compile(r"### evaluation_id: (\d+)")
+
+# Prompt marker -> canned response, checked in order (first match wins).
+# Markers are phrases unique to each template in prompts/tool_prompts.py.
+DEFAULT_RESPONSES: Dict[str, str] = {
+    "creating search queries": "software engineer behavioral interview questions teamwork",
+    "Extract 2 behavioral interview questions": json.dumps({"questions": [
+        {"question": "Tell me about a time you resolved a conflict in your team.",
+         "answer": "I listened to both sides and proposed a compromise that shipped on time.",
+         "source": "local"},
+        {"question": "Describe a project where you took ownership end to end.",
+         "answer": "I led the migration of our billing service and cut latency by 40%.",
+         "source": "local"},
+    ]}),
+    "meticulous document validator": json.dumps({
+        "is_valid_resume": True, "is_valid_job_description": True,
+        "validation_message": None, "clarity": 78, "relevance": 72,
+        "structure": 80, "experience": 4,
+        "feedback": ["Quantify achievements with metrics.",
+                     "Tailor the summary to the job description."],
+    }),
+    "several independent candidate evaluations": "",  # built per request
+    "expert interview evaluator": json.dumps({
+        "tone": 75, "confidence": 70, "relevance": 80, "total_marks": 75.0,
+        "feedback": ["Use the STAR method.", "Quantify the impact of your work."],
+    }),
+    "AI interview coach": json.dumps({
+        "score": 74.0,
+        "feedback": "Strong resume; practice structuring answers around measurable outcomes.",
+    }),
+    "Gap Fixer": json.dumps({
+        "overall_summary": "Solid foundation; add metrics to the resume and practice concise answers.",
+        "actionable_steps": [
+            {"description": "Quantify achievements on resume bullet points.",
+             "search_query": "quantify resume achievements"},
+            {"description": "Practice interview answers using the STAR method.",
+             "search_query": "STAR method interview examples"},
+            {"description": "Explain technical projects clearly and briefly.",
+             "search_query": "how to explain technical projects in interviews"},
+        ],
+    }),
+}
+
+
+def _batch_response(prompt: str) -> str:
+    feedback = json.loads(DEFAULT_RESPONSES["expert interview evaluator"])
+    return json.dumps({"evaluations": [
+        {**feedback, "evaluation_id": int(evaluation_id)}
+        for evaluation_id in _EVALUATION_ID_RE.findall(prompt)
+    ]})
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model returning canned JSON for each prompt in ToolPrompts after a
+    configurable delay. Token usage is reported as whitespace-split word
+    counts so metrics and accounting code paths still run.
+    """
+
+    latency: float = 0.0
+    responses: Dict[str, str] = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None,
+                  **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        if self.latency:
+            time.sleep(self.latency)
+        content = self._respond(prompt)
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=content))],
+            llm_output={"token_usage": {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": len(content.split()),
+            }},
+        )
+
+    def _respond(self, prompt: str) -> str:
+        for marker, content in {**DEFAULT_RESPONSES, **self.responses}.items():
+            if marker in prompt:
+                if marker == "several independent candidate evaluations" and not content:
+                    return _batch_response(prompt)
+                return content
+        return "{}"
+
+
+class FakeFireCrawlService:
+    """Drop-in for FireCrawlService returning synthetic pages."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+
+    def search(self, query: str, n_res: int = 2):
+        if self.latency:
+            time.sleep(self.latency)
+        slug = re.sub(r"\W+", "-", query.lower()).strip("-")
+        return SimpleNamespace(data=[{
+            "url": f"https://example.com/{slug}/{i}",
+            "title": f"{query} ({i})",
+            "markdown": f"# {query}\n\nLocal stand-in content about {query}.",
+        } for i in range(n_res)])
+
+    def scrape(self, url: str):
+        if self.latency:
+            time.sleep(self.latency)
+        return SimpleNamespace(markdown=f"# {url}\n\nLocal stand-in content.", metadata={"url": url})
+
+
+_TRANSCRIPT_WORDS = (
+    "i", "we", "the", "team", "project", "led", "built", "deadline", "customer",
+    "improved", "latency", "agreed", "plan", "result", "learned", "shipped",
+)
+
+
+class FakeTranscriber:
+    """
+    Drop-in for WhisperTranscriber. Transcripts are derived from a hash of
+    the audio (about 2.5 words per second), and `cost` scales a pure-Python
+    pass over the samples so the CPU use per audio second is Whisper-like
+    in shape if not in size.
+    """
+
+    def __init__(self, cost: int = 1) -> None:
+        self.cost = cost
+
+    def transcribe(self, pcm: bytes) -> str:
+        from array import array
+        samples = array("h", pcm[:len(pcm) - len(pcm) % 2])
+        energy = 0
+        for _ in range(self.cost):
+            energy += sum(abs(sample) for sample in samples)
+        digest = hashlib.blake2b(pcm, digest_size=64).digest()
+        n_words = max(1, int(len(samples) / 16000 * 2.5)) if energy else 0
+        return " ".join(_TRANSCRIPT_WORDS[digest[i % len(digest)] % len(_TRANSCRIPT_WORDS)]
+                        for i in range(n_words))
+
+
+class FakeFirecrawlServer:
+    """
+    Local HTTP stand-in for the Firecrawl REST API (/v1/search, /v1/scrape)
+    serving FakeFireCrawlService's pages with keep-alive, so the real pooled
+    client can be exercised with `FireCrawlService(base_url=server.url)`.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0) -> None:
+        pages = FakeFireCrawlService(latency=latency)
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path == "/v1/search":
+                    body = {"success": True, "data": pages.search(
+                        payload["query"], payload.get("limit", 2)).data}
+                elif self.path == "/v1/scrape":
+                    page = pages.scrape(payload["url"])
+                    body = {"success": True, "data": {
+                        "markdown": page.markdown, "metadata": page.metadata}}
+                else:
+                    body = {"success": False, "error": f"Unknown endpoint {self.path}"}
+                content = json.dumps(body).encode("utf-8")
+                self.send_response(200 if body["success"] else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeFirecrawlServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-firecrawl", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class HashEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Bag-of-hashed-words embedding so Chroma works without downloading the
+    default ONNX model. Similar texts share dimensions, so similarity
+    queries still return sensible neighbours.
+    """
+
+    def __init__(self, dimensions: int = 256) -> None:
+        self.dimensions = dimensions
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings = []
+        for text in input:
+            vector = [0.0] * self.dimensions
+            for word in re.findall(r"\w+", text.lower()):
+                digest = hashlib.md5(word.encode("utf-8")).digest()
+                vector[int.from_bytes(digest[:4], "little") % self.dimensions] += 1.0
+            norm = sum(v * v for v in vector) ** 0.5 or 1.0
+            embeddings.append([v / norm for v in vector])
+        return embeddings
+
+    @staticmethod
+    def name() -> str:
+        return "hash-embedding"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"dimensions": self.dimensions}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "HashEmbeddingFunction":
+        return HashEmbeddingFunction(config.get("dimensions", 256))
+
+
+def install_fakes(latency: float = 0.0, firecrawl_latency: float = 0.0,
+                  chroma_path: Optional[str] = None) -> FakeChatModel:
+    """
+    Route every LLM task and audio transcription to local stand-ins and swap
+    the Firecrawl service and Chroma collection in the modules that imported
+    them. Must run before graphs
+    are invoked; returns the installed chat model.
+    """
+    from agents import behavioral_retriever, gap_fixer, resource_prefetcher
+    from agents.transcriber import use_transcriber
+    from database import db
+    from llm import use_llm_for_all
+    from metrics import LLMMetricsCallback
+    from tracing import LLMTracingCallback
+    from token_budget import TokenAccountingCallback
+
+    fake_llm = FakeChatModel(latency=latency,
+                             callbacks=[LLMMetricsCallback(), LLMTracingCallback(),
+                                        TokenAccountingCallback()])
+    use_llm_for_all(fake_llm)
+
+    fake_firecrawl = FakeFireCrawlService(latency=firecrawl_latency)
+    behavioral_retriever.FireCrawlService = lambda: fake_firecrawl
+    gap_fixer.FireCrawlService = lambda: fake_firecrawl
+    resource_prefetcher.FireCrawlService = lambda: fake_firecrawl
+    use_transcriber(FakeTranscriber())
+
+    if chroma_path is not None:
+        db.use_chroma(chroma_path, HashEmbeddingFunction())
+    return fake_llm
@@ -1,24 +1,159 @@
 import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import httpx
 from dotenv import load_dotenv
-from firecrawl import FirecrawlApp, ScrapeOptions
-from sqlalchemy import over
-# from langchain_community.tools import TavilySearchResults
+from pydantic import BaseModel
+from metrics import FIRECRAWL_CONNECTIONS, FIRECRAWL_LATENCY, FIRECRAWL_REQUESTS
+from tracing import span
+
+load_dotenv()
+
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev").rstrip("/")
+FIRECRAWL_CONNECT_TIMEOUT = float(os.getenv("FIRECRAWL_CONNECT_TIMEOUT", "5"))
+FIRECRAWL_READ_TIMEOUT = float(os.getenv("FIRECRAWL_READ_TIMEOUT", "30"))
+FIRECRAWL_MAX_CONNECTIONS = int(os.getenv("FIRECRAWL_MAX_CONNECTIONS", "20"))
+FIRECRAWL_MAX_KEEPALIVE = int(os.getenv("FIRECRAWL_MAX_KEEPALIVE", "10"))
+FIRECRAWL_KEEPALIVE_EXPIRY = float(os.getenv("FIRECRAWL_KEEPALIVE_EXPIRY", "30"))
+
+
+class FirecrawlError(RuntimeError):
+    pass
+
+
+class SearchResponse(BaseModel):
+    success: bool = True
+    data: List[Dict[str, Any]] = []
+    warning: Optional[str] = None
+
+
+class ScrapeResponse(BaseModel):
+    markdown: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+
+
+def _client_options(base_url: str) -> Dict[str, Any]:
+    return {
+        "base_url": base_url,
+        "headers": {"Authorization": f"Bearer {os.getenv('FIRECRAWL_API_KEY', '')}"},
+        "timeout": httpx.Timeout(FIRECRAWL_READ_TIMEOUT, connect=FIRECRAWL_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(max_connections=FIRECRAWL_MAX_CONNECTIONS,
+                               max_keepalive_connections=FIRECRAWL_MAX_KEEPALIVE,
+                               keepalive_expiry=FIRECRAWL_KEEPALIVE_EXPIRY),
+    }
+
+
+def _count_connection(event_name: str, info: Dict[str, Any]) -> None:
+    # A request that reuses a pooled connection never emits connect_tcp
+    if event_name == "connection.connect_tcp.complete":
+        FIRECRAWL_CONNECTIONS.inc()
+
+
+async def _count_connection_async(event_name: str, info: Dict[str, Any]) -> None:
+    _count_connection(event_name, info)
+
+
+def _search_payload(query: str, n_res: int) -> Dict[str, Any]:
+    return {"query": query, "limit": n_res, "scrapeOptions": {"formats": ["markdown"]}}
+
+
+def _scrape_payload(url: str) -> Dict[str, Any]:
+    return {"url": url, "formats": ["markdown"]}
+
+
+def _parse(response: httpx.Response, operation: str) -> Dict[str, Any]:
+    try:
+        body = response.json()
+    except ValueError:
+        raise FirecrawlError(
+            f"Firecrawl {operation} returned non-JSON response (HTTP {response.status_code})")
+    if response.status_code != 200 or not body.get("success"):
+        raise FirecrawlError(
+            f"Firecrawl {operation} failed (HTTP {response.status_code}): {body.get('error', body)}")
+    return body
 
 
 class FireCrawlService:
-    def __init__(self):
-        load_dotenv(override=True)
-        self.app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
-
-    def search(self, query: str, n_res: int = 2):
-        crawl_result = self.app.search(
-            query=query,
-            limit=n_res,
-            scrape_options=ScrapeOptions(formats=['markdown']),
-        )
-        return crawl_result
-
-    def scrape(self, url: str):
-        scrape_result = self.app.scrape_url(
-            url, formats=['markdown'])
-        return scrape_result
+    """
+    Firecrawl REST client. Every instance for the same base URL (default
+    FIRECRAWL_API_URL) shares one process-wide pooled keep-alive HTTP
+    client, so constructing the service per request is cheap and searches
+    reuse open TLS connections.
+    """
+
+    _clients: Dict[str, httpx.Client] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url = (base_url or FIRECRAWL_API_URL).rstrip("/")
+
+    def client(self) -> httpx.Client:
+        with self._lock:
+            client = self._clients.get(self.base_url)
+            if client is None:
+                client = self._clients[self.base_url] = httpx.Client(**_client_options(self.base_url))
+            return client
+
+    def _post(self, path: str, payload: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        FIRECRAWL_REQUESTS.inc(operation=operation)
+        response = self.client().post(path, json=payload,
+                                      extensions={"trace": _count_connection})
+        return _parse(response, operation)
+
+    def search(self, query: str, n_res: int = 2) -> SearchResponse:
+        with FIRECRAWL_LATENCY.time(operation="search"), span("firecrawl.search", query=query):
+            body = self._post("/v1/search", _search_payload(query, n_res), "search")
+        return SearchResponse(**body)
+
+    def scrape(self, url: str) -> ScrapeResponse:
+        with FIRECRAWL_LATENCY.time(operation="scrape"), span("firecrawl.scrape", url=url):
+            body = self._post("/v1/scrape", _scrape_payload(url), "scrape")
+        return ScrapeResponse(**body.get("data", {}))
+
+
+class AsyncFireCrawlService:
+    """
+    Async variant of FireCrawlService for use from the event loop. Each
+    shared client is bound to the loop that first uses it.
+    """
+
+    _clients: Dict[str, httpx.AsyncClient] = {}
+
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url = (base_url or FIRECRAWL_API_URL).rstrip("/")
+
+    def client(self) -> httpx.AsyncClient:
+        client = self._clients.get(self.base_url)
+        if client is None:
+            client = self._clients[self.base_url] = httpx.AsyncClient(**_client_options(self.base_url))
+        return client
+
+    async def _post(self, path: str, payload: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        FIRECRAWL_REQUESTS.inc(operation=operation)
+        response = await self.client().post(path, json=payload,
+                                            extensions={"trace": _count_connection_async})
+        return _parse(response, operation)
+
+    async def search(self, query: str, n_res: int = 2) -> SearchResponse:
+        with FIRECRAWL_LATENCY.time(operation="search"), span("firecrawl.search", query=query):
+            body = await self._post("/v1/search", _search_payload(query, n_res), "search")
+        return SearchResponse(**body)
+
+    async def scrape(self, url: str) -> ScrapeResponse:
+        with FIRECRAWL_LATENCY.time(operation="scrape"), span("firecrawl.scrape", url=url):
+            body = await self._post("/v1/scrape", _scrape_payload(url), "scrape")
+        return ScrapeResponse(**body.get("data", {}))
+
+
+async def close_firecrawl_clients() -> None:
+    """Close the shared pooled clients (call on application shutdown)."""
+    with FireCrawlService._lock:
+        clients = list(FireCrawlService._clients.values())
+        FireCrawlService._clients.clear()
+    for client in clients:
+        client.close()
+    async_clients = list(AsyncFireCrawlService._clients.values())
+    AsyncFireCrawlService._clients.clear()
+    for async_client in async_clients:
+        await async_client.aclose()
@@ -1,5 +1,165 @@
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableConfig
+from metrics import LLMMetricsCallback
+from tracing import LLMTracingCallback
+from token_budget import TokenAccountingCallback
 
 load_dotenv()
-llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0.7, verbose=True,)
+
+# Call sites; each can be routed to its own backend with LLM_BACKEND_<TASK>
+LLM_TASKS = (
+    "search_query",
+    "qna_generation",
+    "resume_analysis",
+    "mock_evaluation",
+    "prediction",
+    "gap_fixer",
+)
+# "<provider>:<model>", provider one of groq, google, local
+DEFAULT_LLM_BACKEND = os.getenv("LLM_BACKEND", "groq:llama-3.1-8b-instant")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+
+# Hedging: when the primary backend is slower than this percentile of its
+# recent latencies, the same request is also sent to the hedge backend
+# (LLM_HEDGE_BACKEND or LLM_HEDGE_BACKEND_<TASK>) and the first answer wins
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "3.0"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_MAX_WORKERS = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "16"))
+
+_models: Dict[str, BaseChatModel] = {}
+_routes: Dict[str, Any] = {}
+_override: Optional[Any] = None
+_lock = threading.Lock()
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+
+
+def create_model(spec: str) -> BaseChatModel:
+    """
+    Build a chat model from a "<provider>:<model>" spec.
+
+    Args:
+        spec: e.g. "groq:llama-3.1-8b-instant", "google:gemini-1.5-flash", "local:fake"
+
+    Returns:
+        The chat model, with metrics, tracing and token accounting callbacks attached
+    """
+    provider, _, model = spec.partition(":")
+    callbacks = [LLMMetricsCallback(), LLMTracingCallback(), TokenAccountingCallback()]
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, temperature=LLM_TEMPERATURE, verbose=True,
+                        callbacks=callbacks)
+    if provider == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(model=model, temperature=LLM_TEMPERATURE,
+                                      callbacks=callbacks)
+    if provider == "local":
+        from fakes import FakeChatModel
+        return FakeChatModel(callbacks=callbacks)
+    raise ValueError(f"Unknown LLM provider '{provider}' in backend spec '{spec}'")
+
+
+def _model(spec: str) -> BaseChatModel:
+    # One client per spec, shared by every task routed to it
+    if spec not in _models:
+        _models[spec] = create_model(spec)
+    return _models[spec]
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        _hedge_executor = ThreadPoolExecutor(
+            max_workers=LLM_HEDGE_MAX_WORKERS, thread_name_prefix="llm-hedge")
+    return _hedge_executor
+
+
+class HedgedRunnable(Runnable):
+    """
+    Runs `primary`, and if it has not answered within the configured
+    latency percentile, also runs `hedge`; returns whichever succeeds first.
+    The losing call is left to finish in the background.
+    """
+
+    def __init__(self, primary: Runnable, hedge: Runnable, latencies: deque) -> None:
+        self.primary = primary
+        self.hedge = hedge
+        self.latencies = latencies
+
+    def hedge_delay(self) -> float:
+        if len(self.latencies) < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_DEFAULT_DELAY
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * LLM_HEDGE_PERCENTILE / 100))
+        return ordered[index]
+
+    def _submit(self, runnable: Runnable, input: Any, config: Optional[RunnableConfig]):
+        # Carry the caller's trace context into the pool thread
+        context = contextvars.copy_context()
+        return _hedge_pool().submit(context.run, self._timed, runnable, input, config)
+
+    def _timed(self, runnable: Runnable, input: Any, config: Optional[RunnableConfig]):
+        start = time.perf_counter()
+        result = runnable.invoke(input, config)
+        if runnable is self.primary:
+            self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        pending = {self._submit(self.primary, input, config)}
+        done, _ = wait(pending, timeout=self.hedge_delay())
+        if not done:
+            print("⏩ Primary LLM backend slow, sending hedged request")
+            pending.add(self._submit(self.hedge, input, config))
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> "HedgedRunnable":
+        return HedgedRunnable(self.primary.with_structured_output(schema, **kwargs),
+                              self.hedge.with_structured_output(schema, **kwargs),
+                              self.latencies)
+
+
+def get_llm(task: str):
+    """
+    Return the model configured for an agent task.
+
+    Resolution order: `use_llm_for_all` override, LLM_BACKEND_<TASK>,
+    LLM_BACKEND. A hedge backend wraps the primary in a HedgedRunnable.
+    """
+    if _override is not None:
+        return _override
+    with _lock:
+        if task not in _routes:
+            env_task = task.upper()
+            spec = os.getenv(f"LLM_BACKEND_{env_task}", DEFAULT_LLM_BACKEND)
+            hedge_spec = os.getenv(f"LLM_HEDGE_BACKEND_{env_task}",
+                                   os.getenv("LLM_HEDGE_BACKEND", ""))
+            route = _model(spec)
+            if hedge_spec and hedge_spec != spec:
+                route = HedgedRunnable(route, _model(hedge_spec), deque(maxlen=200))
+            _routes[task] = route
+        return _routes[task]
+
+
+def use_llm_for_all(model: Optional[Any]) -> None:
+    """Route every task to `model` (e.g. a local stand-in); None restores routing."""
+    global _override
+    _override = model
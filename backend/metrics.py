@@ -0,0 +1,236 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Seconds; covers fast local work (Chroma, parsing) up to slow LLM/Firecrawl calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Gauge:
+    """
+    Gauge whose value is read from a callback at scrape time, so nothing is
+    paid on the request path.
+    """
+
+    def __init__(self, name: str, documentation: str,
+                 callback: Callable[[], float] = lambda: 0) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def set_function(self, callback: Callable[[], float]) -> None:
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            value = float("nan")
+        return [f"# HELP {self.name} {self.documentation}",
+                f"# TYPE {self.name} gauge",
+                f"{self.name} {value}"]
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str,
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelKey, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(_label_key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(key, {'le': str(bound)})} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            lines.append(
+                f"{self.name}_bucket{_format_labels(key, {'le': '+Inf'})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+
+    def register(self, metric: Any) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+NODE_LATENCY = registry.register(Histogram(
+    "graph_node_latency_seconds", "Latency of LangGraph node executions"))
+NODE_ERRORS = registry.register(Counter(
+    "graph_node_errors_total", "LangGraph node executions that raised"))
+LLM_LATENCY = registry.register(Histogram(
+    "llm_call_latency_seconds", "Latency of LLM calls"))
+LLM_PROMPT_TOKENS = registry.register(Counter(
+    "llm_prompt_tokens_total", "Prompt tokens reported by LLM responses"))
+LLM_COMPLETION_TOKENS = registry.register(Counter(
+    "llm_completion_tokens_total", "Completion tokens reported by LLM responses"))
+LLM_COST = registry.register(Counter(
+    "llm_cost_usd_total", "Estimated LLM spend in USD from LLM_*_COST_PER_1K prices"))
+LLM_ERRORS = registry.register(Counter(
+    "llm_call_errors_total", "LLM calls that raised"))
+CHROMA_LATENCY = registry.register(Histogram(
+    "chroma_operation_latency_seconds", "Latency of ChromaDB operations"))
+FIRECRAWL_LATENCY = registry.register(Histogram(
+    "firecrawl_call_latency_seconds", "Latency of Firecrawl API calls"))
+FIRECRAWL_REQUESTS = registry.register(Counter(
+    "firecrawl_requests_total", "Firecrawl API requests sent"))
+# Requests minus new connections is the number served on a reused keep-alive connection
+FIRECRAWL_CONNECTIONS = registry.register(Counter(
+    "firecrawl_connections_opened_total", "New TCP connections opened to the Firecrawl API"))
+CACHE_HITS = registry.register(Counter(
+    "cache_hits_total", "Cache hits by cache name"))
+CACHE_MISSES = registry.register(Counter(
+    "cache_misses_total", "Cache misses by cache name"))
+INPUT_REJECTIONS = registry.register(Counter(
+    "input_prevalidation_rejections_total", "Inputs rejected before any LLM call"))
+AUDIO_SECONDS_TRANSCRIBED = registry.register(Counter(
+    "audio_seconds_transcribed_total", "Seconds of answer audio transcribed"))
+SESSION_STORE_SIZE = registry.register(Gauge(
+    "session_store_size", "Number of pending interview sessions"))
+SESSION_STORE_BYTES = registry.register(Gauge(
+    "session_store_bytes", "Approximate payload bytes held by pending interview sessions"))
+
+
+def instrument_node(node_name: str, fn: Callable) -> Callable:
+    """Wrap a LangGraph node so its latency and failures are recorded."""
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            NODE_ERRORS.inc(node=node_name)
+            raise
+        finally:
+            NODE_LATENCY.observe(time.perf_counter() - start, node=node_name)
+    return wrapper
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    if hit:
+        CACHE_HITS.inc(cache=cache)
+    else:
+        CACHE_MISSES.inc(cache=cache)
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    LangChain callback recording latency and token usage for every LLM call
+    made through the shared model, whichever chain invoked it.
+    """
+
+    def __init__(self) -> None:
+        self._starts: Dict[Any, Tuple[float, str]] = {}
+
+    def _start(self, run_id: Any, metadata: Optional[Dict[str, Any]]) -> None:
+        task = (metadata or {}).get("llm_task", "default")
+        self._starts[run_id] = (time.perf_counter(), task)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        start, task = self._starts.pop(run_id, (None, "default"))
+        if start is not None:
+            LLM_LATENCY.observe(time.perf_counter() - start, task=task)
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        LLM_PROMPT_TOKENS.inc(usage.get("prompt_tokens", 0), task=task)
+        LLM_COMPLETION_TOKENS.inc(usage.get("completion_tokens", 0), task=task)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        start, task = self._starts.pop(run_id, (None, "default"))
+        if start is not None:
+            LLM_LATENCY.observe(time.perf_counter() - start, task=task)
+        LLM_ERRORS.inc(task=task)
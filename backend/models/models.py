@@ -43,6 +43,7 @@ def error_response(message: str) -> dict:
 
 class GraphState(TypedDict):
     resume_text: str
+    resume_profile: dict[str, Any]
     job_description: str
     file_path: str
     resume_analysis: dict[bool, Any
@@ -52,6 +53,8 @@ class GraphState(TypedDict):
     mock_response: dict[bool, Any]
     success_prediction: dict[bool, Any]
     gap_fixer: dict[bool, Any]
+    prefetched: dict[str, Any]
+    category: str
     stage: str
 
 
@@ -67,6 +70,16 @@ class MockInterviewFeedback(BaseModel):
                                 description="List of 2-3 actionable feedback tips")
 
 
+class BatchedMockInterviewFeedback(MockInterviewFeedback):
+    evaluation_id: int = Field(...,
+                               description="The evaluation_id of the candidate evaluation being scored")
+
+
+class MockInterviewBatchFeedback(BaseModel):
+    evaluations: List[BatchedMockInterviewFeedback] = Field(
+        ..., description="One feedback entry per candidate evaluation")
+
+
 class OutcomeModel(BaseModel):
     score: float = Field(..., ge=0, le=100,
                          description="Overall score based on resume and mock interview")
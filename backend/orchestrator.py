@@ -4,11 +4,17 @@ from typing import Any
 from langgraph.graph import START, StateGraph, END
 
 from agents.resume_analyzer import extract_resume, resume_analyse
-from agents.mock_evaluator import mock_interview_analyser
+from agents.resume_structurer import resume_context, structure_resume
+from agents.answer_scorer import evaluate_answers
 from agents.outcome_predictor import predict_outcome
 from agents.behavioral_retriever import BehaviourRetriver
 from agents.gap_fixer import gap_fixer_agent
 from models.models import GraphState
+from database.checkpoints import checkpointer
+from database.evaluation_history import evaluation_history
+from deadlines import degraded_parts
+from metrics import instrument_node
+from tracing import trace_node
 # Orchestrator module
 graph_builder = StateGraph(GraphState)
 RESUME_ANALYZER_NODE = "resume_analyzer"
@@ -16,11 +22,41 @@ BEHAVIORAL_RETRIEVER_NODE = "behavioral_retriever"
 MOCK_EVALUATOR_NODE = "mock_evaluator"
 OUT_COME_NODE = "out_come_node"
 GAP_FIXER_NODE = "gap_fixer_node"
+BEHAVIORAL_GRAPH = "behavioral"
+MOCK_EVALUATION_GRAPH = "mock_evaluation"
+
+# State key each node writes, used to report a failure under the same key
+NODE_OUTPUT_KEYS = {
+    BEHAVIORAL_RETRIEVER_NODE: "behavioral_questions",
+    MOCK_EVALUATOR_NODE: "mock_response",
+    OUT_COME_NODE: "success_prediction",
+    GAP_FIXER_NODE: "gap_fixer",
+}
+
+
+class NodeFailedError(RuntimeError):
+    """
+    Raised by a node whose agent returned an error response. Raising (rather
+    than returning the error) stops the graph at that node, so the session's
+    checkpoint keeps every earlier node's output and a retry resumes here.
+    """
+
+    def __init__(self, node_name: str, message: str) -> None:
+        super().__init__(f"{node_name} failed: {message}")
+        self.node_name = node_name
+        self.message = message
+
+
+def _require_success(node_name: str, agent_res: dict) -> dict:
+    if not agent_res.get("success"):
+        raise NodeFailedError(node_name, agent_res.get("message", "unknown error"))
+    return agent_res
 
 
 def resume_analyyser_node(state: GraphState) -> GraphState:
     extracted_resume_txt = extract_resume(state["file_path"],)
     state["resume_text"] = extracted_resume_txt
+    state["resume_profile"] = structure_resume(extracted_resume_txt)
     agent_res = resume_analyse(extracted_resume_txt,
                                job_description=state["job_description"])
     state["resume_analysis"] = agent_res
@@ -29,15 +65,19 @@ def resume_analyyser_node(state: GraphState) -> GraphState:
 
 def beahaviour_node(state: GraphState):
     behavioral_retriever = BehaviourRetriver()
-    state["behavioral_questions"] = behavioral_retriever.get_q_and_a(
-        state["job_description"])
+    state["behavioral_questions"] = _require_success(
+        BEHAVIORAL_RETRIEVER_NODE, behavioral_retriever.get_q_and_a(state["job_description"]))
     return state
 
 
 def mock_evaluator_node(state: GraphState):
-    # This node is not implemented yet, but can be used for future mock interview evaluations
-    state["mock_response"] = mock_interview_analyser(
-        state["resume_text"], state["answers"])
+    # Answers scored incrementally arrive with their aggregated evaluation
+    if (state.get("mock_response") or {}).get("success"):
+        return state
+    # The compact profile replaces the full resume text when roles were found
+    mock_response = evaluate_answers(
+        resume_context(state.get("resume_profile") or {}, state["resume_text"]), state["answers"])
+    state["mock_response"] = _require_success(MOCK_EVALUATOR_NODE, mock_response)
     return state
 
 
@@ -48,10 +88,27 @@ def outcome_node(state: GraphState) -> GraphState:
     """
     # Here you can implement any logic you want to handle the outcome
     # For now, we will just return the state as is
-    state["success_prediction"] = predict_outcome(
+    prediction = _require_success(OUT_COME_NODE, predict_outcome(
         state["resume_analysis"],
-        state["mock_response"]
+        state["mock_response"],
+        resume_avg=(state.get("prefetched") or {}).get("resume_avg"),
+    ))
+    # Rank against earlier candidates for the same role category; a resumed
+    # graph skips this node, so each evaluation is recorded once. Scores from
+    # the local fallbacks are ranked but not recorded, so the history only
+    # holds LLM-graded evaluations.
+    degraded = degraded_parts()
+    scored_locally = (state["mock_response"]["data"].get("scored_locally")
+                      or "mock_response" in degraded
+                      or "success_prediction.justification" in degraded)
+    prediction["data"]["cohort"] = evaluation_history.rank_and_record(
+        state.get("category") or "general",
+        state["resume_analysis"]["data"],
+        state["mock_response"]["data"],
+        prediction["data"]["score"],
+        record=not scored_locally,
     )
+    state["success_prediction"] = prediction
     return state
 
 
@@ -59,12 +116,18 @@ def gap_fixer_node(state: GraphState) -> GraphState:
     res = gap_fixer_agent(
         state["resume_analysis"],
         state["mock_response"],
-        state["success_prediction"]
+        state["success_prediction"],
+        prefetched_resources=(state.get("prefetched") or {}).get("resources"),
     )
-    state["gap_fixer"] = res
+    state["gap_fixer"] = _require_success(GAP_FIXER_NODE, res)
     return state
 
 
+def _observed(node_name: str, fn):
+    """Record metrics and a trace span for every execution of a node."""
+    return instrument_node(node_name, trace_node(node_name, fn))
+
+
 # Create separate graphs for better control
 
 
@@ -72,14 +135,16 @@ def create_behavioral_graph():
     """Graph that only runs resume analysis and behavioral questions"""
     builder = StateGraph(GraphState)
 
-    builder.add_node(RESUME_ANALYZER_NODE, resume_analyyser_node)
-    builder.add_node(BEHAVIORAL_RETRIEVER_NODE, beahaviour_node)
+    builder.add_node(RESUME_ANALYZER_NODE, _observed(
+        RESUME_ANALYZER_NODE, resume_analyyser_node))
+    builder.add_node(BEHAVIORAL_RETRIEVER_NODE, _observed(
+        BEHAVIORAL_RETRIEVER_NODE, beahaviour_node))
 
     builder.add_edge(START, RESUME_ANALYZER_NODE)
     builder.add_edge(RESUME_ANALYZER_NODE, BEHAVIORAL_RETRIEVER_NODE)
     builder.add_edge(BEHAVIORAL_RETRIEVER_NODE, END)
 
-    return builder.compile()
+    return builder.compile(checkpointer=checkpointer)
 
 
 def create_mock_evaluation_graph():
@@ -87,20 +152,21 @@ def create_mock_evaluation_graph():
     builder = StateGraph(GraphState)
     builder.add_node(
         OUT_COME_NODE,
-        outcome_node,
+        _observed(OUT_COME_NODE, outcome_node),
     )
     builder.add_node(
         GAP_FIXER_NODE,
-        gap_fixer_node,
+        _observed(GAP_FIXER_NODE, gap_fixer_node),
     )
 
-    builder.add_node(MOCK_EVALUATOR_NODE, mock_evaluator_node)
+    builder.add_node(MOCK_EVALUATOR_NODE, _observed(
+        MOCK_EVALUATOR_NODE, mock_evaluator_node))
     builder.add_edge(START, MOCK_EVALUATOR_NODE)
     builder.add_edge(MOCK_EVALUATOR_NODE, OUT_COME_NODE)
     builder.add_edge(OUT_COME_NODE, GAP_FIXER_NODE)
     builder.add_edge(GAP_FIXER_NODE, END)
 
-    return builder.compile()
+    return builder.compile(checkpointer=checkpointer)
 
 
 # Create both graph instances
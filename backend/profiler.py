@@ -0,0 +1,207 @@
+import asyncio
+import marshal
+import os
+import random
+import re
+import sys
+import threading
+import uuid
+import weakref
+from collections import Counter
+from typing import Dict, Optional, Set, Tuple
+
+from tracing import current_trace_id, thread_trace_ids
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# When set, the X-Profile-Request header must carry this token
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+# Fraction of flagged requests that are actually profiled
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "profiles")
+PROFILE_HEADER = "X-Profile-Request"
+
+# Leaf frames in these modules are threads parked on I/O or locks
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+FrameKey = Tuple[str, int, str]
+
+# Only one request is profiled at a time; concurrent flags are ignored
+_profile_lock = threading.Lock()
+
+# Event loops whose tasks are tracked -> the thread running them, and each
+# tracked task -> the trace it was created in
+_loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = weakref.WeakKeyDictionary()
+_task_traces: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+
+
+def track_request_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Record the trace of every task created on `loop`, so samples of the
+    event loop thread can be attributed to the request whose task is running.
+    Call from the loop's thread (e.g. an app startup hook).
+    """
+    previous = loop.get_task_factory()
+
+    def factory(loop, coro, context=None):
+        if previous is not None:
+            task = previous(loop, coro) if context is None else previous(loop, coro, context=context)
+        else:
+            task = asyncio.Task(coro, loop=loop, context=context)
+        trace_id = context.run(current_trace_id) if context is not None else current_trace_id()
+        if trace_id is not None:
+            _task_traces[task] = trace_id
+        return task
+
+    loop.set_task_factory(factory)
+    _loops[loop] = threading.get_ident()
+
+
+def should_profile(header_value: Optional[str], query_flag: Optional[str]) -> bool:
+    if not PROFILING_ENABLED:
+        return False
+    if PROFILE_TOKEN:
+        if header_value != PROFILE_TOKEN:
+            return False
+    elif not (header_value or query_flag in ("1", "true")):
+        return False
+    return random.random() < PROFILE_SAMPLE_RATE
+
+
+def _trace_threads(trace_id: str) -> Set[int]:
+    """Threads currently working for `trace_id`."""
+    threads = {ident for ident, trace in thread_trace_ids().items() if trace == trace_id}
+    for loop, ident in list(_loops.items()):
+        # Spans of concurrent requests interleave on the loop thread, so it
+        # counts only while one of the request's own tasks is running
+        threads.discard(ident)
+        task = asyncio.current_task(loop)
+        if task is not None and _task_traces.get(task) == trace_id:
+            threads.add(ident)
+    return threads
+
+
+class StackSampler:
+    """
+    Sampling profiler over the threads of one trace, or of the whole process
+    when `trace_id` is None.
+
+    A deterministic profiler only sees the thread it was enabled on, while a
+    request's work hops from the event loop to the threadpool and then into
+    LangGraph's executor threads. Sampling `sys._current_frames()` follows it
+    across all of them at a fixed, bounded overhead. A worker thread belongs
+    to the trace while it is inside one of the trace's spans, and the event
+    loop thread while it runs one of the trace's tasks (see
+    `track_request_tasks`); concurrent requests are left out.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS,
+                 trace_id: Optional[str] = None) -> None:
+        self.interval = interval_ms / 1000
+        self.trace_id = trace_id
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True)
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            threads = _trace_threads(self.trace_id) if self.trace_id is not None else None
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (threads is not None and thread_id not in threads):
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in _IDLE_MODULES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(names.get(thread_id, str(thread_id)), tuple(stack))] += 1
+
+    def write_collapsed(self, path: str) -> None:
+        """Brendan Gregg collapsed-stack format, one `a;b;c count` line per stack."""
+        with open(path, "w", encoding="utf-8") as f:
+            for (thread_name, stack), count in self.samples.most_common():
+                frames = [thread_name] + [
+                    f"{os.path.basename(filename)}:{name}" for filename, _, name in stack]
+                f.write(f"{';'.join(frames)} {count}\n")
+
+    def write_pstats(self, path: str) -> None:
+        """
+        Marshal sampled counts into the `pstats` dump format so the artifact
+        loads with `pstats.Stats(path)`. Call counts are sample counts and
+        times are samples multiplied by the sampling interval.
+        """
+        inclusive: Counter = Counter()
+        own: Counter = Counter()
+        callers: Dict[FrameKey, Counter] = {}
+        for (_, stack), count in self.samples.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                inclusive[frame] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                callers.setdefault(callee, Counter())[caller] += count
+
+        stats = {}
+        for frame, count in inclusive.items():
+            frame_callers = {
+                caller: (n, n, 0.0, n * self.interval)
+                for caller, n in callers.get(frame, {}).items()
+            }
+            stats[frame] = (count, count, own[frame] * self.interval,
+                            count * self.interval, frame_callers)
+        with open(path, "wb") as f:
+            marshal.dump(stats, f)
+
+
+class RequestProfile:
+    """
+    Context manager profiling the threads of one request's trace and writing
+    `<request_id>.pstats` and `<request_id>.collapsed` artifacts.
+    `active` is False when another request already holds the profiler.
+    """
+
+    def __init__(self, request_id: str, output_dir: str = PROFILE_OUTPUT_DIR) -> None:
+        self.trace_id = request_id
+        # Used as a file name, so nothing but word characters and dashes
+        self.request_id = re.sub(r"[^0-9A-Za-z_-]", "", request_id)[:64] or uuid.uuid4().hex
+        self.output_dir = output_dir
+        self.active = False
+        self._sampler: Optional[StackSampler] = None
+
+    def __enter__(self) -> "RequestProfile":
+        self.active = _profile_lock.acquire(blocking=False)
+        if self.active:
+            self._sampler = StackSampler(trace_id=self.trace_id)
+            self._sampler.__enter__()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self.active:
+            return
+        try:
+            self._sampler.__exit__(*exc)
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, self.request_id)
+            self._sampler.write_pstats(base + ".pstats")
+            self._sampler.write_collapsed(base + ".collapsed")
+            print(
+                f"🔥 Wrote profile for request {self.request_id} ({sum(self._sampler.samples.values())} samples)")
+        except Exception as e:
+            print(f"❌ Failed to write profile for request {self.request_id}: {e}")
+        finally:
+            _profile_lock.release()
@@ -222,4 +222,43 @@ Output Format Example:
   ]
 }}
 
+"""
+
+    mock_interview_batch_prompt = """
+You are an expert interview evaluator. You will receive several independent candidate evaluations, each containing a candidate's resume and their answers to behavioral questions. Evaluate every candidate separately; never let one candidate's resume or answers influence another candidate's scores.
+
+**Evaluation Criteria (apply to each candidate):**
+
+1.  **Tone:** Is it professional, enthusiastic, or passive? Assign a score from 0 (poor) to 100 (excellent).
+2.  **Confidence:** Do they sound sure of their answers and experiences? Assign a score from 0 (not confident) to 100 (very confident).
+3.  **Relevance:** Are the answers on-topic and meaningful? Assign a score from 0 (irrelevant) to 100 (highly relevant).
+    - If an answer is clearly invalid, placeholder-like (e.g., 'x', 'asdf'), or unrelated to the question, assign a **relevance score of 0**.
+    - Invalid answers should also receive very low tone and confidence scores.
+4.  **Total Marks:** The average of the tone, confidence, and relevance scores.
+5.  **Feedback:** A list of 2-3 clear, actionable feedback tips for that candidate.
+
+**Candidate Evaluations:**
+{evaluations}
+
+---
+**Output Instructions:**
+
+Return exactly one result per candidate evaluation, copying its evaluation_id. The output should be strictly based on the format instructions below, no preamble or explaination.
+
+{format_instructions}
+"""
+
+    structured_repair_prompt = """
+You previously returned a JSON object, but some fields failed validation.
+
+Validation errors:
+{errors}
+
+JSON schema of the fields to correct:
+{field_schema}
+
+Original request (for context):
+{original_prompt}
+
+Return ONLY a JSON object containing corrected values for these fields: {fields}. No preamble or explaination.
 """
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+SESSION_COMPRESSION_LEVEL = int(os.getenv("SESSION_COMPRESSION_LEVEL", "6"))
+
+
+def pack_text(text: str) -> bytes:
+    return zlib.compress((text or "").encode("utf-8"), SESSION_COMPRESSION_LEVEL)
+
+
+def unpack_text(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def pack_json(value: Any) -> bytes:
+    return pack_text(_dump(value))
+
+
+def unpack_json(blob: bytes) -> Any:
+    return json.loads(unpack_text(blob))
+
+
+class SharedBlobPool:
+    """
+    Content-addressed, reference-counted compressed blobs. Sessions for the
+    same job description (and the question sets cached per category) hold a
+    hash reference instead of their own copy.
+    """
+
+    def __init__(self) -> None:
+        self._blobs: Dict[bytes, bytes] = {}
+        self._refs: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def acquire(self, raw: str) -> bytes:
+        """
+        Returns:
+            Content hash of `raw`; compressed only the first time it is seen
+        """
+        encoded = raw.encode("utf-8")
+        key = hashlib.blake2b(encoded, digest_size=16).digest()
+        with self._lock:
+            if key in self._blobs:
+                self._refs[key] += 1
+                return key
+        blob = zlib.compress(encoded, SESSION_COMPRESSION_LEVEL)
+        with self._lock:
+            self._blobs.setdefault(key, blob)
+            self._refs[key] = self._refs.get(key, 0) + 1
+        return key
+
+    def get(self, key: bytes) -> str:
+        return unpack_text(self._blobs[key])
+
+    def release(self, key: Optional[bytes]) -> None:
+        if key is None:
+            return
+        with self._lock:
+            refs = self._refs.get(key, 0) - 1
+            if refs > 0:
+                self._refs[key] = refs
+            else:
+                self._refs.pop(key, None)
+                self._blobs.pop(key, None)
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(len(blob) for blob in self._blobs.values())
+
+
+class SessionRecord:
+    """
+    One pending interview. Resume text, profile and analysis are kept as
+    zlib blobs and decompressed on access; the job description and question
+    set are references into the store's shared pool.
+    """
+
+    __slots__ = ("file_path", "pending_graph", "retries", "answers",
+                 "_pool", "_resume_text", "_resume_profile", "_resume_analysis",
+                 "_job_description", "_behavioral_questions")
+
+    def __init__(self, pool: SharedBlobPool, file_path: str, job_description: str,
+                 resume_text: str, resume_profile: Dict[str, Any],
+                 resume_analysis: Dict[str, Any], behavioral_questions: Optional[Dict[str, Any]],
+                 pending_graph: Optional[str] = None) -> None:
+        self._pool = pool
+        self.file_path = file_path
+        self.pending_graph = pending_graph
+        self.retries = 0
+        # Incrementally submitted answers; small and short-lived, kept as-is
+        self.answers: Dict[int, Dict[str, Any]] = {}
+        self._resume_text = pack_text(resume_text)
+        self._resume_profile = pack_json(resume_profile or {})
+        self._resume_analysis = pack_json(resume_analysis)
+        self._job_description = pool.acquire(job_description)
+        self._behavioral_questions = pool.acquire(_dump(behavioral_questions))
+
+    @property
+    def resume_text(self) -> str:
+        return unpack_text(self._resume_text)
+
+    @property
+    def resume_profile(self) -> Dict[str, Any]:
+        return unpack_json(self._resume_profile)
+
+    @property
+    def resume_analysis(self) -> Dict[str, Any]:
+        return unpack_json(self._resume_analysis)
+
+    @property
+    def job_description(self) -> str:
+        return self._pool.get(self._job_description)
+
+    @property
+    def behavioral_questions(self) -> Optional[Dict[str, Any]]:
+        return json.loads(self._pool.get(self._behavioral_questions))
+
+    @behavioral_questions.setter
+    def behavioral_questions(self, value: Optional[Dict[str, Any]]) -> None:
+        previous = self._behavioral_questions
+        self._behavioral_questions = self._pool.acquire(_dump(value))
+        self._pool.release(previous)
+
+    def release(self) -> None:
+        """Drop this record's references into the shared pool."""
+        self._pool.release(self._job_description)
+        self._pool.release(self._behavioral_questions)
+        self._job_description = self._behavioral_questions = None
+
+    def nbytes(self) -> int:
+        """Bytes held by this record alone (shared blobs excluded)."""
+        return (sys.getsizeof(self) + len(self._resume_text) + len(self._resume_profile)
+                + len(self._resume_analysis) + len(self.file_path)
+                + sum(len(a.get("question", "")) + len(a.get("answer", ""))
+                      for a in self.answers.values()))
+
+
+class SessionStore:
+    """In-memory store of pending interview sessions, keyed by session ID."""
+
+    def __init__(self) -> None:
+        self._records: Dict[str, SessionRecord] = {}
+        self.shared = SharedBlobPool()
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._records
+
+    def __getitem__(self, session_id: str) -> SessionRecord:
+        return self._records[session_id]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._records))
+
+    def create(self, session_id: str, **fields: Any) -> SessionRecord:
+        record = SessionRecord(self.shared, **fields)
+        previous = self._records.get(session_id)
+        self._records[session_id] = record
+        if previous is not None:
+            previous.release()
+        return record
+
+    def pop(self, session_id: str) -> Optional[SessionRecord]:
+        record = self._records.pop(session_id, None)
+        if record is not None:
+            record.release()
+        return record
+
+    def nbytes(self) -> int:
+        """Approximate payload bytes of every session plus the shared pool."""
+        records: List[SessionRecord] = list(self._records.values())
+        return sum(record.nbytes() for record in records) + self.shared.nbytes()
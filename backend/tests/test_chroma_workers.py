@@ -0,0 +1,119 @@
+"""
+Two long-lived worker processes sharing one Chroma directory: each must see
+the other's committed writes and keep its own, whether the collection starts
+empty or already holds rows.
+
+Run from backend/:
+    python -m pytest tests
+"""
+import multiprocessing
+import os
+
+import pytest
+
+QUESTIONS = {
+    "a": "Tell me about a time you handled a difficult customer escalation.",
+    "b": "Describe a project where you improved system reliability under pressure.",
+}
+
+
+def _worker(name, workdir, events, results, seed):
+    # Keep the import-time client away from the committed database
+    os.chdir(workdir)
+    os.environ["CHROMA_DB_PATH"] = "unused_chroma_db"
+    from database import db
+    from fakes import install_fakes
+    install_fakes(chroma_path="chroma")
+
+    def save(question):
+        db.save_qna_for_category([{"question": question, "answer": "An answer.",
+                                   "source": "test", "category": "shared"}], min_count=100)
+        db.qna_writer.flush()
+
+    def read(step):
+        results.put((name, step, sorted(q["question"] for q in db.get_qna_by_category("shared"))))
+
+    if seed:
+        save("What motivates you to do your best work every day?")
+    events[f"{name}_ready"].set()
+    events["a_ready"].wait(60)
+    events["b_ready"].wait(60)
+    read("start")
+    if name == "a":
+        save(QUESTIONS["a"])
+        events["a_wrote"].set()
+        events["b_wrote"].wait(60)
+    else:
+        events["a_wrote"].wait(60)
+        read("after_other_write")
+        save(QUESTIONS["b"])
+        events["b_wrote"].set()
+    read("end")
+
+
+@pytest.mark.parametrize("seeded", [False, True])
+def test_workers_see_each_others_writes(tmp_path, seeded):
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        events = {key: manager.Event() for key in ("a_ready", "b_ready", "a_wrote", "b_wrote")}
+        results = manager.Queue()
+        workers = [context.Process(target=_worker, args=(
+            name, str(tmp_path), events, results, seeded and name == "a")) for name in ("a", "b")]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(120)
+        assert [worker.exitcode for worker in workers] == [0, 0]
+        reads = {}
+        while not results.empty():
+            name, step, questions = results.get()
+            reads[(name, step)] = questions
+
+    seed = 1 if seeded else 0
+    assert len(reads[("b", "after_other_write")]) == seed + 1
+    assert QUESTIONS["a"] in reads[("b", "after_other_write")]
+    for name in ("a", "b"):
+        assert len(reads[(name, "end")]) == seed + 2
+        assert set(QUESTIONS.values()) <= set(reads[(name, "end")])
+
+
+def _save_below_min_count(workdir, results):
+    os.chdir(workdir)
+    os.environ["CHROMA_DB_PATH"] = "unused_chroma_db"
+    from database import db
+    from fakes import install_fakes
+    install_fakes(chroma_path="chroma")
+
+    def save(questions):
+        db.save_qna_for_category([{"question": question, "answer": "An answer.",
+                                   "source": "test", "category": "shared"} for question in questions])
+        db.qna_writer.flush()
+
+    def stored():
+        return len(db.qna_collection().get(where={"category": "shared"})["ids"])
+
+    save(DISTINCT_QUESTIONS)
+    results.put(stored())
+    save(["How do you prioritise competing deadlines from two managers?"])
+    results.put(stored())
+
+
+DISTINCT_QUESTIONS = [
+    "Tell me about a time you handled a difficult customer escalation.",
+    "Describe a project where you improved system reliability under pressure.",
+    "What motivates you to do your best work every day?",
+    "Give an example of a disagreement with your manager and how it ended.",
+    "How did you learn a new technology quickly for a deadline?",
+]
+
+
+def test_save_below_min_count_keeps_every_question(tmp_path):
+    # min_count decides whether a save runs at all, not how many of its questions land
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    worker = context.Process(target=_save_below_min_count, args=(str(tmp_path), results))
+    worker.start()
+    counts = [results.get(timeout=120), results.get(timeout=120)]
+    worker.join(120)
+    assert worker.exitcode == 0
+    assert counts == [len(DISTINCT_QUESTIONS), len(DISTINCT_QUESTIONS)]
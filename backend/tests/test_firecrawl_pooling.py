@@ -0,0 +1,48 @@
+"""
+Firecrawl searches share one pooled keep-alive connection instead of
+opening a new one per request.
+
+Run from backend/:
+    python -m pytest tests
+"""
+import asyncio
+
+import pytest
+
+from fakes import FakeFirecrawlServer
+from fire_crawl_services import AsyncFireCrawlService, FireCrawlService
+from metrics import FIRECRAWL_CONNECTIONS
+
+SEARCHES = 20
+
+
+@pytest.fixture
+def server():
+    server = FakeFirecrawlServer().start()
+    yield server
+    server.stop()
+
+
+def test_sequential_searches_reuse_one_connection(server):
+    opened = FIRECRAWL_CONNECTIONS.value()
+    for i in range(SEARCHES):
+        # A new service per call, as the agents do; the pooled client is shared
+        response = FireCrawlService(base_url=server.url).search(f"python interview question {i}")
+        assert response.success and response.data
+    assert FIRECRAWL_CONNECTIONS.value() - opened == 1
+    FireCrawlService._clients.pop(server.url).close()
+
+
+def test_async_sequential_searches_reuse_one_connection(server):
+    async def run():
+        try:
+            for i in range(SEARCHES):
+                response = await AsyncFireCrawlService(base_url=server.url).search(
+                    f"python interview question {i}")
+                assert response.success and response.data
+        finally:
+            await AsyncFireCrawlService._clients.pop(server.url).aclose()
+
+    opened = FIRECRAWL_CONNECTIONS.value()
+    asyncio.run(run())
+    assert FIRECRAWL_CONNECTIONS.value() - opened == 1
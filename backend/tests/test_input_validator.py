@@ -0,0 +1,52 @@
+"""
+Job description pre-validation must only reject clearly invalid inputs:
+finance roles that talk about invoices and receipts are still job
+descriptions, while invoices, receipts and placeholder text are not.
+
+Run from backend/:
+    python -m pytest tests
+"""
+import pytest
+
+from agents.input_validator import validate_job_description
+
+JOB_DESCRIPTIONS = [
+    "Accounts payable specialist to process each vendor invoice, reconcile receipt records and match "
+    "purchase orders against deliveries. You will check the subtotal and tax on every invoice and "
+    "work closely with procurement.",
+    "Billing coordinator: prepare the monthly invoice for each client account, chase overdue payments, "
+    "resolve receipt disputes and report the subtotal by region to the finance team.",
+    "Bookkeeper needed for a small accounting firm. Record receipts and invoices in Xero, reconcile bank "
+    "statements weekly and prepare VAT returns. 2+ years of bookkeeping experience required.",
+    "We are hiring a backend engineer to build APIs in Python and Go. You will work with a small team "
+    "on our payments infrastructure and own services end to end.",
+    "Data analyst to build dashboards in SQL and Tableau, analyse customer churn and present findings "
+    "to product managers every quarter.",
+    "Senior Software Engineer\nResponsibilities\n- Design and build scalable backend services\n"
+    "- Mentor junior engineers\nRequirements\n- 5+ years of experience with Java or Kotlin\n"
+    "- Experience with AWS\nBenefits\n- Remote friendly",
+    "Registered nurse for the night shift on a busy surgical ward. Administer medication, monitor "
+    "patients after surgery and keep accurate care records. Valid nursing license required.",
+    "Retail store manager to lead a team of 12, manage stock levels and weekly rotas, and hit monthly "
+    "sales targets. Salary 32,000 - 36,000 plus 10% bonus, 28 days leave, 40 hours per week.",
+]
+
+NOT_JOB_DESCRIPTIONS = [
+    "Invoice #4821 Date 2024-03-01 Bill to Acme Corp Item Qty Price Widget 4 25.00 Gadget 2 40.00 "
+    "Subtotal 180.00 Tax 18.00 Total due 198.00 Payment due within 30 days Thank you for your business",
+    "Receipt Store 112 Milk 2.49 Bread 3.10 Eggs 4.20 Subtotal 9.79 Tax 0.78 Total 10.57 Card ending "
+    "4421 Approved Thank you for shopping with us",
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore "
+    "et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris.",
+    "Senior engineer wanted",
+]
+
+
+@pytest.mark.parametrize("job_description", JOB_DESCRIPTIONS)
+def test_accepts_job_descriptions(job_description):
+    assert validate_job_description(job_description).valid
+
+
+@pytest.mark.parametrize("text", NOT_JOB_DESCRIPTIONS)
+def test_rejects_clearly_invalid_text(text):
+    assert not validate_job_description(text).valid
@@ -0,0 +1,54 @@
+"""
+The resource index file is shared by workers: appends must not interleave,
+and re-fetched URLs must not pile up copies in it.
+
+Run from backend/:
+    python -m pytest tests
+"""
+import json
+import multiprocessing
+
+from database.resource_index import RESOURCE_INDEX_MAX_CHARS, ResourceIndex
+
+
+def _page(url, word):
+    return {"url": url, "title": f"{word} guide", "markdown": f"{word} " * (RESOURCE_INDEX_MAX_CHARS // 8)}
+
+
+def _append(path, worker):
+    index = ResourceIndex(path)
+    for batch in range(10):
+        index.add_pages([_page(f"https://example.com/{worker}/{batch}/{i}", f"topic{worker}") for i in range(8)])
+
+
+def test_refetched_urls_are_compacted_on_load(tmp_path):
+    path = str(tmp_path / "resource_index.jsonl")
+    index = ResourceIndex(path)
+    for word in ("python", "docker", "kubernetes"):
+        index.add_pages([_page("https://example.com/guide", word)])
+    index.add_pages([_page("https://example.com/sql", "sql")])
+
+    reloaded = ResourceIndex(path)
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["url"] for line in lines] == ["https://example.com/guide", "https://example.com/sql"]
+    assert lines[0]["title"] == "kubernetes guide"
+    assert len(reloaded) == 2
+    assert reloaded.search("kubernetes")[0][2]["url"] == "https://example.com/guide"
+    assert reloaded.search("python") == []
+
+
+def test_concurrent_appends_keep_whole_lines(tmp_path):
+    path = str(tmp_path / "resource_index.jsonl")
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_append, args=(path, worker)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(120)
+    assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 320
+    assert len(ResourceIndex(path)) == 320
@@ -0,0 +1,224 @@
+"""
+Per-session LLM token and cost accounting.
+
+The token usage of every LLM response is charged to the session bound to the
+current context and to the API endpoint serving the request. When a response
+does not report usage, it is estimated with tiktoken. The session follows the
+request into the threadpool and LangGraph node threads like the deadline
+does. Once a session has used SESSION_TOKEN_BUDGET tokens, agents check
+`within_token_budget` and switch to their non-LLM paths: cached or general
+questions, local answer scoring, and local predictions and plans.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from metrics import LLM_COST
+
+# Tokens a session may use before agents fall back to local paths; 0 disables
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "0"))
+# USD per 1K tokens, for cost estimates (e.g. the Groq price of the model in use)
+LLM_PROMPT_COST_PER_1K = float(os.getenv("LLM_PROMPT_COST_PER_1K", "0"))
+LLM_COMPLETION_COST_PER_1K = float(os.getenv("LLM_COMPLETION_COST_PER_1K", "0"))
+TOKEN_ESTIMATE_ENCODING = os.getenv("TOKEN_ESTIMATE_ENCODING", "cl100k_base")
+
+_sessions: ContextVar[Tuple[str, ...]] = ContextVar("token_sessions", default=())
+_request_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar("token_request_scope", default=None)
+
+
+def bind_session(session_id: str) -> None:
+    """Charge LLM calls made for the rest of the current request to `session_id`."""
+    _sessions.set((session_id,))
+
+
+def current_sessions() -> Tuple[str, ...]:
+    return _sessions.get()
+
+
+@contextmanager
+def charged_to(session_ids: Iterable[str]) -> Iterator[None]:
+    """Split the usage of LLM calls made in this block evenly between sessions."""
+    token = _sessions.set(tuple(session_ids))
+    try:
+        yield
+    finally:
+        _sessions.reset(token)
+
+
+@contextmanager
+def request_accounting(scope: Dict[str, Any]) -> Iterator[None]:
+    """Attribute LLM usage in this block to the endpoint of an ASGI request."""
+    token = _request_scope.set(scope)
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+
+def _current_endpoint() -> Optional[str]:
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    # The route template (set once routed) keeps session IDs out of the key
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ESTIMATE_ENCODING)
+    except Exception as e:
+        print(f"⚠️ tiktoken unavailable, estimating 4 characters per token: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _empty_usage() -> Dict[str, Any]:
+    return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0,
+            "cost_usd": 0.0, "calls": 0, "estimated_calls": 0}
+
+
+class TokenLedger:
+    """Token and cost totals per session (with a per-task split) and per endpoint."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _add(usage: Dict[str, Any], prompt: float, completion: float, cost: float,
+             calls: float, estimated: bool) -> None:
+        usage["prompt_tokens"] += prompt
+        usage["completion_tokens"] += completion
+        usage["total_tokens"] += prompt + completion
+        usage["cost_usd"] += cost
+        usage["calls"] += calls
+        usage["estimated_calls"] += calls if estimated else 0
+
+    def charge(self, sessions: Tuple[str, ...], endpoint: Optional[str], task: str,
+               prompt_tokens: int, completion_tokens: int, estimated: bool = False) -> float:
+        """
+        Record one LLM call.
+
+        Returns:
+            Estimated cost of the call in USD
+        """
+        cost = (prompt_tokens * LLM_PROMPT_COST_PER_1K
+                + completion_tokens * LLM_COMPLETION_COST_PER_1K) / 1000
+        with self._lock:
+            if endpoint is not None:
+                self._add(self._endpoints.setdefault(endpoint, _empty_usage()),
+                          prompt_tokens, completion_tokens, cost, 1, estimated)
+            share = 1 / len(sessions) if sessions else 0
+            for session_id in sessions:
+                usage = self._sessions.setdefault(session_id, {**_empty_usage(), "by_task": {}})
+                self._add(usage, prompt_tokens * share, completion_tokens * share,
+                          cost * share, share, estimated)
+                self._add(usage["by_task"].setdefault(task, _empty_usage()),
+                          prompt_tokens * share, completion_tokens * share,
+                          cost * share, share, estimated)
+        return cost
+
+    def tokens_used(self, session_id: str) -> float:
+        with self._lock:
+            return self._sessions.get(session_id, {}).get("total_tokens", 0)
+
+    def session_usage(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            usage = self._sessions.get(session_id) or {**_empty_usage(), "by_task": {}}
+            report = _rounded(usage)
+            report["by_task"] = {task: _rounded(u) for task, u in usage["by_task"].items()}
+        report["budget_tokens"] = SESSION_TOKEN_BUDGET or None
+        return report
+
+    def endpoint_usage(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {endpoint: _rounded(usage) for endpoint, usage in self._endpoints.items()}
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+def _rounded(usage: Dict[str, Any]) -> Dict[str, Any]:
+    # Batched calls are split between sessions, so call counts can be fractional
+    digits = {"cost_usd": 6, "calls": 2, "estimated_calls": 2}
+    return {key: round(value, digits[key]) if key in digits else round(value)
+            for key, value in usage.items() if key != "by_task"}
+
+
+token_ledger = TokenLedger()
+
+
+def within_token_budget() -> bool:
+    """False once any session bound to the current context has used its token budget."""
+    if SESSION_TOKEN_BUDGET <= 0:
+        return True
+    return all(token_ledger.tokens_used(session_id) < SESSION_TOKEN_BUDGET
+               for session_id in _sessions.get())
+
+
+def _message_text(message: Any) -> str:
+    content = getattr(message, "content", message)
+    return content if isinstance(content, str) else str(content)
+
+
+class TokenAccountingCallback(BaseCallbackHandler):
+    """
+    LangChain callback charging every LLM call made through the shared model
+    to the current session and endpoint. Provider-reported usage is used when
+    present, otherwise prompt and completion text are counted with tiktoken.
+    """
+
+    def __init__(self) -> None:
+        self._starts: Dict[Any, Tuple[str, str, Tuple[str, ...], Optional[str]]] = {}
+
+    def _start(self, run_id: Any, metadata: Optional[Dict[str, Any]], prompt: str) -> None:
+        task = (metadata or {}).get("llm_task", "default")
+        self._starts[run_id] = (task, prompt, current_sessions(), _current_endpoint())
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata, "\n".join(
+            _message_text(m) for batch in messages for m in batch))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata, "\n".join(prompts))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        task, prompt, sessions, endpoint = self._starts.pop(
+            run_id, ("default", "", current_sessions(), _current_endpoint()))
+        generations = [g for batch in response.generations for g in batch]
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        if prompt_tokens is None:
+            # Chat models report usage on the message instead
+            metadata = [getattr(getattr(g, "message", None), "usage_metadata", None) for g in generations]
+            metadata = [m for m in metadata if m]
+            if metadata:
+                prompt_tokens = sum(m.get("input_tokens", 0) for m in metadata)
+                completion_tokens = sum(m.get("output_tokens", 0) for m in metadata)
+        estimated = prompt_tokens is None
+        if estimated:
+            prompt_tokens = estimate_tokens(prompt)
+            completion_tokens = sum(estimate_tokens(g.text or "") for g in generations)
+        cost = token_ledger.charge(sessions, endpoint, task, prompt_tokens,
+                                   completion_tokens or 0, estimated)
+        LLM_COST.inc(cost, task=task)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._starts.pop(run_id, None)
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# "jsonl" (default), "console" or "none"
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl").lower()
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces.jsonl")
+TRACE_HEADER = "X-Trace-Id"
+# Client trace IDs are used in file names (profiles), so only hex IDs and UUIDs are accepted
+_TRACE_ID_RE = re.compile(
+    r"^(?:[0-9a-fA-F]{16,32}|[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})$")
+
+_current_trace_id: ContextVar[Optional[str]] = ContextVar(
+    "current_trace_id", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar(
+    "current_span_id", default=None)
+# thread ident -> trace IDs of the spans open on that thread
+_thread_traces: Dict[int, List[str]] = {}
+
+
+class SpanExporter:
+    def __init__(self, kind: str = TRACE_EXPORTER, path: str = TRACE_EXPORT_PATH) -> None:
+        self.kind = kind
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, record: Dict[str, Any]) -> None:
+        if self.kind == "none":
+            return
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self.kind == "console":
+                print(f"🔎 {line}", file=sys.stderr)
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+
+exporter = SpanExporter()
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def valid_trace_id(trace_id: Optional[str]) -> bool:
+    return bool(trace_id) and _TRACE_ID_RE.match(trace_id) is not None
+
+
+def current_trace_id() -> Optional[str]:
+    return _current_trace_id.get()
+
+
+def thread_trace_ids() -> Dict[int, str]:
+    """Trace of the innermost open span on each thread (for the sampling profiler)."""
+    return {ident: traces[-1] for ident, traces in list(_thread_traces.items()) if traces}
+
+
+@contextmanager
+def start_trace(trace_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Bind a trace ID to the current context (one per API request). A missing
+    or malformed `trace_id` (e.g. from a client header) is replaced by a new one.
+    """
+    trace_token = _current_trace_id.set(trace_id if valid_trace_id(trace_id) else new_trace_id())
+    span_token = _current_span_id.set(None)
+    try:
+        yield _current_trace_id.get()
+    finally:
+        _current_span_id.reset(span_token)
+        _current_trace_id.reset(trace_token)
+
+
+def _record(name: str, trace_id: Optional[str], span_id: str, parent_id: Optional[str],
+            start_wall: float, duration: float, attributes: Dict[str, Any],
+            error: Optional[BaseException]) -> None:
+    exporter.export({
+        "trace_id": trace_id,
+        "span_id": span_id,
+        "parent_id": parent_id,
+        "name": name,
+        "start": start_wall,
+        "duration_ms": round(duration * 1000, 3),
+        "status": "error" if error else "ok",
+        "error": str(error) if error else None,
+        "attributes": attributes,
+    })
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Record a span under the current trace. Outside a trace this is a no-op
+    so instrumented code paths cost nothing in scripts and background work.
+
+    Yields the attribute dict so callers can attach results (e.g. counts).
+    """
+    trace_id = _current_trace_id.get()
+    if trace_id is None:
+        yield attributes
+        return
+
+    span_id = uuid.uuid4().hex[:16]
+    parent_id = _current_span_id.get()
+    token = _current_span_id.set(span_id)
+    # Async spans interleave on the event loop thread, so entries are removed
+    # by value rather than popped
+    thread_traces = _thread_traces.setdefault(threading.get_ident(), [])
+    thread_traces.append(trace_id)
+    start_wall, start = time.time(), time.perf_counter()
+    error: Optional[BaseException] = None
+    try:
+        yield attributes
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        thread_traces.remove(trace_id)
+        _current_span_id.reset(token)
+        _record(name, trace_id, span_id, parent_id, start_wall,
+                time.perf_counter() - start, attributes, error)
+
+
+def traced(name: str, fn: Callable) -> Callable:
+    """Wrap `fn` in a span, e.g. so the threadpool thread running it is attributed to the trace."""
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def trace_node(node_name: str, fn: Callable) -> Callable:
+    """Wrap a LangGraph node in a span named after the node."""
+    return traced(f"node.{node_name}", fn)
+
+
+class LLMTracingCallback(BaseCallbackHandler):
+    """LangChain callback emitting one span per LLM call under the active trace."""
+
+    def __init__(self) -> None:
+        self._starts: Dict[Any, tuple] = {}
+
+    def _start(self, run_id: Any, metadata: Optional[Dict[str, Any]]) -> None:
+        trace_id = _current_trace_id.get()
+        if trace_id is None:
+            return
+        self._starts[run_id] = (trace_id, _current_span_id.get(), time.time(),
+                                time.perf_counter(), (metadata or {}).get("llm_task", "default"))
+
+    def _end(self, run_id: Any, attributes: Dict[str, Any],
+             error: Optional[BaseException] = None) -> None:
+        started = self._starts.pop(run_id, None)
+        if started is None:
+            return
+        trace_id, parent_id, start_wall, start, task = started
+        attributes["llm_task"] = task
+        _record("llm.invoke", trace_id, uuid.uuid4().hex[:16], parent_id, start_wall,
+                time.perf_counter() - start, attributes, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        self._end(run_id, {
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+        })
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, {}, error)
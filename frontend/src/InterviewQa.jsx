@@ -341,6 +341,11 @@ const keyss = Object.keys(answers);
                     <span className="text-4xl font-bold">{dashboardData.success_prediction.score}%</span>
                   </div>
                   <p className="text-gray-600 mt-4 text-lg">{dashboardData.success_prediction.justification}</p>
+                  {dashboardData.success_prediction.cohort?.percentile != null && (
+                    <p className="text-gray-500 mt-2">
+                      Better than {dashboardData.success_prediction.cohort.percentile}% of {dashboardData.success_prediction.cohort.cohort_size} candidates for {dashboardData.success_prediction.cohort.category} roles
+                    </p>
+                  )}
                 </div>
               </div>
             )}